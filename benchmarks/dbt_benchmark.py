@@ -0,0 +1,235 @@
+"""
+Statcast dbt model benchmark.
+
+Builds the Statcast intermediate models (int_statcast_player_days and
+int_statcast_metrics) over 1, 5 and 10 seasons of synthetic pitch data and
+saves dbt's per-model execution times, so model rewrites can be compared
+between commits.
+
+Synthetic pitches are generated server-side into raw_mlb.raw_statcast of a
+throwaway database (see run_benchmark.throwaway_database), at roughly a
+real season's volume: ~720k pitches, 300 per game, 15 games a day, about a
+quarter of them batted balls. Seasons are added cumulatively, and at each
+size the models are timed twice:
+- full_refresh: dbt run --full-refresh over every loaded season
+- incremental: dbt run after re-loading the latest game date, which should
+  cost the same whatever the history size
+
+Needs dbt-postgres on PATH and `dbt deps` run once in dbt_mlb/.
+
+Usage:
+    python benchmarks/dbt_benchmark.py run
+    python benchmarks/dbt_benchmark.py run --seasons 1 5 --pitches-per-season 100000
+    python benchmarks/dbt_benchmark.py compare benchmarks/results/dbt-abc123.json benchmarks/results/dbt-def456.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import psycopg2
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from run_benchmark import RESULTS_DIR, ROOT, git_revision, throwaway_database
+
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+from utils import load_config
+
+DBT_DIR = os.path.join(ROOT, "dbt_mlb")
+MODELS = ("int_statcast_player_days", "int_statcast_metrics")
+SEASON_COUNTS = (1, 5, 10)
+FIRST_SEASON = 2015
+PITCHES_PER_SEASON = 720_000
+
+# One season of pitches: game_pk / at_bat_number / pitch_number are unique per
+# row, and about a quarter of pitches end in a batted ball. i is a bigint so
+# the id scrambling below doesn't overflow at full-season sizes
+SYNTHETIC_SEASON_SQL = """
+INSERT INTO raw_mlb.raw_statcast (
+    game_pk, game_date, game_year, batter, pitcher, events, description, type,
+    release_speed, release_spin_rate, launch_speed, launch_angle,
+    estimated_ba_using_speedangle, estimated_woba_using_speedangle,
+    at_bat_number, pitch_number
+)
+SELECT
+    %(season)s * 100000 + i / 300,
+    make_date(%(season)s, 3, 28) + (i / 300 / 15)::integer,
+    %(season)s,
+    600000 + (i * 7919) %% 750,
+    500000 + (i / 25 * 104729) %% 450,
+    CASE WHEN batted THEN 'field_out' END,
+    CASE WHEN batted THEN 'hit_into_play' ELSE 'ball' END,
+    CASE WHEN batted THEN 'X' ELSE 'B' END,
+    round((80 + random() * 20)::numeric, 1),
+    1800 + (random() * 900)::integer,
+    CASE WHEN batted THEN round((60 + random() * 55)::numeric, 1) END,
+    CASE WHEN batted THEN round((-30 + random() * 80)::numeric, 1) END,
+    CASE WHEN batted THEN round(random()::numeric, 3) END,
+    CASE WHEN batted THEN round((random() * 1.5)::numeric, 3) END,
+    i %% 300 / 4 + 1,
+    i %% 4 + 1
+FROM (
+    SELECT i, i %% 4 = 3 AS batted
+    FROM generate_series(0::bigint, %(pitches)s - 1) AS i
+) p
+"""
+
+
+# ---------------------------------------------------------------------------
+# Data and dbt runs
+# ---------------------------------------------------------------------------
+
+def load_seasons(db_cfg, seasons, pitches):
+    """Insert synthetic pitches for each season, then ANALYZE."""
+    db = db_cfg["database"]
+    conn = psycopg2.connect(host=db["host"], port=db["port"], dbname=db["dbname"],
+                            user=db["user"], password=db["password"])
+    try:
+        with conn.cursor() as cur:
+            for season in seasons:
+                cur.execute(SYNTHETIC_SEASON_SQL, {"season": season, "pitches": pitches})
+            conn.commit()
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute("ANALYZE raw_mlb.raw_statcast")
+    finally:
+        conn.close()
+
+
+def reload_latest_date(db_cfg):
+    """Touch loaded_at on the latest game date, as a daily incremental load would."""
+    db = db_cfg["database"]
+    conn = psycopg2.connect(host=db["host"], port=db["port"], dbname=db["dbname"],
+                            user=db["user"], password=db["password"])
+    try:
+        with conn.cursor() as cur:
+            cur.execute("""
+                UPDATE raw_mlb.raw_statcast SET loaded_at = NOW()
+                WHERE game_date = (SELECT max(game_date) FROM raw_mlb.raw_statcast)
+            """)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def model_timings(run_results):
+    """Map model name -> execution seconds from a dbt run_results.json document."""
+    timings = {}
+    for result in run_results["results"]:
+        name = result["unique_id"].rsplit(".", 1)[-1]
+        if name in MODELS:
+            if result["status"] != "success":
+                raise SystemExit(f"dbt model {name} failed: {result.get('message')}")
+            timings[name] = round(result["execution_time"], 3)
+    return timings
+
+
+def dbt_run(db_cfg, target_path, full_refresh=False):
+    """Build stg_statcast and the Statcast models; return their execution times."""
+    db = db_cfg["database"]
+    env = {**os.environ, "DBT_HOST": db["host"], "DBT_PORT": str(db["port"]),
+           "DBT_USER": db["user"], "DBT_PASSWORD": db["password"], "DBT_DBNAME": db["dbname"]}
+    cmd = ["dbt", "run", "--select", "stg_statcast", *MODELS,
+           "--project-dir", DBT_DIR, "--profiles-dir", DBT_DIR, "--target-path", target_path]
+    if full_refresh:
+        cmd.append("--full-refresh")
+    subprocess.run(cmd, env=env, check=True)
+    with open(os.path.join(target_path, "run_results.json")) as f:
+        return model_timings(json.load(f))
+
+
+def run(cfg, season_counts=SEASON_COUNTS, pitches=PITCHES_PER_SEASON):
+    """Time full-refresh and incremental builds at each season count."""
+    runs = []
+    loaded = 0
+    with throwaway_database(cfg) as db_cfg, tempfile.TemporaryDirectory() as target_path:
+        for count in sorted(season_counts):
+            load_seasons(db_cfg, range(FIRST_SEASON + loaded, FIRST_SEASON + count), pitches)
+            loaded = count
+            full = dbt_run(db_cfg, target_path, full_refresh=True)
+            reload_latest_date(db_cfg)
+            incremental = dbt_run(db_cfg, target_path)
+            runs.append({"seasons": count, "pitches": count * pitches,
+                         "full_refresh": full, "incremental": incremental})
+            print("\n".join(format_runs(runs[-1:])))
+    return runs
+
+
+# ---------------------------------------------------------------------------
+# Results
+# ---------------------------------------------------------------------------
+
+def format_runs(runs):
+    """Return table lines of per-model build times by season count."""
+    lines = [f"{'seasons':>7}{'pitches':>12}  {'model':<26}{'full':>9}{'incr':>9}"]
+    for entry in runs:
+        for model in MODELS:
+            lines.append(f"{entry['seasons']:>7}{entry['pitches']:>12,}  {model:<26}"
+                         f"{entry['full_refresh'][model]:>8.2f}s{entry['incremental'][model]:>8.2f}s")
+    return lines
+
+
+def save_result(runs, pitches, label=None):
+    revision = git_revision()
+    result = {
+        "label": label or revision,
+        "revision": revision,
+        "pitches_per_season": pitches,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "runs": runs,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"dbt-{result['label']}.json")
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
+    return path
+
+
+def compare(base, new):
+    """Return report lines comparing two saved results at matching season counts."""
+    lines = [f"{base['label']} -> {new['label']}",
+             f"{'seasons':>7}  {'model':<26}{'kind':<14}{'base':>9}{'new':>9}{'change':>10}"]
+    base_runs = {entry["seasons"]: entry for entry in base["runs"]}
+    for entry in new["runs"]:
+        old = base_runs.get(entry["seasons"])
+        if old is None:
+            continue
+        for model in MODELS:
+            for kind in ("full_refresh", "incremental"):
+                a, b = old[kind][model], entry[kind][model]
+                change = f"{(b - a) / a * 100:+9.1f}%" if a else "       n/a"
+                lines.append(f"{entry['seasons']:>7}  {model:<26}{kind:<14}{a:>8.2f}s{b:>8.2f}s{change}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statcast dbt model benchmark")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_ = sub.add_parser("run", help="Build the models over synthetic seasons and save timings")
+    run_.add_argument("--seasons", type=int, nargs="+", default=list(SEASON_COUNTS),
+                      help="Season counts to time (default: 1 5 10)")
+    run_.add_argument("--pitches-per-season", type=int, default=PITCHES_PER_SEASON)
+    run_.add_argument("--config", default=None, help="Config file (default: config.yml)")
+    run_.add_argument("--label", default=None, help="Result name (default: git revision)")
+
+    cmp_ = sub.add_parser("compare", help="Compare two saved results")
+    cmp_.add_argument("base")
+    cmp_.add_argument("new")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        runs = run(load_config(args.config), args.seasons, args.pitches_per_season)
+        print("\n".join(format_runs(runs)))
+        print(f"Results saved to {save_result(runs, args.pitches_per_season, args.label)}")
+        return
+    with open(args.base) as f_base, open(args.new) as f_new:
+        print("\n".join(compare(json.load(f_base), json.load(f_new))))
+
+
+if __name__ == "__main__":
+    main()
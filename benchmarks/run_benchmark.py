@@ -0,0 +1,286 @@
+"""
+Offline extraction benchmark.
+
+Replays recorded Stats API responses and Statcast CSVs through the real
+extraction pipeline (run_all) into a throwaway PostgreSQL database, and
+saves per-step fetch / transform / load timings so runs can be compared
+between commits.
+
+Fixtures are recorded once from the live APIs:
+- Stats API responses are stored in the on-disk response cache format
+  (response_cache.py), one JSON file per request URL. Replay serves them
+  with an effectively infinite TTL, and any request without a fixture
+  fails instead of reaching the network.
+- Statcast chunks are stored as gzipped CSVs named after their date range.
+  Replay patches extract_statcast.fetch_statcast_chunk to serve any
+  requested range from them, since adaptive chunk plans can differ
+  between runs.
+- manifest.json records the extraction and Statcast settings used, so
+  replay uses the same season, game types and chunking.
+
+The throwaway database is created on the server from config.yml
+(database section), loaded with db/schema.sql, and dropped afterwards.
+
+Usage:
+    python benchmarks/run_benchmark.py record --fixtures benchmarks/fixtures/2024-april
+    python benchmarks/run_benchmark.py run --fixtures benchmarks/fixtures/2024-april
+    python benchmarks/run_benchmark.py compare benchmarks/results/abc123.json benchmarks/results/def456.json
+"""
+
+import argparse
+import copy
+import json
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import psycopg2
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import extract_statcast
+import stats_api
+from run_extraction import run_all
+from utils import load_config
+
+SCHEMA_PATH = os.path.join(ROOT, "db", "schema.sql")
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+PHASES = ("fetch", "transform", "db_load", "rate_limit_wait", "retry_backoff")
+NEVER_EXPIRES = 10 ** 10  # seconds
+NO_EVICTION_MB = 1 << 20
+
+
+# ---------------------------------------------------------------------------
+# Throwaway database
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def throwaway_database(cfg):
+    """Create an empty database with the raw schema; yield a cfg pointing at it."""
+    db = cfg["database"]
+    name = f"mlb_bench_{os.getpid()}_{int(time.time())}"
+    admin = psycopg2.connect(host=db["host"], port=db["port"], dbname="postgres",
+                             user=db["user"], password=db["password"])
+    admin.autocommit = True
+    try:
+        with admin.cursor() as cur:
+            cur.execute(f"CREATE DATABASE {name}")
+        bench_cfg = {**cfg, "database": {**db, "dbname": name}}
+        conn = psycopg2.connect(host=db["host"], port=db["port"], dbname=name,
+                                user=db["user"], password=db["password"])
+        try:
+            with open(SCHEMA_PATH) as f, conn.cursor() as cur:
+                cur.execute(f.read())
+            conn.commit()
+        finally:
+            conn.close()
+        yield bench_cfg
+    finally:
+        with admin.cursor() as cur:
+            cur.execute(f"DROP DATABASE IF EXISTS {name} WITH (FORCE)")
+        admin.close()
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+def statcast_fixture_path(fixtures, start_dt, end_dt):
+    return os.path.join(fixtures, "statcast", f"{start_dt}_{end_dt}.csv.gz")
+
+
+def load_statcast_fixtures(fixtures):
+    """Concatenate every recorded Statcast chunk, with game_date as YYYY-MM-DD strings."""
+    frames = []
+    directory = os.path.join(fixtures, "statcast")
+    for name in sorted(os.listdir(directory)) if os.path.isdir(directory) else []:
+        try:
+            frames.append(pd.read_csv(os.path.join(directory, name)))
+        except pd.errors.EmptyDataError:
+            continue
+    if not frames:
+        return pd.DataFrame({"game_date": pd.Series(dtype=str)})
+    recorded = pd.concat(frames, ignore_index=True)
+    recorded["game_date"] = pd.to_datetime(recorded["game_date"]).dt.strftime("%Y-%m-%d")
+    return recorded
+
+
+def bench_config(cfg, fixtures, manifest=None):
+    """Config for a benchmark run: fixture-backed cache, no throttling, full extraction."""
+    cfg = copy.deepcopy(cfg)
+    if manifest:
+        cfg["extraction"] = manifest["extraction"]
+        cfg["statcast"] = manifest["statcast"]
+    # Replay patches only the threaded client's transport; the async client
+    # would go to the network
+    cfg["extraction"] = {**cfg["extraction"], "http_client": "threads"}
+    cfg["http_cache"] = {
+        "enabled": True,
+        "dir": os.path.join(fixtures, "statsapi"),
+        "max_mb": NO_EVICTION_MB,
+        "default_ttl": NEVER_EXPIRES,
+        "ttl": {},
+    }
+    cfg["rate_limit"] = {**cfg.get("rate_limit", {}), "statcast_delay": 0}
+    # Patched fetchers only apply in this process, so Statcast runs serially
+    cfg["statcast"] = {**cfg["statcast"], "max_workers": 1, "resume": False, "replace_seasons": False}
+    cfg["incremental"] = {"enabled": False}
+    cfg["parquet"] = {"enabled": False}
+    cfg["metrics"] = {}
+    return cfg
+
+
+def _offline_http_get(endpoint, url, headers):
+    raise RuntimeError(f"No recorded fixture for {url}; re-record the fixtures")
+
+
+def record(cfg, fixtures):
+    """Run the pipeline against the live APIs, saving every response as a fixture."""
+    os.makedirs(os.path.join(fixtures, "statcast"), exist_ok=True)
+    live_fetch = extract_statcast.fetch_statcast_chunk
+
+    def recording_fetch(start_dt, end_dt):
+        df = live_fetch(start_dt, end_dt)
+        (df if df is not None else pd.DataFrame()).to_csv(
+            statcast_fixture_path(fixtures, start_dt, end_dt), index=False)
+        return df
+
+    bench_cfg = bench_config(cfg, fixtures)
+    with open(os.path.join(fixtures, "manifest.json"), "w") as f:
+        json.dump({"extraction": bench_cfg["extraction"], "statcast": bench_cfg["statcast"],
+                   "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z")}, f, indent=2)
+
+    extract_statcast.fetch_statcast_chunk = recording_fetch
+    with throwaway_database(bench_cfg) as db_cfg:
+        return run_all(db_cfg)
+
+
+def replay(cfg, fixtures):
+    """Run the pipeline from fixtures only; return run_all's JSON run report."""
+    with open(os.path.join(fixtures, "manifest.json")) as f:
+        manifest = json.load(f)
+
+    recorded = load_statcast_fixtures(fixtures)
+
+    def replay_fetch(start_dt, end_dt):
+        # Chunk plans depend on database state, so serve any requested range
+        # from whatever recorded chunks cover it
+        mask = (recorded["game_date"] >= start_dt) & (recorded["game_date"] <= end_dt)
+        return recorded.loc[mask].reset_index(drop=True)
+
+    bench_cfg = bench_config(cfg, fixtures, manifest)
+    report_path = os.path.join(fixtures, ".last_report.json")
+    bench_cfg["metrics"] = {"report_file": report_path}
+
+    extract_statcast.fetch_statcast_chunk = replay_fetch
+    stats_api._http_get = _offline_http_get
+    with throwaway_database(bench_cfg) as db_cfg:
+        status = run_all(db_cfg)
+    if status != 0:
+        raise SystemExit("Benchmark run failed; see the log above")
+    with open(report_path) as f:
+        return json.load(f)
+
+
+# ---------------------------------------------------------------------------
+# Results
+# ---------------------------------------------------------------------------
+
+def summarize(report):
+    """Reduce a run report to per-step phase timings."""
+    steps = {}
+    for name, step in report["steps"].items():
+        if "elapsed" not in step:
+            continue
+        phases = {p: step["phases"].get(p, 0.0) for p in PHASES}
+        if "fetch" not in step["phases"]:
+            # Stats API steps: whatever is not transform or load is fetching
+            # (fixture reads here) plus bookkeeping
+            phases["fetch"] = max(0.0, step["elapsed"] - phases["transform"] - phases["db_load"])
+        steps[name] = {
+            "elapsed": step["elapsed"],
+            "rows": step.get("rows"),
+            "rows_per_second": step.get("rows_per_second"),
+            **phases,
+        }
+    return {"wall_clock": report["wall_clock_seconds"], "steps": steps}
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save_result(summary, fixtures, label=None):
+    revision = git_revision()
+    result = {
+        "label": label or revision,
+        "revision": revision,
+        "fixtures": os.path.relpath(fixtures, ROOT),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        **summary,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{result['label']}.json")
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
+    return path
+
+
+def compare(base, new):
+    """Return report lines comparing two saved results step by step."""
+    def delta(a, b):
+        if not a:
+            return "     n/a"
+        return f"{(b - a) / a * 100:+7.1f}%"
+
+    lines = [f"{base['label']} -> {new['label']}",
+             f"{'step':<16}{'phase':<12}{'base':>10}{'new':>10}{'change':>10}"]
+    for name in new["steps"]:
+        if name not in base["steps"]:
+            continue
+        for phase in ("elapsed",) + PHASES[:3]:
+            a, b = base["steps"][name][phase], new["steps"][name][phase]
+            lines.append(f"{name:<16}{phase:<12}{a:>9.2f}s{b:>9.2f}s{delta(a, b):>10}")
+    a, b = base["wall_clock"], new["wall_clock"]
+    lines.append(f"{'total':<16}{'wall_clock':<12}{a:>9.2f}s{b:>9.2f}s{delta(a, b):>10}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline extraction benchmark")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="Record fixtures from the live APIs")
+    rec.add_argument("--fixtures", required=True, help="Fixture directory to write")
+    rec.add_argument("--config", default=None, help="Config file (default: config.yml)")
+
+    run = sub.add_parser("run", help="Replay fixtures and save timings")
+    run.add_argument("--fixtures", required=True, help="Fixture directory to replay")
+    run.add_argument("--config", default=None, help="Config file (default: config.yml)")
+    run.add_argument("--label", default=None, help="Result name (default: git revision)")
+
+    cmp_ = sub.add_parser("compare", help="Compare two saved results")
+    cmp_.add_argument("base")
+    cmp_.add_argument("new")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        sys.exit(record(load_config(args.config), args.fixtures))
+    if args.command == "run":
+        summary = summarize(replay(load_config(args.config), args.fixtures))
+        print(f"Results saved to {save_result(summary, args.fixtures, args.label)}")
+        return
+    with open(args.base) as f_base, open(args.new) as f_new:
+        print("\n".join(compare(json.load(f_base), json.load(f_new))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+-- =============================================================================
+-- Migration 001 - Statcast natural key and load checkpoints
+-- =============================================================================
+-- Brings an existing database in line with db/schema.sql:
+--   * removes duplicate pitches appended by earlier reruns (keeps the newest)
+--   * adds the (game_pk, at_bat_number, pitch_number) unique constraint
+--   * creates raw_mlb.statcast_load_checkpoints
+--
+--   psql mlb_data -f db/migrations/001_statcast_natural_key.sql
+-- =============================================================================
+
+BEGIN;
+
+DELETE FROM raw_mlb.raw_statcast
+WHERE game_pk IS NULL OR at_bat_number IS NULL OR pitch_number IS NULL;
+
+DELETE FROM raw_mlb.raw_statcast s
+USING raw_mlb.raw_statcast newer
+WHERE s.game_pk = newer.game_pk
+  AND s.at_bat_number = newer.at_bat_number
+  AND s.pitch_number = newer.pitch_number
+  AND s.id < newer.id;
+
+ALTER TABLE raw_mlb.raw_statcast
+    ALTER COLUMN game_pk SET NOT NULL,
+    ALTER COLUMN at_bat_number SET NOT NULL,
+    ALTER COLUMN pitch_number SET NOT NULL,
+    ADD UNIQUE (game_pk, at_bat_number, pitch_number);
+
+DROP INDEX IF EXISTS raw_mlb.idx_raw_statcast_game;
+
+CREATE TABLE IF NOT EXISTS raw_mlb.statcast_load_checkpoints (
+    start_date          DATE NOT NULL,
+    end_date            DATE NOT NULL,
+    row_count           INTEGER NOT NULL,
+    loaded_at           TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (start_date, end_date)
+);
+
+COMMIT;
@@ -0,0 +1,57 @@
+-- =============================================================================
+-- Migration 002 - Partition raw_statcast by season
+-- =============================================================================
+-- Rebuilds raw_mlb.raw_statcast as a table range-partitioned on game_date
+-- with one partition per season, copying existing rows across. Requires
+-- migration 001.
+--
+--   psql mlb_data -f db/migrations/002_partition_raw_statcast.sql
+-- =============================================================================
+
+BEGIN;
+
+ALTER TABLE raw_mlb.raw_statcast RENAME TO raw_statcast_unpartitioned;
+ALTER INDEX raw_mlb.raw_statcast_pkey RENAME TO raw_statcast_unpartitioned_pkey;
+ALTER SEQUENCE raw_mlb.raw_statcast_id_seq OWNED BY NONE;
+
+CREATE TABLE raw_mlb.raw_statcast (
+    LIKE raw_mlb.raw_statcast_unpartitioned INCLUDING DEFAULTS,
+    PRIMARY KEY (id, game_date),
+    UNIQUE (game_pk, at_bat_number, pitch_number, game_date)
+) PARTITION BY RANGE (game_date);
+
+ALTER SEQUENCE raw_mlb.raw_statcast_id_seq OWNED BY raw_mlb.raw_statcast.id;
+
+DO $$
+DECLARE
+    first_year INTEGER;
+    last_year  INTEGER;
+BEGIN
+    SELECT LEAST(COALESCE(MIN(EXTRACT(YEAR FROM game_date))::INTEGER, 2015), 2015),
+           GREATEST(COALESCE(MAX(EXTRACT(YEAR FROM game_date))::INTEGER, 2026), 2026)
+    INTO first_year, last_year
+    FROM raw_mlb.raw_statcast_unpartitioned;
+
+    FOR yr IN first_year..last_year LOOP
+        EXECUTE format(
+            'CREATE TABLE raw_mlb.raw_statcast_%s PARTITION OF raw_mlb.raw_statcast '
+            'FOR VALUES FROM (%L) TO (%L)',
+            yr, make_date(yr, 1, 1), make_date(yr + 1, 1, 1)
+        );
+    END LOOP;
+END $$;
+
+INSERT INTO raw_mlb.raw_statcast SELECT * FROM raw_mlb.raw_statcast_unpartitioned;
+
+DROP TABLE raw_mlb.raw_statcast_unpartitioned;
+
+CREATE INDEX idx_raw_statcast_date ON raw_mlb.raw_statcast(game_date);
+CREATE INDEX idx_raw_statcast_batter ON raw_mlb.raw_statcast(batter);
+CREATE INDEX idx_raw_statcast_pitcher ON raw_mlb.raw_statcast(pitcher);
+CREATE INDEX idx_raw_statcast_pitch_type ON raw_mlb.raw_statcast(pitch_type);
+CREATE INDEX idx_raw_statcast_events ON raw_mlb.raw_statcast(events) WHERE events IS NOT NULL;
+CREATE INDEX idx_raw_statcast_batter_date ON raw_mlb.raw_statcast(batter, game_date);
+CREATE INDEX idx_raw_statcast_pitcher_date ON raw_mlb.raw_statcast(pitcher, game_date);
+CREATE INDEX idx_raw_statcast_year ON raw_mlb.raw_statcast(game_year);
+
+COMMIT;
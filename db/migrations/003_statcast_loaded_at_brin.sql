@@ -0,0 +1,11 @@
+-- =============================================================================
+-- Migration 003 - BRIN index on raw_statcast.loaded_at
+-- =============================================================================
+-- Supports the incremental dbt models, which look for pitches loaded since
+-- their last build.
+--
+--   psql mlb_data -f db/migrations/003_statcast_loaded_at_brin.sql
+-- =============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_raw_statcast_loaded_at
+    ON raw_mlb.raw_statcast USING brin(loaded_at);
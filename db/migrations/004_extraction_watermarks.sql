@@ -0,0 +1,13 @@
+-- =============================================================================
+-- Migration 004 - Extraction watermarks
+-- =============================================================================
+-- Per-step high-water marks used by incremental extraction (--incremental).
+--
+--   psql mlb_data -f db/migrations/004_extraction_watermarks.sql
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS raw_mlb.extraction_watermarks (
+    step                VARCHAR(50) PRIMARY KEY,
+    watermark           DATE NOT NULL,
+    updated_at          TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
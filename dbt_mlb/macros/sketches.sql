@@ -0,0 +1,88 @@
+{#
+  Mergeable quantile sketches for Statcast measurements.
+
+  A sketch is a sparse fixed-width histogram stored as jsonb,
+  {"<bin>": count, ...}, where bin = floor(value / width). Sketches merge
+  exactly by adding counts, so player-day sketches roll up into
+  player-season sketches (and any date window) without touching pitches,
+  and a quantile read from a sketch is within width / 2 of the exact value.
+
+  sketch_quantile() is (re)created in the target schema by
+  create_sketch_functions(), which runs on-run-start (see dbt_project.yml).
+#}
+
+{% macro sketch_width(metric) -%}
+    {%- set widths = {
+        'exit_velocity': 0.5,
+        'launch_angle': 1,
+        'release_speed': 0.25,
+        'release_spin_rate': 10,
+    } -%}
+    {{ widths[metric] }}
+{%- endmacro %}
+
+
+{#
+  Aggregate: sketch of a numeric column over the group's rows, or over the
+  rows matching `filter`; null when there is no non-null value to sketch.
+  The bins are collected with the built-in array_agg and counted once per
+  group in a scalar subquery, which is far cheaper than updating a jsonb
+  state per row or calling a SQL function per group
+#}
+{% macro sketch_agg(metric, column=none, filter=none) -%}
+    (select jsonb_object_agg(bin, n)
+     from (
+         select bin, count(*) as n
+         from unnest(array_agg(floor(({{ column or metric }}) / {{ sketch_width(metric) }})::integer)
+                     {%- if filter %} filter (where {{ filter }}){% endif %}) as bin
+         where bin is not null
+         group by bin
+     ) counted)
+{%- endmacro %}
+
+
+{# Aggregate: merge of the group's sketches ('{}' when all are null) #}
+{% macro sketch_merge_agg(sketch_column) -%}
+    (select coalesce(jsonb_object_agg(key, total), '{}'::jsonb)
+     from (
+         select key, sum(value::bigint) as total
+         from unnest(array_agg({{ sketch_column }})) as sketch, jsonb_each_text(sketch)
+         group by key
+     ) merged)
+{%- endmacro %}
+
+
+{# Scalar: approximate q-quantile (0-1) of a sketch, rounded to `precision` decimals #}
+{% macro sketch_quantile(sketch_column, metric, q, precision=1) -%}
+    round({{ target.schema }}.sketch_quantile({{ sketch_column }}, {{ q }}, {{ sketch_width(metric) }}), {{ precision }})
+{%- endmacro %}
+
+
+{% macro create_sketch_functions() %}
+    {% set s = target.schema %}
+    create schema if not exists {{ s }};
+
+    -- Sketches used to be built by custom aggregates; drop them if left over
+    drop aggregate if exists {{ s }}.sketch_agg(integer);
+    drop aggregate if exists {{ s }}.sketch_merge_agg(jsonb);
+    drop function if exists {{ s }}.sketch_add(jsonb, integer);
+    drop function if exists {{ s }}.sketch_merge(jsonb, jsonb);
+
+    -- Midpoint of the bin holding the q-quantile; null for an empty sketch
+    create or replace function {{ s }}.sketch_quantile(sketch jsonb, q numeric, width numeric)
+    returns numeric
+    language sql immutable parallel safe
+    as $$
+        select (bin + 0.5) * width
+        from (
+            select
+                key::integer as bin,
+                sum(value::bigint) over (order by key::integer) as cumulative,
+                sum(value::bigint) over () as total
+            from jsonb_each_text(sketch)
+        ) h
+        where cumulative >= q * total
+        order by bin
+        limit 1
+    $$;
+{% endmacro %}
@@ -1,6 +1,13 @@
+-- Incremental: games loaded since the last build replace both of their rows
+-- (delete+insert on game_pk).
 with games as (
     select * from {{ ref('stg_games') }}
     where game_status_code = 'F'
+    {% if is_incremental() %}
+      and loaded_at > (
+          select coalesce(max(loaded_at), '1900-01-01'::timestamptz) from {{ this }}
+      )
+    {% endif %}
 ),
 
 home_games as (
@@ -26,7 +33,8 @@ home_games as (
         day_night,
         series_description,
         series_game_number,
-        double_header
+        double_header,
+        loaded_at
     from games
     where home_score is not null and away_score is not null
 ),
@@ -54,7 +62,8 @@ away_games as (
         day_night,
         series_description,
         series_game_number,
-        double_header
+        double_header,
+        loaded_at
     from games
     where home_score is not null and away_score is not null
 ),
@@ -1,126 +1,88 @@
-with statcast as (
-    select * from {{ ref('stg_statcast') }}
-    where play_result is not null
+-- Season Statcast metrics summed from the player-day rollup
+-- (int_statcast_player_days) instead of re-aggregating every pitch.
+-- Percentiles come from the merged player-day sketches, not a sort over
+-- pitches, and the merged sketches are kept for rollups further up.
+-- Incremental: only player-seasons with player-days rebuilt since the last
+-- build are recomputed (delete+insert on player_id, season, player_role).
+with player_days as (
+    select * from {{ ref('int_statcast_player_days') }}
+    {% if is_incremental() %}
+    where (player_id, season, player_role) in (
+        select player_id, season, player_role
+        from {{ ref('int_statcast_player_days') }}
+        where last_loaded_at > (
+            select coalesce(max(last_loaded_at), '1900-01-01'::timestamptz) from {{ this }}
+        )
+    )
+    {% endif %}
 ),
 
-batter_metrics as (
+season_totals as (
     select
-        batter_id                   as player_id,
+        player_id,
         season,
-        'batter'                    as player_role,
-        count(*)                    as total_batted_balls,
-
-        -- Barrel: exit_velocity >= 98 AND launch_angle BETWEEN 26 AND 30
-        sum(case
-            when exit_velocity >= 98 and launch_angle between 26 and 30
-            then 1 else 0
-        end)                        as barrels,
-        case
-            when count(case when exit_velocity is not null then 1 end) > 0
-            then round(
-                sum(case
-                    when exit_velocity >= 98 and launch_angle between 26 and 30
-                    then 1 else 0
-                end)::numeric
-                / count(case when exit_velocity is not null then 1 end),
-                3
-            )
-        end                         as barrel_pct,
-
-        -- Hard Hit: exit_velocity >= 95
-        sum(case
-            when exit_velocity >= 95
-            then 1 else 0
-        end)                        as hard_hits,
-        case
-            when count(case when exit_velocity is not null then 1 end) > 0
-            then round(
-                sum(case
-                    when exit_velocity >= 95
-                    then 1 else 0
-                end)::numeric
-                / count(case when exit_velocity is not null then 1 end),
-                3
-            )
-        end                         as hard_hit_pct,
-
-        -- Average exit velocity and launch angle
-        round(avg(exit_velocity)::numeric, 1) as avg_exit_velocity,
-        round(avg(launch_angle)::numeric, 1)  as avg_launch_angle,
-
-        -- Max exit velocity
-        max(exit_velocity)                    as max_exit_velocity,
-
-        -- Expected stats averages
-        round(avg(expected_batting_avg)::numeric, 3) as avg_expected_batting_avg,
-        round(avg(expected_woba)::numeric, 3)        as avg_expected_woba
-
-    from statcast
-    where exit_velocity is not null
-    group by batter_id, season
-),
-
-pitcher_metrics as (
-    select
-        pitcher_id                  as player_id,
-        season,
-        'pitcher'                   as player_role,
-        count(*)                    as total_batted_balls,
-
-        -- Barrel: exit_velocity >= 98 AND launch_angle BETWEEN 26 AND 30
-        sum(case
-            when exit_velocity >= 98 and launch_angle between 26 and 30
-            then 1 else 0
-        end)                        as barrels,
-        case
-            when count(case when exit_velocity is not null then 1 end) > 0
-            then round(
-                sum(case
-                    when exit_velocity >= 98 and launch_angle between 26 and 30
-                    then 1 else 0
-                end)::numeric
-                / count(case when exit_velocity is not null then 1 end),
-                3
-            )
-        end                         as barrel_pct,
-
-        -- Hard Hit: exit_velocity >= 95
-        sum(case
-            when exit_velocity >= 95
-            then 1 else 0
-        end)                        as hard_hits,
-        case
-            when count(case when exit_velocity is not null then 1 end) > 0
-            then round(
-                sum(case
-                    when exit_velocity >= 95
-                    then 1 else 0
-                end)::numeric
-                / count(case when exit_velocity is not null then 1 end),
-                3
-            )
-        end                         as hard_hit_pct,
-
-        -- Average exit velocity and launch angle
-        round(avg(exit_velocity)::numeric, 1) as avg_exit_velocity,
-        round(avg(launch_angle)::numeric, 1)  as avg_launch_angle,
-
-        -- Max exit velocity
-        max(exit_velocity)                    as max_exit_velocity,
-
-        -- Expected stats averages (from batter's perspective, allowed by pitcher)
-        round(avg(expected_batting_avg)::numeric, 3) as avg_expected_batting_avg,
-        round(avg(expected_woba)::numeric, 3)        as avg_expected_woba
-
-    from statcast
-    where exit_velocity is not null
-    group by pitcher_id, season
-),
-
-combined as (
-    select * from batter_metrics
-    union all
-    select * from pitcher_metrics
+        player_role,
+        sum(batted_balls)::bigint       as total_batted_balls,
+        sum(barrels)::bigint            as barrels,
+        sum(hard_hits)::bigint          as hard_hits,
+        sum(exit_velocity_sum)          as exit_velocity_sum,
+        max(max_exit_velocity)          as max_exit_velocity,
+        sum(launch_angle_sum)           as launch_angle_sum,
+        sum(launch_angle_count)         as launch_angle_count,
+        sum(xba_sum)                    as xba_sum,
+        sum(xba_count)                  as xba_count,
+        sum(xwoba_sum)                  as xwoba_sum,
+        sum(xwoba_count)                as xwoba_count,
+        {{ sketch_merge_agg('exit_velocity_sketch') }}     as exit_velocity_sketch,
+        {{ sketch_merge_agg('launch_angle_sketch') }}      as launch_angle_sketch,
+        {{ sketch_merge_agg('release_speed_sketch') }}     as release_speed_sketch,
+        {{ sketch_merge_agg('release_spin_rate_sketch') }} as release_spin_rate_sketch,
+        max(last_loaded_at)             as last_loaded_at
+    from player_days
+    group by player_id, season, player_role
 )
 
-select * from combined
+select
+    player_id,
+    season,
+    player_role,
+    total_batted_balls,
+
+    -- Barrel: exit_velocity >= 98 AND launch_angle BETWEEN 26 AND 30
+    barrels,
+    round(barrels::numeric / nullif(total_batted_balls, 0), 3)              as barrel_pct,
+
+    -- Hard Hit: exit_velocity >= 95
+    hard_hits,
+    round(hard_hits::numeric / nullif(total_batted_balls, 0), 3)            as hard_hit_pct,
+
+    -- Average exit velocity and launch angle
+    round((exit_velocity_sum / nullif(total_batted_balls, 0))::numeric, 1)  as avg_exit_velocity,
+    round((launch_angle_sum / nullif(launch_angle_count, 0))::numeric, 1)   as avg_launch_angle,
+
+    -- Max exit velocity
+    max_exit_velocity,
+
+    -- Expected stats averages (for pitchers: allowed, from the batter's perspective)
+    round((xba_sum / nullif(xba_count, 0))::numeric, 3)                     as avg_expected_batting_avg,
+    round((xwoba_sum / nullif(xwoba_count, 0))::numeric, 3)                 as avg_expected_woba,
+
+    -- Sketch percentiles (within half a bin width of the exact value);
+    -- release speed and spin are over all pitches thrown, pitchers only
+    {{ sketch_quantile('exit_velocity_sketch', 'exit_velocity', 0.5) }}          as exit_velocity_p50,
+    {{ sketch_quantile('exit_velocity_sketch', 'exit_velocity', 0.9) }}          as exit_velocity_p90,
+    {{ sketch_quantile('launch_angle_sketch', 'launch_angle', 0.5) }}            as launch_angle_p50,
+    {{ sketch_quantile('release_speed_sketch', 'release_speed', 0.5) }}          as release_speed_p50,
+    {{ sketch_quantile('release_speed_sketch', 'release_speed', 0.9) }}          as release_speed_p90,
+    {{ sketch_quantile('release_spin_rate_sketch', 'release_spin_rate', 0.5, 0) }} as release_spin_rate_p50,
+
+    exit_velocity_sketch,
+    launch_angle_sketch,
+    release_speed_sketch,
+    release_spin_rate_sketch,
+
+    last_loaded_at
+
+from season_totals
+-- Pitcher-days without a ball in play carry only velocity and spin
+where total_batted_balls > 0
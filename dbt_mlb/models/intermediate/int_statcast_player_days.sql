@@ -0,0 +1,89 @@
+-- Player-day Statcast rollup: one row per (player_id, player_role, game_date)
+-- with additive batted-ball counters, so season and rolling-window metrics
+-- sum a few hundred rows per player instead of rescanning every pitch.
+-- Averages are kept as sums and counts, and distributions as quantile
+-- sketches (macros/sketches.sql), so everything stays mergeable.
+--
+-- Batter rows cover batted balls only. Pitcher rows cover every pitch so the
+-- release speed and spin sketches see the full arsenal; their batted-ball
+-- counters are filtered to balls in play, and a pitcher-day without one has
+-- batted_balls = 0.
+--
+-- Single pass: each pitch is read once and unpivoted into a batter row and a
+-- pitcher row, so both roles share one scan and one aggregate. The batted-ball
+-- flags and values are derived once per pitch; non-batted-ball values are
+-- nulled so the aggregates need no per-metric CASE. The unpivot is a plain
+-- cross join on a role flag: a lateral VALUES would be rescanned per pitch.
+--
+-- Incremental: every game date with pitches loaded since the last build is
+-- re-aggregated in full (delete+insert on player_id, player_role, game_date).
+with pitches as (
+    select
+        batter_id,
+        pitcher_id,
+        game_date,
+        season,
+        is_batted_ball,
+        -- Barrel: exit_velocity >= 98 AND launch_angle BETWEEN 26 AND 30
+        is_batted_ball and exit_velocity >= 98 and launch_angle between 26 and 30 as is_barrel,
+        -- Hard Hit: exit_velocity >= 95
+        is_batted_ball and exit_velocity >= 95      as is_hard_hit,
+        case when is_batted_ball then exit_velocity end          as bb_exit_velocity,
+        case when is_batted_ball then launch_angle end           as bb_launch_angle,
+        case when is_batted_ball then expected_batting_avg end   as bb_xba,
+        case when is_batted_ball then expected_woba end          as bb_xwoba,
+        release_speed,
+        release_spin_rate,
+        loaded_at
+    from (
+        select
+            *,
+            (play_result is not null and exit_velocity is not null) as is_batted_ball
+        from {{ ref('stg_statcast') }}
+        {% if is_incremental() %}
+        where game_date in (
+            select distinct game_date
+            from {{ ref('stg_statcast') }}
+            where loaded_at > (
+                select coalesce(max(last_loaded_at), '1900-01-01'::timestamptz) from {{ this }}
+            )
+        )
+        {% endif %}
+    ) statcast
+),
+
+player_pitches as (
+    select
+        case when r.is_pitcher then p.pitcher_id else p.batter_id end as player_id,
+        case when r.is_pitcher then 'pitcher' else 'batter' end     as player_role,
+        p.*
+    from pitches p
+    cross join (values (false), (true)) as r (is_pitcher)
+    where r.is_pitcher or p.is_batted_ball
+)
+
+select
+    player_id,
+    player_role,
+    game_date,
+    season,
+    count(*) filter (where is_batted_ball)      as batted_balls,
+    count(*) filter (where is_barrel)           as barrels,
+    count(*) filter (where is_hard_hit)         as hard_hits,
+    sum(bb_exit_velocity)                       as exit_velocity_sum,
+    max(bb_exit_velocity)                       as max_exit_velocity,
+    sum(bb_launch_angle)                        as launch_angle_sum,
+    count(bb_launch_angle)                      as launch_angle_count,
+    sum(bb_xba)                                 as xba_sum,
+    count(bb_xba)                               as xba_count,
+    sum(bb_xwoba)                               as xwoba_sum,
+    count(bb_xwoba)                             as xwoba_count,
+    -- Batted balls only, so pitcher rows don't feed the sketch a null per pitch
+    {{ sketch_agg('exit_velocity', 'bb_exit_velocity', filter='is_batted_ball') }} as exit_velocity_sketch,
+    {{ sketch_agg('launch_angle', 'bb_launch_angle', filter='is_batted_ball') }}   as launch_angle_sketch,
+    -- Pitchers only; batter rows skip the aggregate and get null
+    {{ sketch_agg('release_speed', filter="player_role = 'pitcher'") }}         as release_speed_sketch,
+    {{ sketch_agg('release_spin_rate', filter="player_role = 'pitcher'") }}     as release_spin_rate_sketch,
+    max(loaded_at)                              as last_loaded_at
+from player_pitches
+group by player_id, player_role, game_date, season
@@ -1,4 +1,23 @@
-with statcast_batters as (
+-- Percentile columns are read from the season sketches in
+-- int_statcast_metrics, so no pitch-level sort is needed.
+--
+-- Incremental: rankings are per season, so any season with changed
+-- player-seasons in int_statcast_metrics is rebuilt in full (delete+insert
+-- on season).
+with metrics as (
+    select * from {{ ref('int_statcast_metrics') }}
+    {% if is_incremental() %}
+    where season in (
+        select distinct season
+        from {{ ref('int_statcast_metrics') }}
+        where last_loaded_at > (
+            select coalesce(max(last_loaded_at), '1900-01-01'::timestamptz) from {{ this }}
+        )
+    )
+    {% endif %}
+),
+
+statcast_batters as (
     select
         sm.player_id,
         sm.season,
@@ -13,14 +32,26 @@ with statcast_batters as (
         sm.avg_exit_velocity,
         sm.avg_launch_angle,
         sm.max_exit_velocity,
+        sm.exit_velocity_p50,
+        sm.exit_velocity_p90,
+        sm.launch_angle_p50,
+        sm.release_speed_p50,
+        sm.release_speed_p90,
+        sm.release_spin_rate_p50,
         sm.avg_expected_batting_avg  as xba,
         sm.avg_expected_woba         as xwoba,
+        sm.last_loaded_at,
         -- Leaderboard rankings (batter perspective)
         rank() over (partition by sm.season order by sm.avg_exit_velocity desc nulls last) as exit_velo_rank,
         rank() over (partition by sm.season order by sm.barrel_pct desc nulls last) as barrel_pct_rank,
         rank() over (partition by sm.season order by sm.hard_hit_pct desc nulls last) as hard_hit_pct_rank,
-        rank() over (partition by sm.season order by sm.avg_expected_woba desc nulls last) as xwoba_rank
-    from {{ ref('int_statcast_metrics') }} sm
+        rank() over (partition by sm.season order by sm.avg_expected_woba desc nulls last) as xwoba_rank,
+        rank() over (partition by sm.season order by sm.exit_velocity_p90 desc nulls last) as exit_velo_p90_rank,
+        -- League percentile (0-100, higher is better)
+        round((100 * percent_rank() over (partition by sm.season order by sm.exit_velocity_p90 asc nulls first))::numeric, 0) as exit_velo_p90_percentile,
+        round((100 * percent_rank() over (partition by sm.season order by sm.avg_expected_woba asc nulls first))::numeric, 0) as xwoba_percentile,
+        null::numeric as release_speed_percentile
+    from metrics sm
     inner join {{ ref('stg_players') }} p on sm.player_id = p.player_id
     where sm.player_role = 'batter'
       and sm.total_batted_balls >= 50
@@ -41,14 +72,26 @@ statcast_pitchers as (
         sm.avg_exit_velocity,
         sm.avg_launch_angle,
         sm.max_exit_velocity,
+        sm.exit_velocity_p50,
+        sm.exit_velocity_p90,
+        sm.launch_angle_p50,
+        sm.release_speed_p50,
+        sm.release_speed_p90,
+        sm.release_spin_rate_p50,
         sm.avg_expected_batting_avg  as xba,
         sm.avg_expected_woba         as xwoba,
+        sm.last_loaded_at,
         -- Leaderboard rankings (pitcher perspective - lower is better)
         rank() over (partition by sm.season order by sm.avg_exit_velocity asc nulls last) as exit_velo_rank,
         rank() over (partition by sm.season order by sm.barrel_pct asc nulls last) as barrel_pct_rank,
         rank() over (partition by sm.season order by sm.hard_hit_pct asc nulls last) as hard_hit_pct_rank,
-        rank() over (partition by sm.season order by sm.avg_expected_woba asc nulls last) as xwoba_rank
-    from {{ ref('int_statcast_metrics') }} sm
+        rank() over (partition by sm.season order by sm.avg_expected_woba asc nulls last) as xwoba_rank,
+        rank() over (partition by sm.season order by sm.exit_velocity_p90 asc nulls last) as exit_velo_p90_rank,
+        -- League percentile (0-100, higher is better: softer contact allowed, more velocity)
+        round((100 * percent_rank() over (partition by sm.season order by sm.exit_velocity_p90 desc nulls first))::numeric, 0) as exit_velo_p90_percentile,
+        round((100 * percent_rank() over (partition by sm.season order by sm.avg_expected_woba desc nulls first))::numeric, 0) as xwoba_percentile,
+        round((100 * percent_rank() over (partition by sm.season order by sm.release_speed_p90 asc nulls first))::numeric, 0) as release_speed_percentile
+    from metrics sm
     inner join {{ ref('stg_players') }} p on sm.player_id = p.player_id
     where sm.player_role = 'pitcher'
       and sm.total_batted_balls >= 50
@@ -0,0 +1,62 @@
+-- Recent form: Statcast batted-ball metrics over the last 7, 14 and 30 days
+-- of each season, summed from the player-day rollup. Windows end at the
+-- latest game date loaded for the season (as_of_date) and are calendar
+-- days, so off days count toward the window.
+with player_days as (
+    select * from {{ ref('int_statcast_player_days') }}
+),
+
+as_of as (
+    select season, max(game_date) as as_of_date
+    from player_days
+    group by season
+),
+
+windows as (
+    select unnest(array[7, 14, 30]) as window_days
+),
+
+window_totals as (
+    select
+        pd.player_id,
+        pd.season,
+        pd.player_role,
+        w.window_days,
+        a.as_of_date,
+        sum(pd.batted_balls)::bigint    as batted_balls,
+        sum(pd.barrels)::bigint         as barrels,
+        sum(pd.hard_hits)::bigint       as hard_hits,
+        sum(pd.exit_velocity_sum)       as exit_velocity_sum,
+        max(pd.max_exit_velocity)       as max_exit_velocity,
+        sum(pd.launch_angle_sum)        as launch_angle_sum,
+        sum(pd.launch_angle_count)      as launch_angle_count,
+        sum(pd.xwoba_sum)               as xwoba_sum,
+        sum(pd.xwoba_count)             as xwoba_count,
+        {{ sketch_merge_agg('pd.exit_velocity_sketch') }} as exit_velocity_sketch
+    from player_days pd
+    inner join as_of a on pd.season = a.season
+    cross join windows w
+    where pd.game_date > a.as_of_date - w.window_days
+    group by pd.player_id, pd.season, pd.player_role, w.window_days, a.as_of_date
+    having sum(pd.batted_balls) > 0
+)
+
+select
+    wt.player_id,
+    wt.season,
+    wt.player_role,
+    p.full_name,
+    wt.window_days,
+    wt.as_of_date,
+    wt.batted_balls,
+    wt.barrels,
+    round(wt.barrels::numeric / nullif(wt.batted_balls, 0), 3)                  as barrel_pct,
+    wt.hard_hits,
+    round(wt.hard_hits::numeric / nullif(wt.batted_balls, 0), 3)                as hard_hit_pct,
+    round((wt.exit_velocity_sum / nullif(wt.batted_balls, 0))::numeric, 1)      as avg_exit_velocity,
+    round((wt.launch_angle_sum / nullif(wt.launch_angle_count, 0))::numeric, 1) as avg_launch_angle,
+    wt.max_exit_velocity,
+    {{ sketch_quantile('wt.exit_velocity_sketch', 'exit_velocity', 0.9) }}     as exit_velocity_p90,
+    round((wt.xwoba_sum / nullif(wt.xwoba_count, 0))::numeric, 3)               as xwoba
+from window_totals wt
+inner join {{ ref('stg_players') }} p on wt.player_id = p.player_id
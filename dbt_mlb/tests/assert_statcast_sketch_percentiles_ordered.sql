@@ -0,0 +1,8 @@
+-- Sketch percentiles should be ordered (p50 <= p90) and the 90th percentile
+-- exit velocity should not exceed the exact maximum by more than half a bin
+
+select *
+from {{ ref('int_statcast_metrics') }}
+where exit_velocity_p50 > exit_velocity_p90
+   or release_speed_p50 > release_speed_p90
+   or exit_velocity_p90 > max_exit_velocity + {{ sketch_width('exit_velocity') }} / 2.0
@@ -173,10 +173,12 @@ CREATE TABLE raw_mlb.raw_pitching_stats (
     UNIQUE (player_id, season, team_id, game_type)
 );
 
--- Statcast pitch-level data
+-- Statcast pitch-level data, range-partitioned by season on game_date.
+-- Every unique constraint on a partitioned table must include the partition
+-- key, so game_date is part of the primary key and the natural key.
 CREATE TABLE raw_mlb.raw_statcast (
-    id                  BIGSERIAL PRIMARY KEY,
-    game_pk             INTEGER,
+    id                  BIGSERIAL,
+    game_pk             INTEGER NOT NULL,
     game_date           DATE NOT NULL,
     game_year           INTEGER,
     batter              INTEGER NOT NULL,
@@ -221,8 +223,8 @@ CREATE TABLE raw_mlb.raw_statcast (
     babip_value         NUMERIC(5,3),
     iso_value           NUMERIC(5,3),
     launch_speed_angle  INTEGER,
-    at_bat_number       INTEGER,
-    pitch_number        INTEGER,
+    at_bat_number       INTEGER NOT NULL,
+    pitch_number        INTEGER NOT NULL,
     inning              INTEGER,
     inning_topbot       VARCHAR(5),
     outs_when_up        INTEGER,
@@ -233,7 +235,38 @@ CREATE TABLE raw_mlb.raw_statcast (
     on_3b               INTEGER,
     if_fielding_alignment VARCHAR(50),
     of_fielding_alignment VARCHAR(50),
-    loaded_at           TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    loaded_at           TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, game_date),
+    UNIQUE (game_pk, at_bat_number, pitch_number, game_date)
+) PARTITION BY RANGE (game_date);
+
+-- One partition per season (raw_statcast_YYYY); the loader creates any
+-- missing season on demand
+DO $$
+BEGIN
+    FOR yr IN 2015..2026 LOOP
+        EXECUTE format(
+            'CREATE TABLE raw_mlb.raw_statcast_%s PARTITION OF raw_mlb.raw_statcast '
+            'FOR VALUES FROM (%L) TO (%L)',
+            yr, make_date(yr, 1, 1), make_date(yr + 1, 1, 1)
+        );
+    END LOOP;
+END $$;
+
+-- Statcast load checkpoints (date ranges fully committed to raw_statcast)
+CREATE TABLE raw_mlb.statcast_load_checkpoints (
+    start_date          DATE NOT NULL,
+    end_date            DATE NOT NULL,
+    row_count           INTEGER NOT NULL,
+    loaded_at           TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (start_date, end_date)
+);
+
+-- Extraction watermarks (latest date each step has fully loaded)
+CREATE TABLE raw_mlb.extraction_watermarks (
+    step                VARCHAR(50) PRIMARY KEY,
+    watermark           DATE NOT NULL,
+    updated_at          TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
 -- Schedule
@@ -292,8 +325,7 @@ CREATE INDEX idx_raw_pitching_season ON raw_mlb.raw_pitching_stats(season);
 CREATE INDEX idx_raw_pitching_team ON raw_mlb.raw_pitching_stats(team_id);
 CREATE INDEX idx_raw_pitching_player_season ON raw_mlb.raw_pitching_stats(player_id, season);
 
--- Statcast indexes
-CREATE INDEX idx_raw_statcast_game ON raw_mlb.raw_statcast(game_pk);
+-- Statcast indexes (game_pk lookups use the natural-key unique index)
 CREATE INDEX idx_raw_statcast_date ON raw_mlb.raw_statcast(game_date);
 CREATE INDEX idx_raw_statcast_batter ON raw_mlb.raw_statcast(batter);
 CREATE INDEX idx_raw_statcast_pitcher ON raw_mlb.raw_statcast(pitcher);
@@ -302,6 +334,8 @@ CREATE INDEX idx_raw_statcast_events ON raw_mlb.raw_statcast(events) WHERE event
 CREATE INDEX idx_raw_statcast_batter_date ON raw_mlb.raw_statcast(batter, game_date);
 CREATE INDEX idx_raw_statcast_pitcher_date ON raw_mlb.raw_statcast(pitcher, game_date);
 CREATE INDEX idx_raw_statcast_year ON raw_mlb.raw_statcast(game_year);
+-- BRIN: loaded_at follows insertion order; lets incremental dbt builds find new pitches cheaply
+CREATE INDEX idx_raw_statcast_loaded_at ON raw_mlb.raw_statcast USING brin(loaded_at);
 
 -- Schedule indexes
 CREATE INDEX idx_raw_schedule_date ON raw_mlb.raw_schedule(game_date);
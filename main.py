@@ -5,6 +5,10 @@ Usage:
     python main.py                     # Run full extraction pipeline
     python main.py --skip statcast     # Skip Statcast (slow)
     python main.py --only teams players # Run only specific steps
+    python main.py --incremental       # Nightly run: only fetch what changed
+    python main.py --since 2024-07-01  # Incremental run from a fixed date
+    python main.py --seasons 2015-2024 # Backfill several seasons in parallel
+    python main.py --seasons 2015-2024 --backfill  # ...with Statcast indexes rebuilt at the end
 """
 
 import sys
@@ -13,7 +17,7 @@ import os
 # Ensure scripts directory is on the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "scripts"))
 
-from scripts.run_extraction import run_all
+from scripts.run_extraction import run_all, parse_seasons
 
 
 def main():
@@ -32,9 +36,35 @@ def main():
         default=None,
         help="Run only these extraction steps",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Fetch only what changed since each step's stored watermark",
+    )
+    parser.add_argument(
+        "--since",
+        default=None,
+        help="Incremental run starting from this date (YYYY-MM-DD) instead of the watermarks",
+    )
+    parser.add_argument(
+        "--seasons",
+        type=parse_seasons,
+        default=None,
+        help="Load several seasons in parallel, e.g. 2015-2024 (overrides extraction.season)",
+    )
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Load Statcast through UNLOGGED staging with secondary indexes rebuilt at the end",
+    )
     args = parser.parse_args()
+    if args.seasons and (args.incremental or args.since):
+        parser.error("--seasons is a full load and cannot be combined with --incremental/--since")
+    if args.backfill and (args.incremental or args.since):
+        parser.error("--backfill is a full load and cannot be combined with --incremental/--since")
 
-    sys.exit(run_all(skip=args.skip, only=args.only))
+    sys.exit(run_all(skip=args.skip, only=args.only, incremental=args.incremental, since=args.since,
+                     seasons=args.seasons, backfill=args.backfill))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,179 @@
+"""
+Asyncio client for the MLB Stats API.
+
+AsyncStatsClient issues Stats API requests from one event loop over a single
+aiohttp session: HTTP/1.1 keep-alive connections are pooled and reused (up
+to rate_limit.max_concurrency of them), an asyncio.Semaphore caps the
+requests in flight, and failed calls are retried with jittered backoff
+(utils.async_retry). URLs are built by stats_api.build_url, and requests
+take tokens from the same process-wide request_delay limiter and go through
+the same on-disk response cache as stats_api.get, so threaded and async
+callers share one rate budget and one cache.
+
+With ``extraction.http_client: async`` the roster and /people fan-outs run
+through ``map_all`` instead of fetch_all's thread pool. Requires aiohttp
+(``pip install .[async]``).
+"""
+
+import asyncio
+import json
+import time
+
+import metrics
+import player_resolver
+import stats_api
+from fetch_engine import max_concurrency
+from utils import async_retry, get_rate_limiter
+
+KEEPALIVE_SECONDS = 30
+
+
+def enabled(cfg):
+    return cfg["extraction"].get("http_client", "threads") == "async"
+
+
+class HTTPError(Exception):
+    pass
+
+
+class Response:
+    """Fully read response with the requests-style interface ResponseCache.store expects."""
+
+    def __init__(self, url, status, headers, content):
+        self.url = url
+        self.status_code = status
+        self.headers = headers
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HTTPError(f"{self.status_code} error for {self.url}")
+
+
+class AsyncStatsClient:
+    """Stats API client for use as ``async with AsyncStatsClient(cfg) as client``.
+
+    ``session`` replaces the aiohttp session (anything with an aiohttp-style
+    ``get``); the client then leaves closing it to the caller.
+    """
+
+    def __init__(self, cfg, session=None):
+        self.cfg = cfg
+        self._session = session
+        self._owns_session = session is None
+        self._semaphore = asyncio.Semaphore(max_concurrency(cfg))
+        self._limiter = get_rate_limiter(cfg, "request_delay")
+        self._cache = stats_api.response_cache()
+
+    async def __aenter__(self):
+        if self._session is None:
+            import aiohttp
+
+            connector = aiohttp.TCPConnector(
+                limit=max_concurrency(self.cfg), keepalive_timeout=KEEPALIVE_SECONDS
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=stats_api.DEFAULT_TIMEOUT),
+            )
+        return self
+
+    async def __aexit__(self, *exc):
+        if self._owns_session:
+            await self._session.close()
+            self._session = None
+        return False
+
+    async def _http_get(self, endpoint, url, headers):
+        async with self._semaphore:
+            wait = self._limiter.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                metrics.add_time("rate_limit_wait", wait)
+            start = time.perf_counter()
+            async with self._session.get(url, headers=headers) as resp:
+                content = await resp.read()
+                # aiohttp's headers are case-insensitive, like requests'; the cache
+                # looks up ETag / Last-Modified whatever case the server sent
+                response = Response(url, resp.status, resp.headers, content)
+            metrics.record_http(endpoint, time.perf_counter() - start, len(content))
+            return response
+
+    @async_retry(max_retries=3, backoff_factor=2)
+    async def get(self, endpoint, params):
+        """Call the Stats API and return the decoded JSON body, like ``stats_api.get``."""
+        url = stats_api.build_url(endpoint, params)
+        if self._cache is not None:
+            body, headers = self._cache.lookup(endpoint, url)
+            if body is not None:
+                return body
+            return self._cache.store(endpoint, url, await self._http_get(endpoint, url, headers))
+        resp = await self._http_get(endpoint, url, {})
+        resp.raise_for_status()
+        return resp.json()
+
+    # -------------------------------------------------------------------------
+    # Endpoints used by the extraction steps
+    # -------------------------------------------------------------------------
+
+    async def teams(self, sport_id, season):
+        data = await self.get("teams", {"sportId": sport_id, "season": season})
+        return data.get("teams", [])
+
+    async def team_roster(self, team_id, season, roster_type="fullSeason"):
+        data = await self.get(
+            "team_roster", {"teamId": team_id, "season": season, "rosterType": roster_type}
+        )
+        return data.get("roster", [])
+
+    async def person(self, person_id, hydrate=None):
+        params = {"personId": person_id}
+        if hydrate:
+            params["hydrate"] = hydrate
+        people = (await self.get("person", params)).get("people", [])
+        return people[0] if people else None
+
+    async def people(self, person_ids, hydrate=None):
+        params = {"personIds": ",".join(str(pid) for pid in person_ids)}
+        if hydrate:
+            params["hydrate"] = hydrate
+        return (await self.get("people", params)).get("people", [])
+
+    async def person_stats(self, person_id, group, season, game_type="R"):
+        """Season splits for one player and stat group ("hitting"/"pitching"), or None."""
+        person = await self.person(person_id, player_resolver.stats_hydrate(season, game_type))
+        return player_resolver.person_stat_splits(person, group) if person else None
+
+    async def schedule(self, sport_id, season, game_types, hydrate=None):
+        params = {"sportId": sport_id, "season": season, "gameTypes": ",".join(game_types)}
+        if hydrate:
+            params["hydrate"] = hydrate
+        return (await self.get("schedule", params)).get("dates", [])
+
+    async def game(self, game_pk):
+        return await self.get("game", {"gamePk": game_pk})
+
+
+def map_all(cfg, func, items, session=None):
+    """Await ``func(client, item)`` for every item on one event loop; return results in order.
+
+    Like fetch_all, the first failure cancels the calls still pending and is
+    re-raised. Blocks the calling thread until every call has finished.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    async def main():
+        async with AsyncStatsClient(cfg, session) as client:
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(func(client, item)) for item in items]
+        return [task.result() for task in tasks]
+
+    try:
+        return asyncio.run(main())
+    except ExceptionGroup as eg:
+        raise eg.exceptions[0] from None
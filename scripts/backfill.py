@@ -0,0 +1,145 @@
+"""
+Deferred-index bulk loading into a partition of a partitioned raw table.
+
+An upsert into a partition with secondary indexes updates every B-tree row
+by row, which dominates a multi-season initial load. In backfill mode a
+partition is taken out of the index path for the duration of the load:
+
+1. detach() the partition from its parent, drop_secondary_indexes() on it
+   (the primary key and unique constraints stay, they back the upsert), and
+   add its partition bound as a CHECK constraint
+2. create_staging() an UNLOGGED, index-free copy of the partition; batches
+   are appended to it with a plain COPY (no WAL, no conflict handling)
+3. move_rows() upserts the staged rows into the partition in one statement,
+   latest staged row per key winning
+4. rebuild_indexes() recreates the parent's secondary indexes on the
+   partition with CREATE INDEX CONCURRENTLY, attach() puts it back (the
+   rebuilt indexes are adopted, and the CHECK constraint spares the bound
+   validation scan), and the partition is ANALYZEd
+
+While a partition is detached its rows are not visible through the parent.
+Every step is idempotent, so a backfill interrupted part-way is finished by
+running it again.
+"""
+
+
+def staging_table(partition):
+    return f"{partition}_backfill"
+
+
+def _bound_constraint(partition):
+    return f"{partition.split('.')[-1]}_backfill_bound"
+
+
+def is_attached(conn, partition):
+    """True unless the partition exists and is detached from its parent."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT to_regclass(%s) IS NULL
+                OR EXISTS (SELECT 1 FROM pg_inherits WHERE inhrelid = to_regclass(%s))
+            """,
+            (partition, partition),
+        )
+        return cur.fetchone()[0]
+
+
+def secondary_index_defs(conn, table):
+    """Return [(name, "USING method (columns) [WHERE ...]")] for the table's non-unique indexes."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT c.relname, pg_get_indexdef(i.indexrelid)
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE i.indrelid = %s::regclass
+              AND NOT i.indisunique
+            ORDER BY c.relname
+            """,
+            (table,),
+        )
+        return [(name, "USING " + definition.split(" USING ", 1)[1]) for name, definition in cur.fetchall()]
+
+
+def detach(conn, table, partition, lower, upper, date_column):
+    """Detach a partition, drop its secondary indexes and pin its bound with a CHECK. Does not commit."""
+    constraint = _bound_constraint(partition)
+    with conn.cursor() as cur:
+        if is_attached(conn, partition):
+            cur.execute(f"ALTER TABLE {table} DETACH PARTITION {partition}")
+        drop_secondary_indexes(conn, partition)
+        cur.execute(f"ALTER TABLE {partition} DROP CONSTRAINT IF EXISTS {constraint}")
+        cur.execute(
+            f"ALTER TABLE {partition} ADD CONSTRAINT {constraint} "
+            f"CHECK ({date_column} IS NOT NULL AND {date_column} >= %s AND {date_column} < %s)",
+            (lower, upper),
+        )
+
+
+def drop_secondary_indexes(conn, partition):
+    with conn.cursor() as cur:
+        for name, _ in secondary_index_defs(conn, partition):
+            cur.execute(f"DROP INDEX IF EXISTS {partition.rsplit('.', 1)[0]}.{name}")
+
+
+def create_staging(conn, partition):
+    """Create the partition's UNLOGGED staging table if missing. Does not commit."""
+    with conn.cursor() as cur:
+        cur.execute(f"""
+            CREATE UNLOGGED TABLE IF NOT EXISTS {staging_table(partition)}
+            (LIKE {partition} INCLUDING DEFAULTS, _stage_row BIGINT GENERATED ALWAYS AS IDENTITY)
+        """)
+
+
+def move_rows(conn, partition, columns, conflict_columns):
+    """Upsert the staged rows into the partition and drop the staging table.
+
+    Returns the rows moved. Does not commit.
+    """
+    staging = staging_table(partition)
+    col_list = ", ".join(columns)
+    conflict_list = ", ".join(conflict_columns)
+    update_set = ", ".join(f"{c} = EXCLUDED.{c}" for c in columns if c not in conflict_columns)
+    with conn.cursor() as cur:
+        cur.execute(f"""
+            INSERT INTO {partition} ({col_list})
+            SELECT DISTINCT ON ({conflict_list}) {col_list}
+            FROM {staging}
+            ORDER BY {conflict_list}, _stage_row DESC
+            ON CONFLICT ({conflict_list}) DO UPDATE SET {update_set}, loaded_at = NOW()
+        """)
+        moved = cur.rowcount
+        cur.execute(f"DROP TABLE {staging}")
+    return moved
+
+
+def rebuild_indexes(conn, table, partition, suffix):
+    """Recreate the parent's secondary indexes on the partition, concurrently.
+
+    Commits any open transaction first (CREATE INDEX CONCURRENTLY cannot run
+    inside one). Index builds use the session's maintenance_work_mem.
+    """
+    definitions = secondary_index_defs(conn, table)
+    conn.commit()
+    schema = partition.rsplit(".", 1)[0]
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            for name, definition in definitions:
+                cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {schema}.{name}_{suffix}")  # invalid leftovers
+                cur.execute(f"CREATE INDEX CONCURRENTLY {name}_{suffix} ON {partition} {definition}")
+    finally:
+        conn.autocommit = False
+    return len(definitions)
+
+
+def attach(conn, table, partition, lower, upper):
+    """Attach the partition back, drop the bound CHECK and ANALYZE it. Does not commit."""
+    with conn.cursor() as cur:
+        if not is_attached(conn, partition):
+            cur.execute(
+                f"ALTER TABLE {table} ATTACH PARTITION {partition} FOR VALUES FROM (%s) TO (%s)",
+                (lower, upper),
+            )
+        cur.execute(f"ALTER TABLE {partition} DROP CONSTRAINT IF EXISTS {_bound_constraint(partition)}")
+        cur.execute(f"ANALYZE {partition}")
@@ -1,45 +1,13 @@
-import sys
-import os
-
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "MLB-StatsAPI"))
-
-import statsapi
-from utils import load_config, get_connection, setup_logging, retry, rate_limit, upsert_rows
+import metrics
+import sinks
+from utils import load_config, connection, setup_logging, upsert_rows
+from pipeline_context import PipelineContext
+from bulk_stats import DEFAULT_STATS_MODE, player_season_splits
 
 TABLE = "raw_mlb.raw_batting_stats"
 CONFLICT_COLS = ["player_id", "season", "team_id", "game_type"]
 
 
-@retry(max_retries=3, backoff_factor=2)
-def fetch_team_roster(team_id, season):
-    data = statsapi.get(
-        "team_roster",
-        {"teamId": team_id, "season": season, "rosterType": "fullSeason"},
-    )
-    return data.get("roster", [])
-
-
-@retry(max_retries=3, backoff_factor=2)
-def fetch_player_hitting_stats(player_id, season, game_type="R"):
-    data = statsapi.get(
-        "person_stats",
-        {
-            "personId": player_id,
-            "hydrate": f"stats(group=[hitting],type=[season],season={season},gameType={game_type})",
-        },
-    )
-    people = data.get("people", [])
-    if not people:
-        return None
-    stats_list = people[0].get("stats", [])
-    for stat_group in stats_list:
-        if stat_group.get("group", {}).get("displayName") == "hitting":
-            splits = stat_group.get("splits", [])
-            if splits:
-                return splits
-    return None
-
-
 def safe_numeric(val, default=None):
     if val is None or val == "":
         return default
@@ -94,56 +62,37 @@ def transform_batting_stat(split, player_id, season, game_type):
     }
 
 
-def run(cfg=None):
+def run(cfg=None, ctx=None):
     if cfg is None:
         cfg = load_config()
+    if ctx is None:
+        ctx = PipelineContext(cfg)
     logger = setup_logging(cfg)
     logger.info("Starting batting stats extraction")
 
     season = cfg["extraction"]["season"]
     game_types = cfg["extraction"]["game_types"]
 
-    # Get all teams
-    teams_data = statsapi.get(
-        "teams",
-        {"sportId": cfg["extraction"]["sport_id"], "season": season},
-    )
-    teams = teams_data.get("teams", [])
-    logger.info(f"Found {len(teams)} teams")
+    player_ids = [pid for pid, _ in ctx.roster_players()]
+
+    stats_mode = cfg["extraction"].get("stats_mode", DEFAULT_STATS_MODE)
+    logger.info(f"Resolving hitting stats for {len(player_ids)} players ({stats_mode} mode)")
 
     all_rows = []
-    seen = set()
-
-    for team in teams:
-        team_id = team["id"]
-        logger.info(f"Processing batting stats for {team['name']}")
-        rate_limit(cfg)
-
-        roster = fetch_team_roster(team_id, season)
-        player_ids = [entry["person"]["id"] for entry in roster]
-
-        for pid in player_ids:
-            if pid in seen:
-                continue
-            seen.add(pid)
-
-            for gt in game_types:
-                rate_limit(cfg)
-                splits = fetch_player_hitting_stats(pid, season, gt)
-                if splits:
-                    for split in splits:
-                        row = transform_batting_stat(split, pid, season, gt)
-                        if row["team_id"] is not None:
-                            all_rows.append(row)
+    for gt in game_types:
+        splits = list(player_season_splits(player_ids, "hitting", season, gt, cfg))
+        with metrics.timer("transform"):
+            for pid, split in splits:
+                row = transform_batting_stat(split, pid, season, gt)
+                if row["team_id"] is not None:
+                    all_rows.append(row)
 
     logger.info(f"Total batting stat rows: {len(all_rows)}")
 
-    conn = get_connection(cfg)
-    try:
+    with connection(cfg) as conn:
         count = upsert_rows(conn, TABLE, all_rows, CONFLICT_COLS)
+        sinks.write_rows(cfg, TABLE, all_rows, CONFLICT_COLS)
         logger.info(f"Upserted {count} batting stats into {TABLE}")
-    finally:
-        conn.close()
 
     return count
 
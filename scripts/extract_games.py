@@ -1,32 +1,21 @@
-import sys
-import os
+from datetime import date
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "MLB-StatsAPI"))
-
-import statsapi
-from utils import load_config, get_connection, setup_logging, retry, rate_limit, upsert_rows
+import stats_api
+import metrics
+import sinks
+from utils import load_config, connection, setup_logging, retry, upsert_rows
+from pipeline_context import PipelineContext
+from watermarks import incremental_since, set_watermark
 
 TABLE = "raw_mlb.raw_games"
 CONFLICT_COLS = ["game_pk"]
-
-
-@retry(max_retries=3, backoff_factor=2)
-def fetch_schedule_for_games(cfg):
-    season = cfg["extraction"]["season"]
-    game_types = cfg["extraction"]["game_types"]
-    params = {
-        "sportId": cfg["extraction"]["sport_id"],
-        "season": season,
-        "gameTypes": ",".join(game_types),
-        "hydrate": "linescore,decisions",
-    }
-    data = statsapi.get("schedule", params)
-    return data.get("dates", [])
+STEP = "games"
+FINAL_STATUSES = ("F", "FT", "FR", "FO")
 
 
 @retry(max_retries=3, backoff_factor=2)
 def fetch_boxscore(game_pk, cfg):
-    data = statsapi.get("game", {"gamePk": game_pk})
+    data = stats_api.get("game", {"gamePk": game_pk})
     return data
 
 
@@ -69,31 +58,43 @@ def transform_game(g, game_date):
     }
 
 
-def run(cfg=None):
+def run(cfg=None, ctx=None):
     if cfg is None:
         cfg = load_config()
+    if ctx is None:
+        ctx = PipelineContext(cfg)
     logger = setup_logging(cfg)
     logger.info("Starting games extraction")
 
-    dates = fetch_schedule_for_games(cfg)
-    logger.info(f"Fetched {len(dates)} dates from schedule API")
-
-    rows = []
-    for date_entry in dates:
-        game_date = date_entry["date"]
-        for g in date_entry.get("games", []):
-            status = g.get("status", {}).get("statusCode", "")
-            if status in ("F", "FT", "FR", "FO"):  # Final statuses only
-                rows.append(transform_game(g, game_date))
-
-    logger.info(f"Total completed games: {len(rows)}")
+    with connection(cfg) as conn:
+        since = incremental_since(conn, cfg, STEP)
+        if since:
+            logger.info(f"Incremental games extraction from {since}")
+
+        dates = ctx.schedule()
+        if since:
+            # Only games up to today can have become Final
+            today = date.today().isoformat()
+            dates = [d for d in dates if since.isoformat() <= d["date"] <= today]
+        logger.info(f"Using {len(dates)} schedule dates")
+
+        with metrics.timer("transform"):
+            rows = []
+            for date_entry in dates:
+                game_date = date_entry["date"]
+                for g in date_entry.get("games", []):
+                    status = g.get("status", {}).get("statusCode", "")
+                    if status in FINAL_STATUSES:
+                        rows.append(transform_game(g, game_date))
+
+        logger.info(f"Total completed games: {len(rows)}")
 
-    conn = get_connection(cfg)
-    try:
         count = upsert_rows(conn, TABLE, rows, CONFLICT_COLS)
+        sinks.write_rows(cfg, TABLE, rows, CONFLICT_COLS)
+        if rows:
+            set_watermark(conn, STEP, max(r["game_date"] for r in rows))
+        conn.commit()
         logger.info(f"Upserted {count} games into {TABLE}")
-    finally:
-        conn.close()
 
     return count
 
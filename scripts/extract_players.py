@@ -1,29 +1,21 @@
-import sys
-import os
+from datetime import date
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "MLB-StatsAPI"))
-
-import statsapi
-from utils import load_config, get_connection, setup_logging, retry, rate_limit, upsert_rows
+import metrics
+import sinks
+from utils import load_config, connection, setup_logging, upsert_rows
+from pipeline_context import PipelineContext
+from player_resolver import resolve_people
+from watermarks import incremental_since, set_watermark
 
 TABLE = "raw_mlb.raw_players"
 CONFLICT_COLS = ["player_id"]
+STEP = "players"
 
 
-@retry(max_retries=3, backoff_factor=2)
-def fetch_team_roster(team_id, season, cfg):
-    data = statsapi.get(
-        "team_roster",
-        {"teamId": team_id, "season": season, "rosterType": "fullSeason"},
-    )
-    return data.get("roster", [])
-
-
-@retry(max_retries=3, backoff_factor=2)
-def fetch_player_detail(player_id, cfg):
-    data = statsapi.get("person", {"personId": player_id})
-    people = data.get("people", [])
-    return people[0] if people else None
+def load_existing_player_ids(conn):
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT player_id FROM {TABLE}")
+        return {row[0] for row in cur.fetchall()}
 
 
 def transform_player(p, team_id=None):
@@ -50,51 +42,61 @@ def transform_player(p, team_id=None):
     }
 
 
-def run(cfg=None):
+def run(cfg=None, ctx=None):
     if cfg is None:
         cfg = load_config()
+    if ctx is None:
+        ctx = PipelineContext(cfg)
     logger = setup_logging(cfg)
     logger.info("Starting players extraction")
 
     season = cfg["extraction"]["season"]
 
-    # First get all teams
-    teams_data = statsapi.get(
-        "teams",
-        {"sportId": cfg["extraction"]["sport_id"], "season": season},
-    )
-    teams = teams_data.get("teams", [])
-    logger.info(f"Found {len(teams)} teams")
-
-    all_rows = []
-    seen_ids = set()
-
-    for team in teams:
-        team_id = team["id"]
-        logger.info(f"Fetching roster for {team['name']} (ID: {team_id})")
-        rate_limit(cfg)
-
-        roster = fetch_team_roster(team_id, season, cfg)
-        player_ids = [entry["person"]["id"] for entry in roster]
-        logger.info(f"  Found {len(player_ids)} players on roster")
-
-        for pid in player_ids:
-            if pid in seen_ids:
-                continue
-            seen_ids.add(pid)
-            rate_limit(cfg)
-            detail = fetch_player_detail(pid, cfg)
-            if detail:
-                all_rows.append(transform_player(detail, team_id))
-
-    logger.info(f"Fetched {len(all_rows)} unique players")
-
-    conn = get_connection(cfg)
-    try:
-        count = upsert_rows(conn, TABLE, all_rows, CONFLICT_COLS)
-        logger.info(f"Upserted {count} players into {TABLE}")
-    finally:
-        conn.close()
+    for team, roster in ctx.rosters():
+        logger.info(f"Roster for {team['name']} (ID: {team['id']}): {len(roster)} players")
+    player_teams = list(ctx.roster_players())
+
+    with connection(cfg) as conn:
+        # Bios rarely change, so incremental runs only resolve new players
+        if incremental_since(conn, cfg, STEP):
+            existing = load_existing_player_ids(conn)
+            player_teams = [(pid, team_id) for pid, team_id in player_teams if pid not in existing]
+            logger.info(f"Incremental players extraction: {len(player_teams)} new players")
+        elif cfg["extraction"].get("reuse_loaded"):
+            # Bios are season-invariant: an older season of a multi-season
+            # run only fetches players no other season has loaded
+            existing = load_existing_player_ids(conn)
+            player_teams = [(pid, team_id) for pid, team_id in player_teams if pid not in existing]
+            logger.info(f"Reusing {len(existing)} loaded players; {len(player_teams)} to fetch")
+        claimed = set(ctx.shared.claim_players([pid for pid, _ in player_teams]))
+        player_teams = [(pid, team_id) for pid, team_id in player_teams if pid in claimed]
+
+        # Claims on players that end up not loaded (failed fetch or load) are
+        # released, so a later season still fetches them
+        loaded = set()
+        try:
+            # Season stats are hydrated alongside the bios so the batting and
+            # pitching steps can reuse the same batched responses.
+            game_type = cfg["extraction"]["game_types"][0]
+            people = resolve_people([pid for pid, _ in player_teams], season, game_type, cfg)
+
+            with metrics.timer("transform"):
+                all_rows = []
+                for pid, team_id in player_teams:
+                    detail = people.get(pid)
+                    if detail:
+                        all_rows.append(transform_player(detail, team_id))
+
+            logger.info(f"Fetched {len(all_rows)} unique players")
+
+            count = upsert_rows(conn, TABLE, all_rows, CONFLICT_COLS)
+            sinks.write_rows(cfg, TABLE, all_rows, CONFLICT_COLS)
+            set_watermark(conn, STEP, date.today())
+            conn.commit()
+            loaded = {row["player_id"] for row in all_rows}
+            logger.info(f"Upserted {count} players into {TABLE}")
+        finally:
+            ctx.shared.release_players(claimed - loaded)
 
     return count
 
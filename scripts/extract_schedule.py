@@ -1,27 +1,14 @@
-import sys
-import os
+from datetime import date
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "MLB-StatsAPI"))
-
-import statsapi
-from utils import load_config, get_connection, setup_logging, retry, rate_limit, upsert_rows
+import metrics
+import sinks
+from utils import load_config, connection, setup_logging, upsert_rows
+from pipeline_context import PipelineContext
+from watermarks import incremental_since, set_watermark
 
 TABLE = "raw_mlb.raw_schedule"
 CONFLICT_COLS = ["game_pk", "game_date"]
-
-
-@retry(max_retries=3, backoff_factor=2)
-def fetch_schedule(cfg):
-    season = cfg["extraction"]["season"]
-    game_types = cfg["extraction"]["game_types"]
-    params = {
-        "sportId": cfg["extraction"]["sport_id"],
-        "season": season,
-        "gameTypes": ",".join(game_types),
-        "hydrate": "linescore",
-    }
-    data = statsapi.get("schedule", params)
-    return data.get("dates", [])
+STEP = "schedule"
 
 
 def transform_schedule_game(g, game_date):
@@ -51,29 +38,41 @@ def transform_schedule_game(g, game_date):
     }
 
 
-def run(cfg=None):
+def run(cfg=None, ctx=None):
     if cfg is None:
         cfg = load_config()
+    if ctx is None:
+        ctx = PipelineContext(cfg)
     logger = setup_logging(cfg)
     logger.info("Starting schedule extraction")
 
-    dates = fetch_schedule(cfg)
-    logger.info(f"Fetched {len(dates)} dates from schedule API")
+    with connection(cfg) as conn:
+        since = incremental_since(conn, cfg, STEP)
+        if since:
+            logger.info(f"Incremental schedule extraction from {since}")
+
+        # The season schedule is shared with the games step; incremental
+        # runs narrow it here rather than with a separate date-range request.
+        dates = ctx.schedule()
+        if since:
+            dates = [d for d in dates if d["date"] >= since.isoformat()]
+        logger.info(f"Using {len(dates)} schedule dates")
 
-    rows = []
-    for date_entry in dates:
-        game_date = date_entry["date"]
-        for g in date_entry.get("games", []):
-            rows.append(transform_schedule_game(g, game_date))
+        with metrics.timer("transform"):
+            rows = []
+            for date_entry in dates:
+                game_date = date_entry["date"]
+                for g in date_entry.get("games", []):
+                    rows.append(transform_schedule_game(g, game_date))
 
-    logger.info(f"Total schedule entries: {len(rows)}")
+        logger.info(f"Total schedule entries: {len(rows)}")
 
-    conn = get_connection(cfg)
-    try:
         count = upsert_rows(conn, TABLE, rows, CONFLICT_COLS)
+        sinks.write_rows(cfg, TABLE, rows, CONFLICT_COLS)
+        # Future dates can still change, so the schedule is only settled up to today
+        set_watermark(conn, STEP, date.today())
+        conn.commit()
         logger.info(f"Upserted {count} schedule entries into {TABLE}")
-    finally:
-        conn.close()
 
     return count
 
@@ -1,13 +1,44 @@
 import sys
 import os
-import time
-from datetime import datetime, timedelta
+import multiprocessing
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
 
+import numpy as np
 import pandas as pd
 
-from utils import load_config, get_connection, setup_logging, retry, rate_limit, upsert_rows
+import backfill
+import metrics
+import sinks
+from utils import (
+    load_config, connection, setup_logging, retry, get_rate_limiter, upsert_frame,
+    copy_frame, reset_peak_rss, peak_rss_mb,
+)
+from pipeline_context import PipelineContext
+from watermarks import incremental_since, set_watermark
 
 TABLE = "raw_mlb.raw_statcast"
+STEP = "statcast"
+CHECKPOINT_TABLE = "raw_mlb.statcast_load_checkpoints"
+DEFAULT_BATCH_ROWS = 25000
+SCHEDULE_TABLE = "raw_mlb.raw_schedule"
+
+# Savant silently truncates a search at roughly 25-30k rows. Chunks are
+# planned to fill TARGET_FILL of the cap, and any result reaching the cap is
+# treated as truncated and re-fetched in halves.
+DEFAULT_ROW_CAP = 25000
+TARGET_FILL = 0.8
+DEFAULT_MAX_CHUNK_DAYS = 14
+# Estimates for days the schedule and prior loads know nothing about
+DEFAULT_PITCHES_PER_GAME = 300
+DEFAULT_GAMES_PER_DAY = 15
+
+# A pitch is identified by its game, plate appearance and pitch sequence.
+# game_date is included because raw_statcast is partitioned on it and every
+# unique constraint on a partitioned table must contain the partition key.
+NATURAL_KEY = ["game_pk", "at_bat_number", "pitch_number", "game_date"]
 
 # Map pybaseball DataFrame columns to our DB columns
 COLUMN_MAP = {
@@ -73,15 +104,266 @@ COLUMN_MAP = {
 # DB columns that hold the data (excluding id and loaded_at)
 DB_COLUMNS = list(COLUMN_MAP.values())
 
-
-def _date_chunks(start_date, end_date, chunk_days):
-    """Split a date range into chunks of chunk_days."""
-    start = datetime.strptime(start_date, "%Y-%m-%d")
-    end = datetime.strptime(end_date, "%Y-%m-%d")
-    while start <= end:
-        chunk_end = min(start + timedelta(days=chunk_days - 1), end)
-        yield start.strftime("%Y-%m-%d"), chunk_end.strftime("%Y-%m-%d")
-        start = chunk_end + timedelta(days=1)
+# DB columns stored as INTEGER
+INT_COLUMNS = [
+    "game_pk", "game_year", "batter", "pitcher", "zone",
+    "release_spin_rate", "launch_speed_angle", "at_bat_number",
+    "pitch_number", "inning", "outs_when_up", "balls", "strikes",
+    "on_1b", "on_2b", "on_3b",
+]
+
+# DB columns stored as TEXT/VARCHAR; everything else but game_date is NUMERIC
+TEXT_COLUMNS = [
+    "batter_name", "pitcher_name", "events", "description", "stand", "p_throws",
+    "home_team", "away_team", "type", "pitch_type", "pitch_name", "inning_topbot",
+    "if_fielding_alignment", "of_fielding_alignment",
+]
+
+
+def _chunk_dates(start_date, end_date):
+    day = datetime.strptime(start_date, "%Y-%m-%d").date()
+    end = datetime.strptime(end_date, "%Y-%m-%d").date()
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+def load_completed_dates(conn):
+    """Return the set of dates covered by committed load checkpoints."""
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT start_date, end_date FROM {CHECKPOINT_TABLE}")
+        ranges = cur.fetchall()
+    completed = set()
+    for start, end in ranges:
+        completed.update(_chunk_dates(start.isoformat(), end.isoformat()))
+    return completed
+
+
+def expected_pitches_by_day(conn, start_date, end_date):
+    """Estimate the pitches Savant will return for each day in the range.
+
+    Days already in raw_statcast use their loaded row count. Other days use
+    the scheduled game count times the average pitches per game of recent
+    loads. If the schedule has no games in the range at all (schedule not
+    loaded yet), every day is assumed to be a full slate.
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            f"SELECT game_date, COUNT(*) FROM {TABLE} WHERE game_date BETWEEN %s AND %s GROUP BY game_date",
+            (start_date, end_date),
+        )
+        loaded = dict(cur.fetchall())
+        cur.execute(
+            f"SELECT game_date, COUNT(*) FROM {SCHEDULE_TABLE} "
+            f"WHERE game_date BETWEEN %s AND %s GROUP BY game_date",
+            (start_date, end_date),
+        )
+        games = dict(cur.fetchall())
+        cur.execute(
+            f"""
+            SELECT COUNT(*)::float / NULLIF(COUNT(DISTINCT game_pk), 0)
+            FROM {TABLE}
+            WHERE game_date >= %s::date - 365 AND game_date <= %s
+            """,
+            (start_date, end_date),
+        )
+        pitches_per_game = cur.fetchone()[0] or DEFAULT_PITCHES_PER_GAME
+
+    expected = {}
+    for day in _chunk_dates(start_date, end_date):
+        if day in loaded:
+            expected[day] = loaded[day]
+        elif games:
+            expected[day] = games.get(day, 0) * pitches_per_game
+        else:
+            expected[day] = DEFAULT_GAMES_PER_DAY * pitches_per_game
+    return expected
+
+
+def plan_chunks(days, expected, target_rows, max_days=DEFAULT_MAX_CHUNK_DAYS):
+    """Group consecutive ``days`` into request chunks of about ``target_rows`` pitches.
+
+    Days are merged while the running estimate stays within ``target_rows``
+    and the span within ``max_days``, so off days and sparse stretches share
+    a request; a day expected to exceed the target on its own gets its own
+    chunk. A gap in ``days`` (e.g. a checkpointed day) always ends a chunk.
+    """
+    chunks = []
+    start = prev = None
+    total = 0
+    for day in days:
+        pitches = expected.get(day, 0)
+        if start is not None and (
+            day != prev + timedelta(days=1)
+            or total + pitches > target_rows
+            or (day - start).days >= max_days
+        ):
+            chunks.append((start, prev))
+            start = None
+        if start is None:
+            start, total = day, 0
+        total += pitches
+        prev = day
+    if start is not None:
+        chunks.append((start, prev))
+    return [(s.isoformat(), e.isoformat()) for s, e in chunks]
+
+
+def split_chunk(chunk):
+    """Split a chunk into two halves by date, or return None for a single day."""
+    start = date.fromisoformat(chunk[0])
+    end = date.fromisoformat(chunk[1])
+    if start == end:
+        return None
+    mid = start + timedelta(days=(end - start).days // 2)
+    return [(start.isoformat(), mid.isoformat()),
+            ((mid + timedelta(days=1)).isoformat(), end.isoformat())]
+
+
+def record_checkpoint(conn, start_date, end_date, row_count):
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            INSERT INTO {CHECKPOINT_TABLE} (start_date, end_date, row_count)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (start_date, end_date)
+            DO UPDATE SET row_count = EXCLUDED.row_count, loaded_at = NOW()
+            """,
+            (start_date, end_date, row_count),
+        )
+
+
+def partition_name(season):
+    return f"{TABLE}_{season}"
+
+
+def partition_bounds(season):
+    return f"{season}-01-01", f"{season + 1}-01-01"
+
+
+def ensure_partition(conn, season):
+    """Create the raw_statcast partition for a season if it does not exist."""
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {partition_name(season)}
+            PARTITION OF {TABLE} FOR VALUES FROM (%s) TO (%s)
+            """,
+            partition_bounds(season),
+        )
+
+
+def replace_partition(conn, season):
+    """Drop a season's partition and checkpoints and recreate it empty.
+
+    Dropping the partition discards the season in O(1) instead of deleting
+    row by row and leaves no dead tuples or index bloat behind.
+    """
+    with conn.cursor() as cur:
+        cur.execute(f"DROP TABLE IF EXISTS {partition_name(season)}")
+        cur.execute(
+            f"DELETE FROM {CHECKPOINT_TABLE} WHERE start_date >= %s AND start_date < %s",
+            partition_bounds(season),
+        )
+    ensure_partition(conn, season)
+
+
+def replace_range(conn, season, start_date, end_date):
+    """Discard a season's rows and checkpoints between start_date and end_date.
+
+    The partition is dropped whole (replace_partition) only when it holds
+    no rows outside the range; a partial-season range deletes just its own
+    days, so the rest of the season survives the reload. A checkpoint that
+    straddles the range edge is dropped too, and its outer days are simply
+    fetched again by a later resumed run. Returns True if the partition was
+    replaced. Does not commit.
+    """
+    partition = partition_name(season)
+    start = max(start_date, partition_bounds(season)[0])
+    end = min(end_date, f"{season}-12-31")
+    ensure_partition(conn, season)
+    with conn.cursor() as cur:
+        cur.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {partition} WHERE game_date < %s OR game_date > %s)",
+            (start, end),
+        )
+        if not cur.fetchone()[0]:
+            replace_partition(conn, season)
+            return True
+        cur.execute(f"DELETE FROM {partition} WHERE game_date BETWEEN %s AND %s", (start, end))
+        cur.execute(
+            f"DELETE FROM {CHECKPOINT_TABLE} WHERE start_date <= %s AND end_date >= %s",
+            (end, start),
+        )
+    return False
+
+
+def load_batch(conn, batch, backfill_mode=False):
+    """Upsert a transformed batch directly into its season partition(s).
+
+    In backfill mode the batch is appended to the partitions' UNLOGGED
+    staging tables instead (see finish_backfill). Does not commit.
+    """
+    seasons = batch["game_date"].str[:4].astype(int)
+    for season, part in batch.groupby(seasons):
+        if backfill_mode:
+            copy_frame(conn, backfill.staging_table(partition_name(season)), part)
+        else:
+            upsert_frame(conn, partition_name(season), part, NATURAL_KEY, commit=False)
+
+
+def begin_backfill(conn, season):
+    """Detach a season's partition, drop its secondary indexes and create its staging table."""
+    partition = partition_name(season)
+    backfill.detach(conn, TABLE, partition, *partition_bounds(season), "game_date")
+    backfill.create_staging(conn, partition)
+    conn.commit()
+
+
+def finish_backfill(conn, seasons, checkpoints, last_date, logger):
+    """Move the staged seasons into place, then rebuild indexes, re-attach and ANALYZE.
+
+    Checkpoints and the watermark are only recorded once the rows are in the
+    logged partitions, since an UNLOGGED staging table is emptied by a crash.
+    """
+    for season in seasons:
+        partition = partition_name(season)
+        with metrics.timer("db_load"):
+            moved = backfill.move_rows(conn, partition, DB_COLUMNS, NATURAL_KEY)
+        conn.commit()
+        logger.info(f"Backfill: moved {moved} staged rows into {partition}")
+
+    for chunk_start, chunk_end, row_count in checkpoints:
+        record_checkpoint(conn, chunk_start, chunk_end, row_count)
+    if last_date:
+        set_watermark(conn, STEP, last_date)
+    conn.commit()
+
+    for season in seasons:
+        partition = partition_name(season)
+        with metrics.timer("index_build"):
+            built = backfill.rebuild_indexes(conn, TABLE, partition, season)
+            backfill.attach(conn, TABLE, partition, *partition_bounds(season))
+            conn.commit()
+        logger.info(f"Backfill: rebuilt {built} indexes on {partition}, re-attached and analyzed it")
+    with conn.cursor() as cur:
+        cur.execute(f"ANALYZE {TABLE}")
+    conn.commit()
+
+
+def safe_watermark(last_loaded, failed_starts):
+    """Latest date the watermark may advance to after a run.
+
+    That is the last date loaded, held to the day before the earliest chunk
+    that failed to download, so the next incremental run re-fetches the gap.
+    Returns None when nothing was loaded.
+    """
+    if not last_loaded:
+        return None
+    if failed_starts:
+        gap = date.fromisoformat(min(failed_starts)) - timedelta(days=1)
+        return min(last_loaded, gap.isoformat())
+    return last_loaded
 
 
 @retry(max_retries=3, backoff_factor=2)
@@ -91,60 +373,127 @@ def fetch_statcast_chunk(start_dt, end_dt):
     return df
 
 
-def _safe_val(val):
-    """Convert pandas/numpy values to Python-native types safe for psycopg2."""
-    if pd.isna(val):
-        return None
-    if hasattr(val, "item"):  # numpy scalar
-        return val.item()
-    return val
+def fetch_chunks(chunks, cfg, max_workers=1):
+    """Download chunks with up to ``max_workers`` in flight, yielding results in submission order.
 
+    Yields ``(chunk, df, error)``. Downloads run in a process pool because
+    pybaseball's CSV parsing is CPU-bound, so the caller's transform and load
+    of one chunk overlap with the downloads of the next. Every download start
+    takes a token from the shared ``statcast_delay`` rate limiter, keeping the
+    overall request rate within budget regardless of ``max_workers``.
 
-def transform_statcast_df(df):
-    """Convert a pybaseball DataFrame into a list of dicts matching the DB schema."""
-    rows = []
-    # Handle the batter_name mapping: pybaseball uses 'player_name' for batter name
-    # and may or may not have 'pitcher_name'
-    has_pitcher_name = "pitcher_name" in df.columns
-
-    for _, row in df.iterrows():
-        record = {}
-        for src_col, db_col in COLUMN_MAP.items():
-            if src_col == "pitcher_name" and not has_pitcher_name:
-                record[db_col] = None
-                continue
-            if src_col in df.columns:
-                record[db_col] = _safe_val(row[src_col])
+    This is the pipeline's backpressure: a new download is only submitted
+    when the caller asks for the next chunk, so at most ``max_workers`` raw
+    chunks exist at once, and the generator keeps no reference to a chunk it
+    has handed over.
+
+    ``chunks`` may be a deque the caller keeps adding to while iterating
+    (e.g. the halves of a truncated chunk); they are picked up in order.
+    """
+    limiter = get_rate_limiter(cfg, "statcast_delay")
+    queue = chunks if isinstance(chunks, deque) else deque(chunks)
+
+    if max_workers <= 1:
+        while queue:
+            chunk = queue.popleft()
+            metrics.add_time("rate_limit_wait", limiter.acquire())
+            try:
+                with metrics.timer("fetch"):
+                    df = fetch_statcast_chunk(*chunk)
+            except Exception as e:
+                yield chunk, None, e
             else:
-                record[db_col] = None
-
-        # Convert game_date to string if it's a Timestamp
-        if record["game_date"] is not None and not isinstance(record["game_date"], str):
-            record["game_date"] = str(record["game_date"])[:10]
-
-        # Ensure integer fields are proper ints or None
-        int_fields = [
-            "game_pk", "game_year", "batter", "pitcher", "zone",
-            "release_spin_rate", "launch_speed_angle", "at_bat_number",
-            "pitch_number", "inning", "outs_when_up", "balls", "strikes",
-            "on_1b", "on_2b", "on_3b",
-        ]
-        for f in int_fields:
-            if record.get(f) is not None:
-                try:
-                    record[f] = int(record[f])
-                except (ValueError, TypeError):
-                    record[f] = None
-
-        # Skip rows missing required fields
-        if record["batter"] is None or record["pitcher"] is None or record["game_date"] is None:
-            continue
-
-        rows.append(record)
-    return rows
-
-
-def run(cfg=None):
+                yield chunk, df, None
+                del df
+        return
+
+    # Workers come from a forkserver, not a fork of this process: other steps'
+    # threads may hold locks (rate limiters, the connection pool) that a
+    # forked child would inherit locked
+    pending = deque()
+    mp_context = multiprocessing.get_context("forkserver")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as pool:
+        while True:
+            while len(pending) < max_workers and queue:
+                chunk = queue.popleft()
+                metrics.add_time("rate_limit_wait", limiter.acquire())
+                pending.append((chunk, pool.submit(fetch_statcast_chunk, *chunk)))
+            if not pending:
+                break
+            yield _chunk_result(*pending.popleft())
+
+
+def _chunk_result(chunk, future):
+    try:
+        with metrics.timer("fetch"):
+            return chunk, future.result(), None
+    except Exception as e:
+        return chunk, None, e
+
+
+def arrow_schema():
+    """Arrow schema for transformed batches, typed like the raw_statcast columns."""
+    import pyarrow as pa
+
+    def arrow_type(col):
+        if col == "game_date":
+            return pa.date32()
+        if col in INT_COLUMNS:
+            return pa.int32()
+        if col in TEXT_COLUMNS:
+            return pa.string()
+        return pa.float64()
+
+    return pa.schema([(col, arrow_type(col)) for col in DB_COLUMNS])
+
+
+def lake_writer(sink):
+    """Per-day Parquet writer for one chunk, or a no-op context when there is no sink."""
+    if sink is None:
+        return nullcontext()
+    return sink.daily_writer(TABLE, arrow_schema())
+
+
+def transform_statcast_df(df):
+    """Convert a pybaseball DataFrame into a columnar batch matching the DB schema.
+
+    Columns are selected and renamed via COLUMN_MAP (missing source columns
+    become all-null), integer columns are cast to nullable Int64, game_date is
+    formatted as YYYY-MM-DD, and rows missing batter, pitcher, game_date or
+    any NATURAL_KEY column are dropped.
+    """
+    batch = df.reindex(columns=list(COLUMN_MAP)).rename(columns=COLUMN_MAP)
+
+    for col in INT_COLUMNS:
+        values = pd.to_numeric(batch[col], errors="coerce").astype("Float64")
+        batch[col] = np.trunc(values).astype("Int64")
+
+    batch["game_date"] = pd.to_datetime(batch["game_date"], errors="coerce").dt.strftime("%Y-%m-%d")
+
+    required = batch["batter"].notna() & batch["pitcher"].notna() & batch["game_date"].notna()
+    for col in NATURAL_KEY:
+        required &= batch[col].notna()
+    return batch.loc[required].reset_index(drop=True)
+
+
+def iter_batches(df, batch_rows=DEFAULT_BATCH_ROWS):
+    """Transform a raw chunk in slices of ``batch_rows`` rows, yielding each batch.
+
+    Only one transformed slice (and its CSV buffer, in load_batch) is alive
+    at a time, so memory beyond the raw chunk is bounded by ``batch_rows``.
+    """
+    for start in range(0, len(df), batch_rows):
+        yield _timed_transform(df.iloc[start:start + batch_rows])
+
+
+def _timed_transform(df):
+    with metrics.timer("transform"):
+        return transform_statcast_df(df)
+
+
+def run(cfg=None, ctx=None):
+    # Pitches come from Baseball Savant; ctx is only used for the season's
+    # date range when no dates are configured (multi-season runs)
     if cfg is None:
         cfg = load_config()
     logger = setup_logging(cfg)
@@ -153,58 +502,149 @@ def run(cfg=None):
     sc_cfg = cfg.get("statcast", {})
     start_date = sc_cfg.get("start_date", "2024-03-28")
     end_date = sc_cfg.get("end_date", "2024-09-29")
-    chunk_days = sc_cfg.get("chunk_days", 5)
-    statcast_delay = cfg.get("rate_limit", {}).get("statcast_delay", 2.0)
-
-    chunks = list(_date_chunks(start_date, end_date, chunk_days))
-    logger.info(
-        f"Statcast extraction: {start_date} to {end_date}, "
-        f"{len(chunks)} chunks of {chunk_days} days"
-    )
-
-    conn = get_connection(cfg)
+    if not (start_date and end_date):
+        season_dates = (ctx or PipelineContext(cfg)).season_dates()
+        if season_dates is None:
+            logger.info(f"No {cfg['extraction']['season']} games scheduled; nothing to fetch")
+            return 0
+        start_date, end_date = season_dates
+    row_cap = int(sc_cfg.get("row_cap", DEFAULT_ROW_CAP))
+    max_chunk_days = int(sc_cfg.get("max_chunk_days", DEFAULT_MAX_CHUNK_DAYS))
+    max_workers = sc_cfg.get("max_workers", 1)
+    resume = sc_cfg.get("resume", True)
+    replace_seasons = sc_cfg.get("replace_seasons", False)
+    batch_rows = int(sc_cfg.get("batch_rows", DEFAULT_BATCH_ROWS))
+    backfill_mode = sc_cfg.get("backfill", False)
+
+    sink = sinks.get_sink(cfg)
     total_rows = 0
-
-    try:
-        for i, (chunk_start, chunk_end) in enumerate(chunks, 1):
-            logger.info(f"Chunk {i}/{len(chunks)}: {chunk_start} to {chunk_end}")
-            try:
-                df = fetch_statcast_chunk(chunk_start, chunk_end)
-            except Exception as e:
-                logger.error(f"Failed to fetch chunk {chunk_start}-{chunk_end}: {e}")
+    checkpoints = []  # deferred until the staged rows are moved (backfill)
+    last_loaded = None
+    failed_starts = []
+
+    with connection(cfg, bulk=True) as conn:
+        since = incremental_since(conn, cfg, STEP)
+        if since:
+            start_date = max(start_date, since.isoformat())
+            end_date = min(end_date, date.today().isoformat())
+            logger.info(f"Incremental Statcast extraction from {start_date}")
+
+        # Seasons (and, with replace_seasons, the days discarded) follow the
+        # range this run actually fetches
+        seasons = range(int(start_date[:4]), int(end_date[:4]) + 1)
+        for season in seasons:
+            if replace_seasons:
+                if replace_range(conn, season, start_date, end_date):
+                    logger.info(f"Replaced partition {partition_name(season)}")
+                else:
+                    logger.info(f"Replaced {start_date} to {end_date} in {partition_name(season)}")
+            else:
+                ensure_partition(conn, season)
+            if backfill_mode:
+                logger.info(f"Backfill: detaching {partition_name(season)} and staging its rows")
+                begin_backfill(conn, season)
+            elif not backfill.is_attached(conn, partition_name(season)):
+                raise RuntimeError(
+                    f"{partition_name(season)} is detached by an unfinished backfill; "
+                    f"re-run with --backfill to finish it"
+                )
+        conn.commit()
+
+        days = list(_chunk_dates(start_date, end_date))
+        if resume:
+            completed = load_completed_dates(conn)
+            if since:
+                # The incremental lookback re-pulls late and partially
+                # published days, so checkpoints must not skip them
+                completed = {d for d in completed if d < since}
+            remaining = [d for d in days if d not in completed]
+            if len(remaining) < len(days):
+                logger.info(f"Skipping {len(days) - len(remaining)} days already checkpointed")
+            days = remaining
+
+        expected = expected_pitches_by_day(conn, start_date, end_date)
+        chunks = deque(plan_chunks(days, expected, int(row_cap * TARGET_FILL), max_chunk_days))
+        logger.info(
+            f"Statcast extraction: {start_date} to {end_date}, {len(chunks)} chunks planned "
+            f"for ~{sum(expected[d] for d in days):,.0f} pitches, {max_workers} in flight"
+        )
+
+        results = fetch_chunks(chunks, cfg, max_workers)
+        for i, ((chunk_start, chunk_end), df, error) in enumerate(results, 1):
+            logger.info(f"Chunk {i} ({len(chunks)} queued): {chunk_start} to {chunk_end}")
+            if error is not None:
+                logger.error(f"Failed to fetch chunk {chunk_start}-{chunk_end}: {error}")
+                failed_starts.append(chunk_start)
                 continue
 
             if df is None or df.empty:
                 logger.info(f"  No data for {chunk_start} to {chunk_end}")
-                time.sleep(statcast_delay)
                 continue
 
-            rows = transform_statcast_df(df)
-            logger.info(f"  Fetched {len(df)} raw rows, transformed {len(rows)} valid rows")
-
-            if rows:
-                # Use batch insert without ON CONFLICT since raw_statcast has no unique
-                # constraint beyond the serial id. We use a simple INSERT approach.
-                columns = list(rows[0].keys())
-                col_list = ", ".join(columns)
-                placeholders = ", ".join([f"%({c})s" for c in columns])
-                sql = f"""
-                    INSERT INTO {TABLE} ({col_list})
-                    VALUES ({placeholders})
-                """
-                import psycopg2.extras
-                with conn.cursor() as cur:
-                    psycopg2.extras.execute_batch(cur, sql, rows, page_size=1000)
+            if len(df) >= row_cap:
+                halves = split_chunk((chunk_start, chunk_end))
+                if halves:
+                    logger.warning(
+                        f"  {len(df)} rows reached the Savant cap ({row_cap}); "
+                        f"re-fetching as {halves[0]} and {halves[1]}"
+                    )
+                    del df
+                    chunks.extendleft(reversed(halves))
+                    continue
+                logger.warning(
+                    f"  {len(df)} rows for a single day reached the Savant cap ({row_cap}); "
+                    f"results may be truncated"
+                )
+
+            reset_peak_rss()
+            raw_rows = len(df)
+            chunk_rows = 0
+            last_date = None
+            with lake_writer(sink) as lake:
+                for batch in iter_batches(df, batch_rows):
+                    if len(batch):
+                        load_batch(conn, batch, backfill_mode)
+                        if lake is not None:
+                            lake.write(batch)
+                        chunk_rows += len(batch)
+                        last_date = max(last_date or "", batch["game_date"].max())
+                    del batch  # release it before the next slice is transformed
+            del df
+
+            if chunk_rows:
+                # Rows and checkpoint commit together, so a crash never leaves
+                # a chunk half-loaded but marked complete. Chunks reaching
+                # today may still gain pitches and are not checkpointed.
+                complete = datetime.strptime(chunk_end, "%Y-%m-%d").date() < date.today()
+                if backfill_mode:
+                    if complete:
+                        checkpoints.append((chunk_start, chunk_end, chunk_rows))
+                elif complete:
+                    record_checkpoint(conn, chunk_start, chunk_end, chunk_rows)
+                last_loaded = max(last_loaded or "", last_date)
                 conn.commit()
-                total_rows += len(rows)
-                logger.info(f"  Inserted {len(rows)} rows into {TABLE}")
-
-            time.sleep(statcast_delay)
-
-    finally:
-        conn.close()
-
-    logger.info(f"Statcast extraction complete. Total rows inserted: {total_rows}")
+                total_rows += chunk_rows
+            logger.info(
+                f"  Fetched {raw_rows} raw rows, {'staged' if backfill_mode else 'upserted'} "
+                f"{chunk_rows} valid rows for {TABLE} (batches of {batch_rows}, peak RSS {peak_rss_mb():.0f} MB)"
+            )
+
+        # The watermark only moves once every chunk has been tried: chunks
+        # finish out of date order (splits are re-queued), and a failed one
+        # must hold it back so the next incremental run re-fetches the gap
+        watermark = safe_watermark(last_loaded, failed_starts)
+        if failed_starts:
+            logger.error(
+                f"{len(failed_starts)} chunk(s) failed from {min(failed_starts)}; "
+                f"watermark held at {watermark} so they are re-fetched next run"
+            )
+        if backfill_mode:
+            finish_backfill(conn, seasons, checkpoints, watermark, logger)
+        elif watermark:
+            set_watermark(conn, STEP, watermark)
+            conn.commit()
+
+    logger.info(f"Statcast extraction complete. Total rows upserted: {total_rows}")
     return total_rows
 
 
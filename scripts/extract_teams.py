@@ -1,26 +1,12 @@
-import sys
-import os
-
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "MLB-StatsAPI"))
-
-import statsapi
-from utils import load_config, get_connection, setup_logging, retry, rate_limit, upsert_rows
+import metrics
+import sinks
+from utils import load_config, connection, setup_logging, upsert_rows
+from pipeline_context import PipelineContext
 
 TABLE = "raw_mlb.raw_teams"
 CONFLICT_COLS = ["team_id"]
 
 
-@retry(max_retries=3, backoff_factor=2)
-def fetch_teams(cfg):
-    season = cfg["extraction"]["season"]
-    sport_id = cfg["extraction"]["sport_id"]
-    data = statsapi.get(
-        "teams",
-        {"sportId": sport_id, "season": season},
-    )
-    return data.get("teams", [])
-
-
 def transform_team(t):
     return {
         "team_id": t["id"],
@@ -41,23 +27,27 @@ def transform_team(t):
     }
 
 
-def run(cfg=None):
+def run(cfg=None, ctx=None):
     if cfg is None:
         cfg = load_config()
+    if ctx is None:
+        ctx = PipelineContext(cfg)
     logger = setup_logging(cfg)
     logger.info("Starting teams extraction")
 
-    teams = fetch_teams(cfg)
+    teams = ctx.teams()
     logger.info(f"Fetched {len(teams)} teams from API")
 
-    rows = [transform_team(t) for t in teams]
+    with metrics.timer("transform"):
+        rows = [transform_team(t) for t in teams]
 
-    conn = get_connection(cfg)
-    try:
-        count = upsert_rows(conn, TABLE, rows, CONFLICT_COLS)
+    with connection(cfg) as conn:
+        # In a multi-season run the newest season's names win; older
+        # seasons only add teams that are missing
+        update_cols = [] if cfg["extraction"].get("reuse_loaded") else None
+        count = upsert_rows(conn, TABLE, rows, CONFLICT_COLS, update_cols)
+        sinks.write_rows(cfg, TABLE, rows, CONFLICT_COLS)
         logger.info(f"Upserted {count} teams into {TABLE}")
-    finally:
-        conn.close()
 
     return count
 
@@ -0,0 +1,47 @@
+"""
+Concurrent fetch engine for Stats API calls.
+
+Runs a fetch function over many inputs on a thread pool, capping the number
+of requests in flight at rate_limit.max_concurrency. Stats API calls are
+rate limited by the transport (stats_api.get), so a response served from the
+cache costs no token; pass ``key`` to have every call take a token from the
+named limiter (utils.get_rate_limiter) instead.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from utils import get_rate_limiter
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+def max_concurrency(cfg):
+    return int(cfg.get("rate_limit", {}).get("max_concurrency", DEFAULT_MAX_CONCURRENCY))
+
+
+def fetch_all(func, items, cfg, key=None, max_workers=None):
+    """Call ``func(item)`` for every item concurrently and return results in input order.
+
+    The first exception raised by ``func`` is re-raised after pending calls
+    are cancelled, matching the fail-fast behaviour of a sequential loop.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    limiter = get_rate_limiter(cfg, key) if key else None
+    workers = max(1, min(max_workers or max_concurrency(cfg), len(items)))
+    step = metrics.current_step()
+
+    def call(item):
+        with metrics.step_scope(step):
+            if limiter is not None:
+                metrics.add_time("rate_limit_wait", limiter.acquire())
+            return func(item)
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch")
+    try:
+        return list(pool.map(call, items))
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,124 @@
+"""
+Bulk-import the Parquet lake (see sinks.py) into raw_mlb.
+
+Tables are loaded in foreign-key order through the same COPY-based upserts
+as the extraction steps, so importing into a populated database is safe and
+re-importing is idempotent. Statcast is read season by season as a dataset
+in record batches of statcast.batch_rows rows and loaded straight into the
+season partitions, one commit per season.
+
+Usage:
+    python scripts/load_parquet.py
+    python scripts/load_parquet.py --dir data/lake --only statcast
+"""
+
+import argparse
+import os
+import sys
+
+import extract_batting_stats
+import extract_games
+import extract_pitching_stats
+import extract_players
+import extract_schedule
+import extract_statcast
+import extract_teams
+import sinks
+from utils import load_config, connection, setup_logging, upsert_rows
+
+LOAD_ORDER = [
+    ("teams", extract_teams),
+    ("players", extract_players),
+    ("schedule", extract_schedule),
+    ("games", extract_games),
+    ("batting_stats", extract_batting_stats),
+    ("pitching_stats", extract_pitching_stats),
+]
+
+
+def _season_dirs(table_dir):
+    if not os.path.isdir(table_dir):
+        return []
+    return sorted(
+        (int(name.split("=", 1)[1]), os.path.join(table_dir, name))
+        for name in os.listdir(table_dir)
+        if name.startswith("season=")
+    )
+
+
+def load_table(conn, sink, module):
+    """Upsert every season file of a Stats API table; return the row count."""
+    import pyarrow.parquet as pq
+
+    total = 0
+    for _, season_dir in _season_dirs(sink.table_dir(module.TABLE)):
+        rows = pq.read_table(os.path.join(season_dir, "part-0.parquet")).to_pylist()
+        total += upsert_rows(conn, module.TABLE, rows, module.CONFLICT_COLS)
+    return total
+
+
+def statcast_frames(season_dir, batch_rows):
+    """Yield a season's Statcast files as DataFrames ready for load_batch."""
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(season_dir, format="parquet", schema=extract_statcast.arrow_schema())
+    for batch in dataset.to_batches(batch_size=batch_rows):
+        table = pa.Table.from_batches([batch])
+        index = table.schema.get_field_index("game_date")
+        table = table.set_column(index, "game_date", table.column(index).cast(pa.string()))
+        yield table.to_pandas(types_mapper={pa.int32(): pd.Int64Dtype()}.get)
+
+
+def load_statcast(conn, sink, batch_rows, logger):
+    total = 0
+    for season, season_dir in _season_dirs(sink.table_dir(extract_statcast.TABLE)):
+        extract_statcast.ensure_partition(conn, season)
+        rows = 0
+        for frame in statcast_frames(season_dir, batch_rows):
+            extract_statcast.load_batch(conn, frame)
+            rows += len(frame)
+        conn.commit()
+        logger.info(f"Loaded {rows} Statcast rows for {season}")
+        total += rows
+    return total
+
+
+def load_all(cfg=None, directory=None, only=None):
+    if cfg is None:
+        cfg = load_config()
+    logger = setup_logging(cfg)
+    pq_cfg = cfg.get("parquet", {})
+    sink = sinks.ParquetSink(directory or pq_cfg.get("dir") or sinks.DEFAULT_DIR)
+    batch_rows = int(cfg.get("statcast", {}).get("batch_rows", extract_statcast.DEFAULT_BATCH_ROWS))
+    logger.info(f"Loading Parquet lake from {sink.root}")
+
+    with connection(cfg, bulk=True) as conn:
+        for name, module in LOAD_ORDER:
+            if only and name not in only:
+                continue
+            count = load_table(conn, sink, module)
+            logger.info(f"Loaded {count} rows into {module.TABLE}")
+        if not only or "statcast" in only:
+            count = load_statcast(conn, sink, batch_rows, logger)
+            logger.info(f"Loaded {count} rows into {extract_statcast.TABLE}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import the Parquet lake into raw_mlb")
+    parser.add_argument("--dir", default=None, help="Lake directory (default: parquet.dir)")
+    parser.add_argument(
+        "--only",
+        nargs="*",
+        default=None,
+        choices=[name for name, _ in LOAD_ORDER] + ["statcast"],
+        help="Load only these tables",
+    )
+    args = parser.parse_args()
+    sys.exit(load_all(directory=args.dir, only=args.only))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Run instrumentation for the extraction pipeline.
+
+Records, per extraction step:
+- HTTP requests per endpoint: count, response bytes and a latency histogram.
+- Time spent per phase: ``rate_limit_wait`` (token-bucket sleeps),
+  ``retry_backoff`` (sleeps between retries), ``fetch`` (waiting on Statcast
+  downloads), ``transform``, ``db_load`` and ``index_build`` (index rebuilds
+  after a Statcast backfill).
+
+The step is tracked with a context variable that run_all sets around each
+step; fetch_all carries it into its worker threads. Metrics recorded outside
+any step are filed under "-". ``build_report`` combines the registry with
+run_all's per-step results into a JSON-serialisable run report, and
+``prometheus_text`` renders it in the Prometheus text exposition format.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_current_step = contextvars.ContextVar("step", default="-")
+_lock = threading.Lock()
+_phases = defaultdict(float)  # (step, phase) -> seconds
+_http = {}  # (step, endpoint) -> {"requests", "bytes", "seconds", "buckets"}
+
+
+def current_step():
+    return _current_step.get()
+
+
+@contextmanager
+def step_scope(step):
+    """Attribute metrics recorded in this thread to ``step``."""
+    token = _current_step.set(step)
+    try:
+        yield
+    finally:
+        _current_step.reset(token)
+
+
+def reset():
+    with _lock:
+        _phases.clear()
+        _http.clear()
+
+
+def add_time(phase, seconds):
+    if seconds:
+        with _lock:
+            _phases[(current_step(), phase)] += seconds
+
+
+@contextmanager
+def timer(phase):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(phase, time.perf_counter() - start)
+
+
+def record_http(endpoint, seconds, nbytes):
+    key = (current_step(), endpoint)
+    with _lock:
+        entry = _http.setdefault(
+            key, {"requests": 0, "bytes": 0, "seconds": 0.0, "buckets": [0] * len(LATENCY_BUCKETS)}
+        )
+        entry["requests"] += 1
+        entry["bytes"] += nbytes
+        entry["seconds"] += seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                entry["buckets"][i] += 1
+                break
+
+
+def build_report(results, wall_clock, critical_path=None):
+    """Return the run report dict for run_all's ``results``."""
+    with _lock:
+        phases = dict(_phases)
+        http = {key: {**value, "buckets": list(value["buckets"])} for key, value in _http.items()}
+
+    steps = {}
+    other_steps = ({s for s, _ in phases} | {s for s, _ in http}) - set(results)
+    for name in list(results) + sorted(other_steps):
+        result = results.get(name, {})
+        rows = result.get("rows") or 0
+        elapsed = result.get("elapsed", 0.0)
+        steps[name] = {
+            **{k: v for k, v in result.items() if k in ("status", "error", "rows", "start", "elapsed")},
+            "rows_per_second": rows / elapsed if elapsed else None,
+            "phases": {phase: secs for (step, phase), secs in sorted(phases.items()) if step == name},
+            "http": {
+                endpoint: {
+                    "requests": entry["requests"],
+                    "bytes": entry["bytes"],
+                    "latency_seconds_sum": entry["seconds"],
+                    "latency_buckets": dict(zip(map(str, LATENCY_BUCKETS), entry["buckets"])),
+                }
+                for (step, endpoint), entry in sorted(http.items()) if step == name
+            },
+        }
+
+    report = {
+        "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "wall_clock_seconds": wall_clock,
+        "steps": steps,
+    }
+    if critical_path is not None:
+        report["critical_path"] = {"steps": critical_path[0], "seconds": critical_path[1]}
+    return report
+
+
+def prometheus_text(report):
+    """Render a run report in the Prometheus text exposition format."""
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            label_str = ",".join(f'{k}="{v}"' for k, v in labels.items())
+            lines.append(f"{name}{{{label_str}}} {value}")
+
+    steps = report["steps"]
+    metric("mlb_extraction_run_seconds", "gauge", "Wall-clock time of the extraction run.",
+           [({}, report["wall_clock_seconds"])])
+    metric("mlb_extraction_step_seconds", "gauge", "Elapsed time per step.",
+           [({"step": s}, v["elapsed"]) for s, v in steps.items() if "elapsed" in v])
+    metric("mlb_extraction_step_rows", "gauge", "Rows loaded per step.",
+           [({"step": s}, v["rows"]) for s, v in steps.items() if v.get("rows") is not None])
+    metric("mlb_extraction_phase_seconds_total", "counter", "Time spent per step and phase.",
+           [({"step": s, "phase": p}, secs) for s, v in steps.items() for p, secs in v["phases"].items()])
+    metric("mlb_extraction_http_requests_total", "counter", "Stats API requests sent.",
+           [({"step": s, "endpoint": e}, h["requests"]) for s, v in steps.items() for e, h in v["http"].items()])
+    metric("mlb_extraction_http_response_bytes_total", "counter", "Stats API response bytes.",
+           [({"step": s, "endpoint": e}, h["bytes"]) for s, v in steps.items() for e, h in v["http"].items()])
+
+    name = "mlb_extraction_http_request_duration_seconds"
+    lines.append(f"# HELP {name} Stats API request latency.")
+    lines.append(f"# TYPE {name} histogram")
+    for s, v in steps.items():
+        for e, h in v["http"].items():
+            labels = f'step="{s}",endpoint="{e}"'
+            cumulative = 0
+            for bound, count in h["latency_buckets"].items():
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {h["requests"]}')
+            lines.append(f"{name}_sum{{{labels}}} {h['latency_seconds_sum']}")
+            lines.append(f"{name}_count{{{labels}}} {h['requests']}")
+    return "\n".join(lines) + "\n"
+
+
+def _write(path, text):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def write_report(report, cfg):
+    """Write the JSON report (and the Prometheus file, if configured); return the paths."""
+    metrics_cfg = cfg.get("metrics", {})
+    paths = []
+    if metrics_cfg.get("report_file"):
+        _write(metrics_cfg["report_file"], json.dumps(report, indent=2, default=str))
+        paths.append(metrics_cfg["report_file"])
+    if metrics_cfg.get("prometheus_file"):
+        _write(metrics_cfg["prometheus_file"], prometheus_text(report))
+        paths.append(metrics_cfg["prometheus_file"])
+    return paths
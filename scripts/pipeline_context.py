@@ -0,0 +1,126 @@
+"""
+Season-level Stats API data shared by the extraction steps of one run.
+
+Several steps need the same inputs: players, batting_stats and
+pitching_stats all walk the 30 team rosters, and schedule and games both
+read the season schedule. run_all builds one PipelineContext and hands it to
+every step, so each of these is fetched at most once per run, on first use.
+Steps run in parallel, so every loader is guarded by its own lock and the
+first caller fetches while the others wait. Values are returned as tuples
+and must be treated as read-only.
+"""
+
+import threading
+
+import async_stats_api
+import stats_api
+from utils import retry
+from fetch_engine import fetch_all
+
+SCHEDULE_HYDRATE = "linescore,decisions"
+
+
+@retry(max_retries=3, backoff_factor=2)
+def fetch_teams(cfg):
+    data = stats_api.get(
+        "teams",
+        {"sportId": cfg["extraction"]["sport_id"], "season": cfg["extraction"]["season"]},
+    )
+    return data.get("teams", [])
+
+
+@retry(max_retries=3, backoff_factor=2)
+def fetch_team_roster(team_id, season):
+    data = stats_api.get(
+        "team_roster",
+        {"teamId": team_id, "season": season, "rosterType": "fullSeason"},
+    )
+    return data.get("roster", [])
+
+
+@retry(max_retries=3, backoff_factor=2)
+def fetch_season_schedule(cfg):
+    data = stats_api.get(
+        "schedule",
+        {
+            "sportId": cfg["extraction"]["sport_id"],
+            "season": cfg["extraction"]["season"],
+            "gameTypes": ",".join(cfg["extraction"]["game_types"]),
+            "hydrate": SCHEDULE_HYDRATE,
+        },
+    )
+    return data.get("dates", [])
+
+
+class SharedState:
+    """Season-invariant state shared by every season's context in a multi-season run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._claimed_players = set()
+
+    def claim_players(self, player_ids):
+        """Return the IDs no other season has claimed yet, claiming them for the caller."""
+        with self._lock:
+            claimed = [pid for pid in player_ids if pid not in self._claimed_players]
+            self._claimed_players.update(claimed)
+        return claimed
+
+    def release_players(self, player_ids):
+        """Give back claimed IDs that were not loaded, so another season can fetch them."""
+        with self._lock:
+            self._claimed_players.difference_update(player_ids)
+
+
+class PipelineContext:
+
+    def __init__(self, cfg, shared=None):
+        self.cfg = cfg
+        self.shared = shared or SharedState()
+        self.season = cfg["extraction"]["season"]
+        self._values = {}
+        self._locks = {name: threading.Lock() for name in ("teams", "rosters", "schedule")}
+
+    def _load(self, name, loader):
+        with self._locks[name]:
+            if name not in self._values:
+                self._values[name] = loader()
+            return self._values[name]
+
+    def teams(self):
+        """All teams for the season."""
+        return self._load("teams", lambda: tuple(fetch_teams(self.cfg)))
+
+    def rosters(self):
+        """``((team, roster_entries), ...)`` for every team, in teams() order."""
+        def load():
+            teams = self.teams()
+            if async_stats_api.enabled(self.cfg):
+                rosters = async_stats_api.map_all(
+                    self.cfg, lambda client, t: client.team_roster(t["id"], self.season), teams
+                )
+            else:
+                rosters = fetch_all(lambda t: fetch_team_roster(t["id"], self.season), teams, self.cfg)
+            return tuple((team, tuple(roster)) for team, roster in zip(teams, rosters))
+        return self._load("rosters", load)
+
+    def roster_players(self):
+        """``((player_id, team_id), ...)`` for every rostered player, first team seen."""
+        seen = set()
+        players = []
+        for team, roster in self.rosters():
+            for entry in roster:
+                pid = entry["person"]["id"]
+                if pid not in seen:
+                    seen.add(pid)
+                    players.append((pid, team["id"]))
+        return tuple(players)
+
+    def schedule(self):
+        """Schedule date entries for the whole season, hydrated with linescore and decisions."""
+        return self._load("schedule", lambda: tuple(fetch_season_schedule(self.cfg)))
+
+    def season_dates(self):
+        """``(first, last)`` scheduled game dates (YYYY-MM-DD), or None without games."""
+        dates = [d["date"] for d in self.schedule() if d.get("games")]
+        return (min(dates), max(dates)) if dates else None
@@ -0,0 +1,86 @@
+"""
+Batched player resolver for the Stats API.
+
+Resolves player IDs through ``GET /api/v1/people?personIds=...`` in groups of
+``extraction.people_batch_size`` IDs, hydrating hitting and pitching season
+stats in the same call. Resolved people are memoized per (season, game type)
+for the life of the process, so the players, batting_stats and pitching_stats
+steps of one run share a single set of requests.
+"""
+
+import threading
+
+import async_stats_api
+import stats_api
+from utils import retry
+from fetch_engine import fetch_all
+
+DEFAULT_BATCH_SIZE = 50
+
+# (season, game_type) -> {player_id: person}
+_PEOPLE_CACHE = {}
+# Serializes resolution per key so steps running in parallel share one set of requests
+_CACHE_LOCKS = {}
+_LOCKS_GUARD = threading.Lock()
+
+
+def _batches(ids, size):
+    for i in range(0, len(ids), size):
+        yield ids[i:i + size]
+
+
+def stats_hydrate(season, game_type):
+    return f"stats(group=[hitting,pitching],type=[season],season={season},gameType={game_type})"
+
+
+@retry(max_retries=3, backoff_factor=2)
+def fetch_people_batch(player_ids, season, game_type="R"):
+    data = stats_api.get(
+        "people",
+        {
+            "personIds": ",".join(str(pid) for pid in player_ids),
+            "hydrate": stats_hydrate(season, game_type),
+        },
+    )
+    return data.get("people", [])
+
+
+def resolve_people(player_ids, season, game_type, cfg):
+    """Return ``{player_id: person}`` for every ID the API knows about.
+
+    Only IDs not already resolved for this season and game type are fetched.
+    """
+    key = (season, game_type)
+    with _LOCKS_GUARD:
+        lock = _CACHE_LOCKS.setdefault(key, threading.Lock())
+    with lock:
+        cache = _PEOPLE_CACHE.setdefault(key, {})
+        missing = [pid for pid in dict.fromkeys(player_ids) if pid not in cache]
+        if missing:
+            size = int(cfg["extraction"].get("people_batch_size", DEFAULT_BATCH_SIZE))
+            batches = list(_batches(missing, size))
+            if async_stats_api.enabled(cfg):
+                hydrate = stats_hydrate(season, game_type)
+                results = async_stats_api.map_all(
+                    cfg, lambda client, b: client.people(b, hydrate), batches
+                )
+            else:
+                results = fetch_all(lambda b: fetch_people_batch(b, season, game_type), batches, cfg)
+            for people in results:
+                for person in people:
+                    cache[person["id"]] = person
+    return {pid: cache[pid] for pid in player_ids if pid in cache}
+
+
+def person_stat_splits(person, group):
+    """Return the season splits for a stat group ("hitting"/"pitching"), or None."""
+    for stat_group in person.get("stats", []):
+        if stat_group.get("group", {}).get("displayName") == group:
+            splits = stat_group.get("splits", [])
+            if splits:
+                return splits
+    return None
+
+
+def clear_cache():
+    _PEOPLE_CACHE.clear()
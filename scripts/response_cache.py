@@ -0,0 +1,161 @@
+"""
+On-disk HTTP response cache for Stats API calls.
+
+Each response is stored as one JSON file named after the SHA-256 of its
+request URL, together with its ETag / Last-Modified validators. A cached
+response younger than its endpoint's TTL is served without touching the
+network; an older one is revalidated with a conditional GET, and a 304 reply
+refreshes it in place. Total size is bounded by evicting least-recently-used
+files. Hit/miss counters per endpoint feed the run summary.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+
+
+class ResponseCache:
+
+    def __init__(self, directory, max_bytes, ttls=None, default_ttl=3600):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.stats = defaultdict(Counter)
+        self._lock = threading.Lock()
+        self._lru = OrderedDict()  # key -> size in bytes, least recent first
+        self._total_bytes = 0
+        os.makedirs(directory, exist_ok=True)
+        self._scan()
+
+    def _scan(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                st = os.stat(os.path.join(self.directory, name))
+                entries.append((st.st_mtime, name[:-5], st.st_size))
+        for _, key, size in sorted(entries):
+            self._lru[key] = size
+            self._total_bytes += size
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read(self, key):
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, key, entry):
+        path = self._path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+        size = os.path.getsize(path)
+        with self._lock:
+            self._total_bytes += size - self._lru.pop(key, 0)
+            self._lru[key] = size
+            self._evict()
+
+    def _touch(self, key):
+        with self._lock:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and len(self._lru) > 1:
+            key, size = self._lru.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            self.stats["_all"]["evicted"] += 1
+
+    def lookup(self, endpoint, url):
+        """Return ``(body, headers)`` for ``url``.
+
+        ``body`` is the cached JSON while the entry is within its TTL;
+        otherwise it is None and ``headers`` are the conditional request
+        headers to revalidate with (empty when nothing is cached).
+        """
+        key = hashlib.sha256(url.encode()).hexdigest()
+        entry = self._read(key)
+        if entry and time.time() - entry["fetched_at"] < self.ttls.get(endpoint, self.default_ttl):
+            self.stats[endpoint]["hit"] += 1
+            self._touch(key)
+            return entry["body"], {}
+
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return None, headers
+
+    def store(self, endpoint, url, resp):
+        """Record the response to a request made after ``lookup`` and return its body.
+
+        ``resp`` is a requests-style response; a 304 refreshes the cached entry.
+        """
+        key = hashlib.sha256(url.encode()).hexdigest()
+        now = time.time()
+        if resp.status_code == 304:
+            entry = self._read(key)
+            if entry:
+                self.stats[endpoint]["revalidated"] += 1
+                entry["fetched_at"] = now
+                self._write(key, entry)
+                return entry["body"]
+
+        resp.raise_for_status()
+        body = resp.json()
+        self.stats[endpoint]["miss"] += 1
+        self._write(key, {
+            "url": url,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "fetched_at": now,
+            "body": body,
+        })
+        return body
+
+    def get(self, endpoint, url, fetch):
+        """Return the JSON body for ``url``, calling ``fetch(url, headers)`` only when needed.
+
+        ``fetch`` must return a requests-style response object.
+        """
+        body, headers = self.lookup(endpoint, url)
+        if body is not None:
+            return body
+        return self.store(endpoint, url, fetch(url, headers))
+
+    def report(self):
+        """Return summary lines: per-endpoint counts, then totals and hit rate."""
+        lines = []
+        totals = Counter()
+        for endpoint in sorted(e for e in self.stats if e != "_all"):
+            counts = self.stats[endpoint]
+            totals.update(counts)
+            lines.append(
+                f"{endpoint}: {counts['hit']} hits, {counts['revalidated']} revalidated, "
+                f"{counts['miss']} misses"
+            )
+        requests_ = totals["hit"] + totals["revalidated"] + totals["miss"]
+        served = totals["hit"] + totals["revalidated"]
+        rate = 100.0 * served / requests_ if requests_ else 0.0
+        lines.append(
+            f"total: {requests_} requests, {rate:.0f}% served from cache, "
+            f"{self.stats['_all']['evicted']} evicted, {self._total_bytes / 1e6:.1f} MB on disk"
+        )
+        return lines
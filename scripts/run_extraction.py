@@ -1,7 +1,7 @@
 """
 MLB Data Extraction Orchestrator
 
-Runs all extraction scripts in the correct dependency order:
+Runs the extraction scripts as a dependency graph:
 1. Teams (no dependencies)
 2. Players (depends on teams for FK)
 3. Schedule (depends on teams for FK)
@@ -9,13 +9,37 @@ Runs all extraction scripts in the correct dependency order:
 5. Batting stats (depends on players, teams)
 6. Pitching stats (depends on players, teams)
 7. Statcast (independent pitch-level data)
+
+Every step whose dependencies have finished is started right away, up to
+orchestration.max_parallel_steps at a time, so the long Statcast download
+overlaps the Stats API steps. Stats API steps share one rate limiter, so
+running them side by side does not raise the request rate. Steps borrow
+their database connection from a pool opened for the run and sized to
+max_parallel_steps, so a run opens at most that many connections. A step
+whose dependency failed is skipped.
+
+With --incremental (or --since DATE), steps fetch only what changed since
+their stored watermark; see watermarks.py.
+
+With --backfill the Statcast step loads each season partition with its
+secondary indexes dropped and rebuilds them at the end; see backfill.py.
+
+With --seasons 2015-2024 every selected step runs once per season, up to
+orchestration.max_parallel_seasons seasons at a time, with one context per
+season. All seasons share the run's rate limiters, response cache and
+connection pool; see season_plan() for how season-invariant teams and
+player bios are loaded only once.
 """
 
 import argparse
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
-from utils import load_config, setup_logging
+import metrics
+import stats_api
+from utils import load_config, setup_logging, connection_pool
+from pipeline_context import PipelineContext, SharedState
 
 # Extraction modules in dependency order
 EXTRACTION_ORDER = [
@@ -28,11 +52,180 @@ EXTRACTION_ORDER = [
     ("statcast", "extract_statcast"),
 ]
 
+STEP_DEPENDENCIES = {
+    "teams": [],
+    "players": ["teams"],
+    "schedule": ["teams"],
+    "games": ["teams"],
+    "batting_stats": ["teams", "players"],
+    "pitching_stats": ["teams", "players"],
+    "statcast": [],
+}
+
+DEFAULT_MAX_PARALLEL_STEPS = 3
+DEFAULT_MAX_PARALLEL_SEASONS = 4
+
+
+def run_steps(steps, run_step, max_parallel, logger, dependencies=None,
+              group_of=None, max_groups=None, max_per_group=None):
+    """Run ``run_step(name, module_name)`` for each step as its dependencies finish.
+
+    ``dependencies`` maps step names to the steps they wait for (default
+    STEP_DEPENDENCIES); dependencies on steps that are not part of ``steps``
+    count as met. With ``group_of`` (step name -> group, e.g. its season),
+    steps of at most ``max_groups`` groups run at once, and at most
+    ``max_per_group`` steps of any one group. Returns ``{name: result}``
+    with status, rows/error, start and elapsed (seconds since the run
+    started).
+    """
+    dependencies = STEP_DEPENDENCIES if dependencies is None else dependencies
+    names = {name for name, _ in steps}
+    deps = {name: [d for d in dependencies.get(name, []) if d in names] for name, _ in steps}
+    pending = list(steps)
+    running = {}
+    active = {}  # group -> steps of it running
+    results = {}
+    run_start = time.time()
+
+    def has_slot(name):
+        if len(running) >= max(1, max_parallel):
+            return False
+        if group_of is None:
+            return True
+        group = group_of(name)
+        if group in active:
+            return max_per_group is None or active[group] < max_per_group
+        return max_groups is None or len(active) < max_groups
+
+    def call(name, module_name):
+        start = time.time()
+        logger.info(f"Starting extraction: {name}")
+        try:
+            with metrics.step_scope(name):
+                count = run_step(name, module_name)
+            elapsed = time.time() - start
+            logger.info(f"Completed {name}: {count} rows in {elapsed:.1f}s")
+            return {"status": "success", "rows": count,
+                    "start": start - run_start, "elapsed": elapsed}
+        except Exception as e:
+            elapsed = time.time() - start
+            logger.error(f"Failed {name} after {elapsed:.1f}s: {e}")
+            return {"status": "failed", "error": str(e),
+                    "start": start - run_start, "elapsed": elapsed}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_parallel), thread_name_prefix="step") as pool:
+        while pending or running:
+            for name, module_name in list(pending):
+                statuses = [results.get(d, {}).get("status") for d in deps[name]]
+                if any(st in ("failed", "skipped") for st in statuses):
+                    failed_deps = [d for d in deps[name] if results[d]["status"] != "success"]
+                    results[name] = {"status": "skipped", "error": f"upstream failed: {failed_deps}",
+                                     "start": time.time() - run_start, "elapsed": 0.0}
+                    logger.error(f"Skipping {name}: upstream failed {failed_deps}")
+                    pending.remove((name, module_name))
+                elif all(st == "success" for st in statuses) and has_slot(name):
+                    running[pool.submit(call, name, module_name)] = name
+                    pending.remove((name, module_name))
+                    if group_of is not None:
+                        active[group_of(name)] = active.get(group_of(name), 0) + 1
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+                if group_of is not None:
+                    group = group_of(name)
+                    active[group] -= 1
+                    if not active[group]:
+                        del active[group]
+
+    return {name: results[name] for name, _ in steps}
+
+
+def critical_path(results, dependencies=None):
+    """Return (steps, seconds) of the longest dependency chain by step elapsed time."""
+    dependencies = STEP_DEPENDENCIES if dependencies is None else dependencies
+    memo = {}
+
+    def finish(name):
+        if name not in memo:
+            chain, total = [], 0.0
+            for dep in dependencies.get(name, []):
+                if dep in results:
+                    dep_chain, dep_total = finish(dep)
+                    if dep_total > total:
+                        chain, total = dep_chain, dep_total
+            memo[name] = (chain + [name], total + results[name]["elapsed"])
+        return memo[name]
+
+    if not results:
+        return [], 0.0
+    return max((finish(name) for name in results), key=lambda cp: cp[1])
+
+
+def parse_seasons(text):
+    """Parse ``"2015-2024"``, ``"2019,2021"`` or ``"2024"`` into a sorted list of seasons."""
+    seasons = set()
+    for part in str(text).split(","):
+        first, _, last = part.strip().partition("-")
+        seasons.update(range(int(first), int(last or first) + 1))
+    return sorted(seasons)
+
+
+def season_config(cfg, season, reuse_loaded, statcast_workers):
+    """Config for one season of a multi-season run.
+
+    Statcast dates come from the season's schedule, and ``reuse_loaded``
+    tells the teams and players steps to keep rows other seasons (or
+    earlier runs) already loaded instead of fetching them again.
+    """
+    return {
+        **cfg,
+        "extraction": {**cfg["extraction"], "season": season, "reuse_loaded": reuse_loaded},
+        "statcast": {**cfg.get("statcast", {}), "start_date": None, "end_date": None,
+                     "max_workers": statcast_workers},
+    }
 
-def run_all(cfg=None, skip=None, only=None):
+
+def season_plan(steps, seasons):
+    """Return ``(steps, dependencies)`` for running ``steps`` for every season.
+
+    Steps are named ``"<season>:<step>"`` and keep their per-season
+    dependencies. Teams and player bios are season-invariant, so the
+    newest season loads them first and the older seasons only add what is
+    missing. Batting and pitching stats wait for every season's players
+    step, since a player's bio may be loaded by any season that rosters him.
+    """
+    newest = seasons[-1]
+    names = {name for name, _ in steps}
+    plan, deps = [], {}
+    for season in reversed(seasons):
+        for name, module_name in steps:
+            step = f"{season}:{name}"
+            plan.append((step, module_name))
+            deps[step] = [f"{season}:{d}" for d in STEP_DEPENDENCIES.get(name, [])]
+            if season != newest and name in ("teams", "players"):
+                deps[step].append(f"{newest}:{name}")
+            if name in ("batting_stats", "pitching_stats") and "players" in names:
+                deps[step] += [f"{s}:players" for s in seasons if s != season]
+    return plan, deps
+
+
+def run_all(cfg=None, skip=None, only=None, incremental=False, since=None, seasons=None,
+            backfill=False):
     if cfg is None:
         cfg = load_config()
+    if backfill:
+        cfg = {**cfg, "statcast": {**cfg.get("statcast", {}), "backfill": True}}
+    if incremental or since:
+        inc_cfg = {**cfg.get("incremental", {}), "enabled": True}
+        if since:
+            inc_cfg["since"] = since
+        cfg = {**cfg, "incremental": inc_cfg}
     logger = setup_logging(cfg)
+    stats_api.configure(cfg)
+    metrics.reset()
 
     skip = set(skip or [])
     only = set(only) if only else None
@@ -45,28 +238,50 @@ def run_all(cfg=None, skip=None, only=None):
             continue
         steps.append((name, module_name))
 
-    logger.info(f"Running {len(steps)} extraction steps: {[s[0] for s in steps]}")
+    mode = "incremental" if cfg.get("incremental", {}).get("enabled") else "full"
+    if cfg.get("statcast", {}).get("backfill"):
+        mode += ", Statcast backfill"
+    max_parallel = int(cfg.get("orchestration", {}).get("max_parallel_steps", DEFAULT_MAX_PARALLEL_STEPS))
+    limits = {}
+    shared = SharedState()
+    if seasons:
+        # Each season gets its own context; all of them share the rate
+        # limiters, response cache, player claims and connection pool.
+        # Up to parallel_seasons seasons run at once, each with up to
+        # max_parallel_steps steps in flight
+        parallel_seasons = min(len(seasons), int(cfg.get("orchestration", {}).get(
+            "max_parallel_seasons", DEFAULT_MAX_PARALLEL_SEASONS)))
+        limits = {"group_of": lambda name: name.split(":")[0],
+                  "max_groups": parallel_seasons, "max_per_group": max_parallel}
+        max_parallel *= parallel_seasons
+        statcast_workers = max(1, int(cfg.get("statcast", {}).get("max_workers", 1)) // parallel_seasons)
+        contexts = {}
+        for season in seasons:
+            season_cfg = season_config(cfg, season, season != seasons[-1], statcast_workers)
+            contexts[season] = (season_cfg, PipelineContext(season_cfg, shared))
+        steps, dependencies = season_plan(steps, seasons)
 
-    results = {}
-    failed = []
+        def run_step(name, module_name):
+            season_cfg, ctx = contexts[int(name.split(":")[0])]
+            return __import__(module_name).run(season_cfg, ctx)
 
-    for name, module_name in steps:
-        logger.info(f"{'='*60}")
-        logger.info(f"Starting extraction: {name}")
-        logger.info(f"{'='*60}")
-        start_time = time.time()
+        logger.info(f"Running {len(steps)} extraction steps ({mode}) for seasons "
+                    f"{seasons[0]}-{seasons[-1]}, {parallel_seasons} seasons at a time")
+    else:
+        ctx = PipelineContext(cfg, shared)
+        dependencies = STEP_DEPENDENCIES
 
-        try:
-            module = __import__(module_name)
-            count = module.run(cfg)
-            elapsed = time.time() - start_time
-            results[name] = {"status": "success", "rows": count, "elapsed": elapsed}
-            logger.info(f"Completed {name}: {count} rows in {elapsed:.1f}s")
-        except Exception as e:
-            elapsed = time.time() - start_time
-            results[name] = {"status": "failed", "error": str(e), "elapsed": elapsed}
-            failed.append(name)
-            logger.error(f"Failed {name} after {elapsed:.1f}s: {e}")
+        def run_step(name, module_name):
+            return __import__(module_name).run(cfg, ctx)
+
+        logger.info(f"Running {len(steps)} extraction steps ({mode}): {[s[0] for s in steps]}")
+
+    run_start = time.time()
+    # One connection per concurrently running step, reused across steps
+    with connection_pool(cfg, max(1, min(max_parallel, len(steps)))):
+        results = run_steps(steps, run_step, max_parallel, logger, dependencies, **limits)
+    wall_clock = time.time() - run_start
+    failed = [name for name, result in results.items() if result["status"] != "success"]
 
     # Summary
     logger.info(f"\n{'='*60}")
@@ -74,9 +289,32 @@ def run_all(cfg=None, skip=None, only=None):
     logger.info(f"{'='*60}")
     for name, result in results.items():
         if result["status"] == "success":
-            logger.info(f"  {name}: {result['rows']} rows ({result['elapsed']:.1f}s)")
+            logger.info(f"  {name}: {result['rows']} rows "
+                        f"(+{result['start']:.1f}s, {result['elapsed']:.1f}s)")
         else:
-            logger.error(f"  {name}: FAILED - {result['error']} ({result['elapsed']:.1f}s)")
+            logger.error(f"  {name}: {result['status'].upper()} - {result['error']} "
+                         f"({result['elapsed']:.1f}s)")
+
+    path, path_seconds = critical_path(results, dependencies)
+    step_seconds = sum(result["elapsed"] for result in results.values())
+    logger.info(f"Wall clock {wall_clock:.1f}s for {step_seconds:.1f}s of step time "
+                f"({max_parallel} parallel)")
+    logger.info(f"Critical path: {' -> '.join(path)} ({path_seconds:.1f}s)")
+
+    report = metrics.build_report(results, wall_clock, (path, path_seconds))
+    for name, step in report["steps"].items():
+        phases = ", ".join(f"{phase} {secs:.1f}s" for phase, secs in step["phases"].items())
+        requests_ = sum(h["requests"] for h in step["http"].values())
+        if phases or requests_:
+            logger.info(f"  {name}: {requests_} HTTP requests; {phases or 'no timed phases'}")
+    for path in metrics.write_report(report, cfg):
+        logger.info(f"Run report written to {path}")
+
+    cache_lines = stats_api.cache_report()
+    if cache_lines:
+        logger.info("HTTP cache:")
+        for line in cache_lines:
+            logger.info(f"  {line}")
 
     if failed:
         logger.error(f"\n{len(failed)} step(s) failed: {failed}")
@@ -100,11 +338,37 @@ def main():
         nargs="*",
         default=None,
         choices=[name for name, _ in EXTRACTION_ORDER],
-        help="Run only these steps (in dependency order)",
+        help="Run only these steps (dependencies outside the selection are assumed loaded)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Fetch only what changed since each step's stored watermark",
+    )
+    parser.add_argument(
+        "--since",
+        default=None,
+        help="Incremental run starting from this date (YYYY-MM-DD) instead of the watermarks",
+    )
+    parser.add_argument(
+        "--seasons",
+        type=parse_seasons,
+        default=None,
+        help="Load several seasons in parallel, e.g. 2015-2024 (overrides extraction.season)",
+    )
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Load Statcast through UNLOGGED staging with secondary indexes rebuilt at the end",
     )
     args = parser.parse_args()
+    if args.seasons and (args.incremental or args.since):
+        parser.error("--seasons is a full load and cannot be combined with --incremental/--since")
+    if args.backfill and (args.incremental or args.since):
+        parser.error("--backfill is a full load and cannot be combined with --incremental/--since")
 
-    sys.exit(run_all(skip=args.skip, only=args.only))
+    sys.exit(run_all(skip=args.skip, only=args.only, incremental=args.incremental, since=args.since,
+                     seasons=args.seasons, backfill=args.backfill))
 
 
 if __name__ == "__main__":
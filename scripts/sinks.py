@@ -0,0 +1,140 @@
+"""
+Parquet sink: a local raw-data lake alongside PostgreSQL.
+
+With ``parquet.enabled`` every extraction step also writes what it loads to
+``parquet.dir`` (zstd-compressed by default):
+
+    <dir>/raw_statcast/season=2024/month=04/2024-04-01.parquet
+    <dir>/raw_teams/season=2024/part-0.parquet
+    ...
+
+Statcast is written one file per game date, so re-fetching a day (a retry,
+an incremental re-pull, a split chunk) overwrites its file instead of
+duplicating rows, and a chunk is streamed batch by batch without being held
+in memory. The other tables are small and kept as one file per season,
+merged on their conflict columns. PostgreSQL remains the system of record for
+watermarks, checkpoints and upserts; load_parquet.py imports the files back
+into raw_mlb.
+
+pyarrow (installed with pybaseball) is imported on first use.
+"""
+
+import os
+
+DEFAULT_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "lake")
+DEFAULT_COMPRESSION = "zstd"
+
+
+def _table_name(table):
+    return table.split(".")[-1]
+
+
+def _tmp_path(path):
+    # Dot-prefixed, so dataset readers skip files left behind by a crash
+    return os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+
+
+def _replace(tmp_path, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(tmp_path, path)
+
+
+class ParquetSink:
+
+    def __init__(self, root, compression=DEFAULT_COMPRESSION):
+        self.root = root
+        self.compression = compression
+
+    def table_dir(self, table):
+        return os.path.join(self.root, _table_name(table))
+
+    def write_rows(self, table, rows, season, key):
+        """Merge ``rows`` (list of dicts) into the season's file for ``table``.
+
+        Rows replace existing ones with the same ``key`` columns, like the
+        upsert into PostgreSQL, so incremental runs keep the rest of the season.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not rows:
+            return None
+        path = os.path.join(self.table_dir(table), f"season={season}", "part-0.parquet")
+        merged = {}
+        if os.path.exists(path):
+            for row in pq.read_table(path).to_pylist():
+                merged[tuple(row[c] for c in key)] = row
+        for row in rows:
+            merged[tuple(row[c] for c in key)] = row
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = _tmp_path(path)
+        pq.write_table(pa.Table.from_pylist(list(merged.values())), tmp, compression=self.compression)
+        _replace(tmp, path)
+        return path
+
+    def daily_writer(self, table, schema):
+        return DailyWriter(self, table, schema)
+
+
+class DailyWriter:
+    """Stream frames into one Parquet file per ``game_date`` (season=/month= partitions).
+
+    Use as a context manager: files are written under temporary names and
+    only renamed into place when the block exits without an error.
+    """
+
+    def __init__(self, sink, table, schema):
+        self.sink = sink
+        self.table = table
+        self.schema = schema
+        self._writers = {}  # game_date -> (ParquetWriter, tmp_path, final_path)
+
+    def _writer(self, game_date):
+        import pyarrow.parquet as pq
+
+        if game_date not in self._writers:
+            season, month = game_date[:4], game_date[5:7]
+            path = os.path.join(self.sink.table_dir(self.table), f"season={season}",
+                                f"month={month}", f"{game_date}.parquet")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = _tmp_path(path)
+            writer = pq.ParquetWriter(tmp, self.schema, compression=self.sink.compression)
+            self._writers[game_date] = (writer, tmp, path)
+        return self._writers[game_date][0]
+
+    def write(self, frame):
+        """Append a frame whose game_date column holds YYYY-MM-DD strings."""
+        import pyarrow as pa
+
+        for game_date, part in frame.groupby("game_date", sort=False):
+            table = pa.Table.from_pandas(part, schema=self.schema, preserve_index=False)
+            self._writer(game_date).write_table(table)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        for writer, tmp, path in self._writers.values():
+            writer.close()
+            if exc_type is None:
+                _replace(tmp, path)
+            else:
+                os.remove(tmp)
+        self._writers.clear()
+        return False
+
+
+def get_sink(cfg):
+    """Return the configured ParquetSink, or None when the Parquet sink is disabled."""
+    pq_cfg = cfg.get("parquet", {})
+    if not pq_cfg.get("enabled", False):
+        return None
+    return ParquetSink(pq_cfg.get("dir") or DEFAULT_DIR,
+                       pq_cfg.get("compression", DEFAULT_COMPRESSION))
+
+
+def write_rows(cfg, table, rows, key):
+    """Mirror a step's upserted rows to the Parquet sink, if enabled."""
+    sink = get_sink(cfg)
+    if sink is not None:
+        sink.write_rows(table, rows, cfg["extraction"]["season"], key)
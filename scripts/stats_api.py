@@ -0,0 +1,127 @@
+"""
+Cached, rate-limited transport for MLB Stats API calls.
+
+``get(endpoint, params)`` is a drop-in for ``statsapi.get``: URLs are built
+from the library's own endpoint table, but the request goes through a shared
+keep-alive session, takes a token from the request_delay rate limiter only
+when it actually hits the network, and is served from the on-disk response
+cache (see response_cache.py) whenever ``http_cache.enabled`` is set.
+"""
+
+import os
+import sys
+import threading
+
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "MLB-StatsAPI"))
+
+from statsapi.endpoints import ENDPOINTS
+import metrics
+from utils import load_config, get_rate_limiter
+from response_cache import ResponseCache
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), "..", ".cache", "statsapi")
+DEFAULT_TIMEOUT = 60
+
+_lock = threading.Lock()
+_state = {}
+
+
+def build_url(endpoint, params):
+    """Build the request URL for a Stats API endpoint, as ``statsapi.get`` does."""
+    ep = ENDPOINTS.get(endpoint)
+    if not ep:
+        raise ValueError(f"Invalid endpoint ({endpoint}).")
+
+    url = ep["url"]
+    query = {}
+    for name, value in params.items():
+        spec = ep["path_params"].get(name)
+        if spec:
+            url = url.replace(
+                "{" + name + "}",
+                ("/" if spec["leading_slash"] else "") + str(value)
+                + ("/" if spec["trailing_slash"] else ""),
+            )
+        elif name in ep["query_params"]:
+            query[name] = str(value)
+
+    for name, spec in ep["path_params"].items():
+        placeholder = "{" + name + "}"
+        if placeholder not in url:
+            continue
+        if spec.get("required") and not spec.get("default"):
+            raise ValueError(f"Missing required path parameter {placeholder}")
+        value = spec.get("default") if spec.get("required") else ""
+        if value:
+            value = (("/" if spec["leading_slash"] else "") + value
+                     + ("/" if spec["trailing_slash"] else ""))
+        url = url.replace(placeholder, value)
+
+    required = ep.get("required_params", [])
+    if required and not any(all(p in query for p in group) for group in required):
+        raise ValueError(f"Missing required parameter(s) for the {endpoint} endpoint: {required}")
+
+    if query:
+        url += "?" + "&".join(f"{k}={v}" for k, v in query.items())
+    return url
+
+
+def configure(cfg):
+    """(Re)initialise the session, rate limiter and response cache from config."""
+    cache_cfg = cfg.get("http_cache", {})
+    cache = None
+    if cache_cfg.get("enabled", False):
+        cache = ResponseCache(
+            directory=cache_cfg.get("dir") or DEFAULT_CACHE_DIR,
+            max_bytes=int(float(cache_cfg.get("max_mb", 512)) * 1024 * 1024),
+            ttls=cache_cfg.get("ttl", {}),
+            default_ttl=cache_cfg.get("default_ttl", 3600),
+        )
+    session = requests.Session()
+    with _lock:
+        _state.update(
+            session=session,
+            limiter=get_rate_limiter(cfg, "request_delay"),
+            cache=cache,
+        )
+
+
+def _ensure_configured():
+    if not _state:
+        configure(load_config())
+    return _state
+
+
+def _http_get(endpoint, url, headers):
+    state = _state
+    metrics.add_time("rate_limit_wait", state["limiter"].acquire())
+    start = time.perf_counter()
+    resp = state["session"].get(url, headers=headers, timeout=DEFAULT_TIMEOUT)
+    metrics.record_http(endpoint, time.perf_counter() - start, len(resp.content))
+    return resp
+
+
+def get(endpoint, params):
+    """Call the Stats API and return the decoded JSON body."""
+    state = _ensure_configured()
+    url = build_url(endpoint, params)
+    if state["cache"] is not None:
+        return state["cache"].get(endpoint, url, lambda u, h: _http_get(endpoint, u, h))
+    resp = _http_get(endpoint, url, {})
+    resp.raise_for_status()
+    return resp.json()
+
+
+def response_cache():
+    """Return the configured ResponseCache, or None when caching is disabled."""
+    return _ensure_configured()["cache"]
+
+
+def cache_report():
+    """Return the response-cache summary lines, or an empty list when disabled."""
+    cache = _state.get("cache")
+    return cache.report() if cache is not None else []
@@ -1,13 +1,20 @@
+import asyncio
 import functools
+import io
 import logging
 import os
+import random
 import sys
+import threading
 import time
+from contextlib import contextmanager
 
 import psycopg2
-import psycopg2.extras
+import psycopg2.pool
 import yaml
 
+import metrics
+
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "config.yml")
 
 
@@ -16,17 +23,130 @@ def load_config(path=None):
         return yaml.safe_load(f)
 
 
+# Session settings for bulk loads, overridable with database.bulk_settings.
+# synchronous_commit=off lets COMMIT return before the WAL is flushed: a
+# crash can lose the last few commits, but each chunk's rows and checkpoint
+# are lost together and simply re-fetched on the next run.
+DEFAULT_BULK_SETTINGS = {"synchronous_commit": "off"}
+
+
+def _connect_kwargs(cfg):
+    db = cfg["database"]
+    return {
+        "host": db["host"],
+        "port": db["port"],
+        "dbname": db["dbname"],
+        "user": db["user"],
+        "password": db["password"],
+    }
+
+
 def get_connection(cfg=None):
     if cfg is None:
         cfg = load_config()
-    db = cfg["database"]
-    return psycopg2.connect(
-        host=db["host"],
-        port=db["port"],
-        dbname=db["dbname"],
-        user=db["user"],
-        password=db["password"],
-    )
+    return psycopg2.connect(**_connect_kwargs(cfg))
+
+
+class ConnectionPool:
+    """Thread-safe PostgreSQL connection pool of at most ``size`` connections.
+
+    Connections are opened on first demand and reused; ``getconn`` waits
+    while all of them are borrowed instead of failing like psycopg2's pool.
+    """
+
+    def __init__(self, cfg, size):
+        self._pool = psycopg2.pool.ThreadedConnectionPool(0, size, **_connect_kwargs(cfg))
+        # Keep up to ``size`` returned connections idle for reuse; with
+        # minconn=0 psycopg2 would close every connection given back
+        self._pool.minconn = size
+        self._slots = threading.BoundedSemaphore(size)
+
+    def getconn(self):
+        self._slots.acquire()
+        try:
+            return self._pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn, close=False):
+        try:
+            self._pool.putconn(conn, close=close or bool(conn.closed))
+        finally:
+            self._slots.release()
+
+    def closeall(self):
+        self._pool.closeall()
+
+
+_pool = None
+
+
+@contextmanager
+def connection_pool(cfg, size):
+    """Open the run's shared pool; ``connection()`` borrows from it inside the block."""
+    global _pool
+    _pool = ConnectionPool(cfg, size)
+    try:
+        yield _pool
+    finally:
+        pool, _pool = _pool, None
+        pool.closeall()
+
+
+def _apply_settings(conn, settings):
+    with conn.cursor() as cur:
+        for name, value in settings.items():
+            cur.execute("SELECT set_config(%s, %s, false)", (name, str(value)))
+    conn.commit()
+
+
+def _reset_settings(conn, settings):
+    with conn.cursor() as cur:
+        for name in settings:
+            cur.execute(f"RESET {name}")
+    conn.commit()
+
+
+@contextmanager
+def connection(cfg=None, bulk=False):
+    """Borrow a connection for one step.
+
+    Inside run_all the connection comes from the shared pool; otherwise
+    (a step run on its own) a new connection is opened and closed. The
+    block is a transaction boundary: anything left uncommitted is committed
+    when it exits normally and rolled back on an error. With ``bulk`` the
+    session runs with database.bulk_settings (default
+    ``synchronous_commit=off``) until the connection is returned.
+    """
+    if cfg is None:
+        cfg = load_config()
+    pool = _pool
+    conn = pool.getconn() if pool else get_connection(cfg)
+    settings = cfg["database"].get("bulk_settings", DEFAULT_BULK_SETTINGS) if bulk else {}
+    broken = False
+    try:
+        if settings:
+            _apply_settings(conn, settings)
+        yield conn
+        conn.commit()
+    except BaseException:
+        try:
+            if not conn.closed:
+                conn.rollback()
+        except psycopg2.Error:
+            broken = True
+        raise
+    finally:
+        try:
+            if settings and not conn.closed:
+                _reset_settings(conn, settings)
+        except psycopg2.Error:
+            broken = True
+        if pool:
+            pool.putconn(conn, close=broken)
+        else:
+            conn.close()
 
 
 def setup_logging(cfg=None):
@@ -65,35 +185,250 @@ def retry(max_retries=3, backoff_factor=2):
                         f"Retrying in {wait}s..."
                     )
                     time.sleep(wait)
+                    metrics.add_time("retry_backoff", wait)
+        return wrapper
+    return decorator
+
+
+def async_retry(max_retries=3, backoff_factor=2):
+    """``retry`` for coroutines: backs off with ``asyncio.sleep`` and jitters the wait.
+
+    The wait is ``backoff_factor ** attempt`` scaled by a random factor in
+    [0.5, 1.5), so many concurrent calls that fail together do not all
+    retry at the same instant.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            logger = logging.getLogger("mlb_extraction")
+            for attempt in range(1, max_retries + 1):
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    if attempt == max_retries:
+                        logger.error(f"{func.__name__} failed after {max_retries} attempts: {e}")
+                        raise
+                    wait = backoff_factor ** attempt * random.uniform(0.5, 1.5)
+                    logger.warning(
+                        f"{func.__name__} attempt {attempt}/{max_retries} failed: {e}. "
+                        f"Retrying in {wait:.1f}s..."
+                    )
+                    await asyncio.sleep(wait)
+                    metrics.add_time("retry_backoff", wait)
         return wrapper
     return decorator
 
 
+class TokenBucket:
+    """Thread-safe token bucket allowing ``rate`` acquisitions per second.
+
+    Up to ``capacity`` tokens can be banked, so short bursts go through
+    immediately. Callers that find the bucket empty reserve the next free
+    slot and sleep only until it arrives, so concurrent callers are served
+    in arrival order and the long-run rate never exceeds ``rate``.
+    A ``rate`` of ``None`` disables limiting.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = max(float(capacity), 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take one token without waiting; return the seconds until it may be used."""
+        if self.rate is None:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self):
+        """Take one token, blocking until it is available. Returns seconds waited."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+_RATE_LIMITERS = {}
+_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def _limiter_rate(rl_cfg, key):
+    if key == "request_delay" and rl_cfg.get("requests_per_second"):
+        return float(rl_cfg["requests_per_second"])
+    delay = rl_cfg.get(key, 1.0)
+    return 1.0 / delay if delay and delay > 0 else None
+
+
+def get_rate_limiter(cfg, key="request_delay"):
+    """Return the process-wide TokenBucket for a rate_limit config key.
+
+    ``request_delay`` (Stats API) honours ``rate_limit.requests_per_second``
+    when set; any other key is read as a minimum average delay in seconds.
+    Every caller with the same settings shares one bucket, so concurrent
+    fetchers draw from a single request budget.
+    """
+    rl_cfg = cfg.get("rate_limit", {})
+    rate = _limiter_rate(rl_cfg, key)
+    capacity = rl_cfg.get("burst", 1) if key == "request_delay" else 1
+    cache_key = (key, rate, capacity)
+    with _RATE_LIMITERS_LOCK:
+        bucket = _RATE_LIMITERS.get(cache_key)
+        if bucket is None:
+            bucket = _RATE_LIMITERS[cache_key] = TokenBucket(rate, capacity)
+    return bucket
+
+
 def rate_limit(cfg, key="request_delay"):
-    delay = cfg.get("rate_limit", {}).get(key, 1.0)
-    time.sleep(delay)
+    return get_rate_limiter(cfg, key).acquire()
 
 
-def upsert_rows(conn, table, rows, conflict_columns, update_columns=None):
-    if not rows:
-        return 0
-    columns = list(rows[0].keys())
+def _csv_field(val):
+    """Encode one value for COPY ... (FORMAT csv): unquoted empty is NULL, everything else is quoted."""
+    if val is None:
+        return ""
+    return '"' + str(val).replace('"', '""') + '"'
+
+
+def csv_lines(records):
+    """Yield CSV lines for COPY from an iterable of value tuples."""
+    for record in records:
+        yield ",".join(_csv_field(v) for v in record) + "\n"
+
+
+class CopyStream:
+    """Read-only file-like wrapper that lets COPY pull lines from a generator."""
+
+    def __init__(self, lines):
+        self._lines = iter(lines)
+        self._buf = ""
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buf) < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buf += line
+        if size < 0:
+            size = len(self._buf)
+        chunk, self._buf = self._buf[:size], self._buf[size:]
+        return chunk
+
+
+def copy_upsert(conn, table, columns, source, conflict_columns=None, update_columns=None, commit=True):
+    """Bulk-load CSV ``source`` into ``table`` through a temp staging table.
+
+    Rows are streamed with ``COPY ... FROM STDIN`` into a session-local
+    staging table and merged with a single ``INSERT ... SELECT``. With
+    ``conflict_columns`` the merge upserts (later duplicates win, matching
+    row-by-row semantics) and stamps ``loaded_at = NOW()`` on updated rows;
+    without them it is a plain append. Commits and returns the rows staged.
+    """
+    conflict_columns = list(conflict_columns or [])
     if update_columns is None:
         update_columns = [c for c in columns if c not in conflict_columns and c != "loaded_at"]
     col_list = ", ".join(columns)
-    placeholders = ", ".join([f"%({c})s" for c in columns])
-    conflict_list = ", ".join(conflict_columns)
-    if update_columns:
-        update_set = ", ".join([f"{c} = EXCLUDED.{c}" for c in update_columns])
-        update_clause = f"DO UPDATE SET {update_set}, loaded_at = NOW()"
+    stage = f"_stage_{table.split('.')[-1]}"
+
+    if conflict_columns:
+        conflict_list = ", ".join(conflict_columns)
+        if update_columns:
+            update_set = ", ".join([f"{c} = EXCLUDED.{c}" for c in update_columns])
+            update_clause = f"DO UPDATE SET {update_set}, loaded_at = NOW()"
+        else:
+            update_clause = "DO NOTHING"
+        merge_sql = f"""
+            INSERT INTO {table} ({col_list})
+            SELECT DISTINCT ON ({conflict_list}) {col_list}
+            FROM {stage}
+            ORDER BY {conflict_list}, _stage_row DESC
+            ON CONFLICT ({conflict_list}) {update_clause}
+        """
     else:
-        update_clause = "DO NOTHING"
-    sql = f"""
-        INSERT INTO {table} ({col_list})
-        VALUES ({placeholders})
-        ON CONFLICT ({conflict_list}) {update_clause}
-    """
-    with conn.cursor() as cur:
-        psycopg2.extras.execute_batch(cur, sql, rows, page_size=500)
-    conn.commit()
+        merge_sql = f"""
+            INSERT INTO {table} ({col_list})
+            SELECT {col_list} FROM {stage} ORDER BY _stage_row
+        """
+
+    with metrics.timer("db_load"), conn.cursor() as cur:
+        cur.execute(f"""
+            CREATE TEMP TABLE {stage} ON COMMIT DROP AS
+            SELECT {col_list} FROM {table} WITH NO DATA
+        """)
+        cur.execute(f"ALTER TABLE {stage} ADD COLUMN _stage_row BIGINT GENERATED ALWAYS AS IDENTITY")
+        cur.copy_expert(f"COPY {stage} ({col_list}) FROM STDIN WITH (FORMAT csv)", source)
+        staged = cur.rowcount
+        cur.execute(merge_sql)
+        cur.execute(f"DROP TABLE {stage}")
+        if commit:
+            conn.commit()
+    return staged
+
+
+def upsert_rows(conn, table, rows, conflict_columns, update_columns=None):
+    if not rows:
+        return 0
+    columns = list(rows[0].keys())
+    records = (tuple(row[c] for c in columns) for row in rows)
+    copy_upsert(conn, table, columns, CopyStream(csv_lines(records)), conflict_columns, update_columns)
     return len(rows)
+
+
+def upsert_frame(conn, table, frame, conflict_columns, update_columns=None, commit=True):
+    """Bulk-load a pandas DataFrame whose columns are named after ``table``'s columns.
+
+    The frame is serialized column-wise with ``to_csv``; missing values
+    (and empty strings) load as NULL.
+    """
+    if len(frame) == 0:
+        return 0
+    buf = io.StringIO()
+    frame.to_csv(buf, header=False, index=False)
+    buf.seek(0)
+    copy_upsert(conn, table, list(frame.columns), buf, conflict_columns, update_columns, commit)
+    return len(frame)
+
+
+def copy_frame(conn, table, frame):
+    """Append a DataFrame to ``table`` with a single COPY (no staging or conflict handling).
+
+    Does not commit.
+    """
+    if len(frame) == 0:
+        return 0
+    buf = io.StringIO()
+    frame.to_csv(buf, header=False, index=False)
+    buf.seek(0)
+    with metrics.timer("db_load"), conn.cursor() as cur:
+        cur.copy_expert(f"COPY {table} ({', '.join(frame.columns)}) FROM STDIN WITH (FORMAT csv)", buf)
+    return len(frame)
+
+
+def reset_peak_rss():
+    """Reset this process's peak-RSS high-water mark, where the OS allows it (Linux)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB since start or the last reset."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KB elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
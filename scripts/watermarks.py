@@ -0,0 +1,50 @@
+"""
+Per-step high-water marks for incremental extraction.
+
+Each step records the latest date it has fully loaded in
+raw_mlb.extraction_watermarks. In incremental mode (``incremental.enabled``
+or ``--incremental``/``--since`` on the command line) a step fetches only
+data on or after its watermark minus ``incremental.lookback_days``; the
+lookback re-pulls the tail of the previous run so late finals and partially
+published days are picked up. ``incremental.since`` overrides every
+watermark with a fixed date.
+"""
+
+from datetime import date, timedelta
+
+TABLE = "raw_mlb.extraction_watermarks"
+
+
+def get_watermark(conn, step):
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT watermark FROM {TABLE} WHERE step = %s", (step,))
+        row = cur.fetchone()
+    return row[0] if row else None
+
+
+def set_watermark(conn, step, watermark):
+    """Advance a step's watermark (never moves it backwards). Does not commit."""
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            INSERT INTO {TABLE} (step, watermark)
+            VALUES (%s, %s)
+            ON CONFLICT (step) DO UPDATE
+            SET watermark = GREATEST({TABLE}.watermark, EXCLUDED.watermark),
+                updated_at = NOW()
+            """,
+            (step, watermark),
+        )
+
+
+def incremental_since(conn, cfg, step):
+    """Return the first date a step should fetch, or None for a full extraction."""
+    inc = cfg.get("incremental", {})
+    if not inc.get("enabled"):
+        return None
+    if inc.get("since"):
+        return date.fromisoformat(str(inc["since"]))
+    watermark = get_watermark(conn, step)
+    if watermark is None:
+        return None
+    return watermark - timedelta(days=inc.get("lookback_days", 1))
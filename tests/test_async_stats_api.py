@@ -0,0 +1,258 @@
+"""
+Async Stats API Client Tests
+
+Drives scripts/async_stats_api.py with an in-memory stand-in for the aiohttp
+session, so neither aiohttp nor network access is needed. TestAiohttpSession
+runs the real aiohttp session against a local HTTP server; it is skipped
+unless aiohttp (the ``async`` extra, ``pip install .[async]``) is installed.
+
+Usage:
+    python -m pytest tests/test_async_stats_api.py -v
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from requests.structures import CaseInsensitiveDict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+import async_stats_api
+import stats_api
+import utils
+from async_stats_api import map_all
+
+CFG = {
+    "extraction": {"sport_id": 1, "season": 2024, "http_client": "async"},
+    "rate_limit": {"max_concurrency": 3, "requests_per_second": None, "request_delay": 0},
+    "http_cache": {"enabled": False},
+}
+
+
+class FakeResponse:
+
+    def __init__(self, status, body, headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self._content = json.dumps(body).encode() if body is not None else b""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self):
+        return self._content
+
+
+class FakeSession:
+    """Answers from ``handler(url, headers) -> FakeResponse``, tracking requests in flight."""
+
+    def __init__(self, handler, delay=0.0):
+        self.handler = handler
+        self.delay = delay
+        self.urls = []
+        self.in_flight = 0
+        self.peak = 0
+
+    def get(self, url, headers=None):
+        session = self
+
+        class _Request:
+            async def __aenter__(self):
+                session.urls.append(url)
+                session.in_flight += 1
+                session.peak = max(session.peak, session.in_flight)
+                await asyncio.sleep(session.delay)
+                session.in_flight -= 1
+                self.resp = session.handler(url, headers or {})
+                return self.resp
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Request()
+
+
+@pytest.fixture(autouse=True)
+def configured(monkeypatch):
+    stats_api.configure(CFG)
+    monkeypatch.setattr(utils.random, "uniform", lambda a, b: 0.0)  # no retry waits
+    yield
+    stats_api._state.clear()
+
+
+def roster_handler(url, headers):
+    team_id = int(url.split("/teams/")[1].split("/")[0])
+    return FakeResponse(200, {"roster": [{"person": {"id": team_id * 10}}]})
+
+
+# =============================================================================
+# map_all
+# =============================================================================
+
+class TestMapAll:
+
+    def test_results_in_order_within_concurrency(self):
+        session = FakeSession(roster_handler, delay=0.01)
+        teams = list(range(100, 130))
+        rosters = map_all(CFG, lambda c, t: c.team_roster(t, 2024), teams, session=session)
+        assert [r[0]["person"]["id"] for r in rosters] == [t * 10 for t in teams]
+        assert session.peak == 3
+        assert "rosterType=fullSeason" in session.urls[0]
+
+    def test_retries_transient_errors(self):
+        calls = []
+
+        def flaky(url, headers):
+            calls.append(url)
+            if len(calls) < 3:
+                return FakeResponse(503, None)
+            return FakeResponse(200, {"teams": [{"id": 147}]})
+
+        teams = map_all(CFG, lambda c, _: c.teams(1, 2024), [None], session=FakeSession(flaky))
+        assert teams == [[{"id": 147}]]
+        assert len(calls) == 3
+
+    def test_first_failure_is_raised(self):
+        session = FakeSession(lambda url, headers: FakeResponse(404, None))
+        with pytest.raises(async_stats_api.HTTPError, match="404"):
+            map_all(CFG, lambda c, pk: c.game(pk), [745001, 745002], session=session)
+
+    def test_person_stats_reads_hydrated_splits(self):
+        person = {"id": 660271, "stats": [
+            {"group": {"displayName": "hitting"}, "splits": [{"stat": {"homeRuns": 54}}]},
+        ]}
+        session = FakeSession(lambda url, headers: FakeResponse(200, {"people": [person]}))
+        splits = map_all(CFG, lambda c, pid: c.person_stats(pid, "hitting", 2024), [660271],
+                         session=session)
+        assert splits == [[{"stat": {"homeRuns": 54}}]]
+        assert "hydrate=stats(group=[hitting,pitching]" in session.urls[0]
+
+
+# =============================================================================
+# Response cache
+# =============================================================================
+
+class TestCache:
+
+    def test_cached_and_revalidated(self, tmp_path):
+        stats_api.configure({**CFG, "http_cache": {
+            "enabled": True, "dir": str(tmp_path), "default_ttl": 3600, "ttl": {"game": 0},
+        }})
+
+        def handler(url, headers):
+            if headers.get("If-None-Match") == '"v1"':
+                return FakeResponse(304, None)
+            return FakeResponse(200, {"url": url}, {"ETag": '"v1"'})
+
+        session = FakeSession(handler)
+
+        async def twice(client, _):
+            await client.teams(1, 2024)
+            await client.game(745001)
+            await client.teams(1, 2024)  # fresh: served from disk
+            return await client.game(745001)  # ttl 0: revalidated with the ETag
+
+        assert map_all(CFG, twice, [None], session=session)[0]["url"].endswith("/745001/feed/live")
+        assert len(session.urls) == 3
+        stats = stats_api.response_cache().stats
+        assert stats["teams"]["hit"] == 1 and stats["game"]["revalidated"] == 1
+
+    def test_validators_found_in_any_header_case(self, tmp_path):
+        stats_api.configure({**CFG, "http_cache": {"enabled": True, "dir": str(tmp_path), "default_ttl": 0}})
+
+        def handler(url, headers):
+            if headers.get("If-None-Match") == '"v1"':
+                return FakeResponse(304, None)
+            return FakeResponse(200, {"url": url}, CaseInsensitiveDict({"etag": '"v1"'}))
+
+        async def twice(client, _):
+            await client.game(745001)
+            return await client.game(745001)
+
+        map_all(CFG, twice, [None], session=FakeSession(handler))
+        assert stats_api.response_cache().stats["game"]["revalidated"] == 1
+
+
+# =============================================================================
+# Real aiohttp session
+# =============================================================================
+
+class _RosterHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        team_id = int(self.path.split("/teams/")[1].split("/")[0])
+        body = json.dumps({"roster": [{"person": {"id": team_id * 10}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _EtagHandler(BaseHTTPRequestHandler):
+    """Serves a game feed with a lower-case ``etag`` header; answers 304 when it matches."""
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps({"gamePk": 745001}).encode()
+        self.send_response(200)
+        self.send_header("etag", '"v1"')
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+class TestAiohttpSession:
+
+    def test_rosters_over_keepalive_session(self, monkeypatch):
+        pytest.importorskip("aiohttp")
+        server, base = _serve(_RosterHandler)
+        monkeypatch.setattr(stats_api, "build_url",
+                            lambda endpoint, params: f"{base}/teams/{params['teamId']}/roster")
+        try:
+            rosters = map_all(CFG, lambda c, t: c.team_roster(t, 2024), [1, 2, 3, 4])
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert [r[0]["person"]["id"] for r in rosters] == [10, 20, 30, 40]
+
+    def test_lower_case_etag_is_revalidated(self, monkeypatch, tmp_path):
+        pytest.importorskip("aiohttp")
+        stats_api.configure({**CFG, "http_cache": {"enabled": True, "dir": str(tmp_path), "default_ttl": 0}})
+        server, base = _serve(_EtagHandler)
+        monkeypatch.setattr(stats_api, "build_url", lambda endpoint, params: f"{base}/game")
+
+        async def twice(client, _):
+            await client.game(745001)
+            return await client.game(745001)
+
+        try:
+            game = map_all(CFG, twice, [None])[0]
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert game == {"gamePk": 745001}
+        assert stats_api.response_cache().stats["game"]["revalidated"] == 1
@@ -0,0 +1,178 @@
+"""
+Backfill Tests
+
+Checks the deferred-index partition load in scripts/backfill.py and its use
+by extract_statcast against a fake connection that records the SQL it is
+sent and answers catalog queries, so no database is needed.
+
+Usage:
+    python -m pytest tests/test_backfill.py -v
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+import backfill
+import extract_statcast
+
+PARENT_INDEXES = [
+    ("idx_raw_statcast_batter", "CREATE INDEX idx_raw_statcast_batter ON ONLY raw_mlb.raw_statcast "
+                                "USING btree (batter)"),
+    ("idx_raw_statcast_events", "CREATE INDEX idx_raw_statcast_events ON ONLY raw_mlb.raw_statcast "
+                                "USING btree (events) WHERE (events IS NOT NULL)"),
+]
+
+
+class FakeCursor:
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = []
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        sql = " ".join(sql.split())
+        self.conn.statements.append((sql, params, self.conn.autocommit))
+        if "FROM pg_index" in sql:
+            self.rows = self.conn.indexes.get(params[0], [])
+        elif "pg_inherits" in sql:
+            self.rows = [(self.conn.attached,)]
+        elif sql.startswith("INSERT INTO"):
+            self.rowcount = 42
+
+    def fetchone(self):
+        return self.rows[0]
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+
+    def __init__(self, attached=True, indexes=None):
+        self.attached = attached
+        self.indexes = indexes or {}
+        self.statements = []
+        self.autocommit = False
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def sql(self, prefix):
+        return [s for s, _, _ in self.statements if s.startswith(prefix)]
+
+
+# =============================================================================
+# backfill
+# =============================================================================
+
+class TestBackfill:
+
+    def test_secondary_index_defs(self):
+        conn = FakeConnection(indexes={"raw_mlb.raw_statcast": PARENT_INDEXES})
+        assert backfill.secondary_index_defs(conn, "raw_mlb.raw_statcast") == [
+            ("idx_raw_statcast_batter", "USING btree (batter)"),
+            ("idx_raw_statcast_events", "USING btree (events) WHERE (events IS NOT NULL)"),
+        ]
+
+    def test_detach_drops_indexes_and_pins_bound(self):
+        conn = FakeConnection(indexes={"raw_mlb.raw_statcast_2024": [
+            ("raw_statcast_2024_batter_idx", "CREATE INDEX raw_statcast_2024_batter_idx ON "
+                                             "raw_mlb.raw_statcast_2024 USING btree (batter)"),
+        ]})
+        backfill.detach(conn, "raw_mlb.raw_statcast", "raw_mlb.raw_statcast_2024",
+                        "2024-01-01", "2025-01-01", "game_date")
+        assert conn.sql("ALTER TABLE raw_mlb.raw_statcast DETACH") == [
+            "ALTER TABLE raw_mlb.raw_statcast DETACH PARTITION raw_mlb.raw_statcast_2024"]
+        assert conn.sql("DROP INDEX") == ["DROP INDEX IF EXISTS raw_mlb.raw_statcast_2024_batter_idx"]
+        check = conn.sql("ALTER TABLE raw_mlb.raw_statcast_2024 ADD CONSTRAINT")[0]
+        assert "CHECK (game_date IS NOT NULL AND game_date >= %s AND game_date < %s)" in check
+        assert conn.commits == 0
+
+    def test_detach_is_idempotent(self):
+        conn = FakeConnection(attached=False)
+        backfill.detach(conn, "raw_mlb.raw_statcast", "raw_mlb.raw_statcast_2024",
+                        "2024-01-01", "2025-01-01", "game_date")
+        assert conn.sql("ALTER TABLE raw_mlb.raw_statcast DETACH") == []
+
+    def test_move_rows_keeps_latest_staged_row(self):
+        conn = FakeConnection()
+        moved = backfill.move_rows(conn, "raw_mlb.raw_statcast_2024", ["game_pk", "game_date", "events"],
+                                   ["game_pk", "game_date"])
+        insert = conn.sql("INSERT INTO raw_mlb.raw_statcast_2024")[0]
+        assert "FROM raw_mlb.raw_statcast_2024_backfill" in insert
+        assert "ORDER BY game_pk, game_date, _stage_row DESC" in insert
+        assert "DO UPDATE SET events = EXCLUDED.events, loaded_at = NOW()" in insert
+        assert conn.sql("DROP TABLE") == ["DROP TABLE raw_mlb.raw_statcast_2024_backfill"]
+        assert moved == 42
+
+    def test_rebuild_indexes_concurrently_then_attach(self):
+        conn = FakeConnection(attached=False, indexes={"raw_mlb.raw_statcast": PARENT_INDEXES})
+        built = backfill.rebuild_indexes(conn, "raw_mlb.raw_statcast", "raw_mlb.raw_statcast_2024", 2024)
+        backfill.attach(conn, "raw_mlb.raw_statcast", "raw_mlb.raw_statcast_2024",
+                        "2024-01-01", "2025-01-01")
+
+        creates = [(s, autocommit) for s, _, autocommit in conn.statements if s.startswith("CREATE INDEX")]
+        assert built == 2
+        assert creates == [
+            ("CREATE INDEX CONCURRENTLY idx_raw_statcast_batter_2024 ON raw_mlb.raw_statcast_2024 "
+             "USING btree (batter)", True),
+            ("CREATE INDEX CONCURRENTLY idx_raw_statcast_events_2024 ON raw_mlb.raw_statcast_2024 "
+             "USING btree (events) WHERE (events IS NOT NULL)", True),
+        ]
+        assert conn.autocommit is False
+        assert conn.sql("ALTER TABLE raw_mlb.raw_statcast ATTACH PARTITION raw_mlb.raw_statcast_2024")
+        assert conn.sql("ANALYZE") == ["ANALYZE raw_mlb.raw_statcast_2024"]
+
+
+# =============================================================================
+# extract_statcast in backfill mode
+# =============================================================================
+
+class TestStatcastBackfill:
+
+    def test_batches_are_copied_to_staging(self, monkeypatch):
+        copied = {}
+
+        def fake_copy_frame(conn, table, frame):
+            copied[table] = frame["game_pk"].tolist()
+            return len(frame)
+
+        monkeypatch.setattr(extract_statcast, "copy_frame", fake_copy_frame)
+        monkeypatch.setattr(extract_statcast, "upsert_frame", None)  # must not be used
+        batch = pd.DataFrame({"game_pk": [745001, 745002], "game_date": ["2023-09-30", "2024-04-01"]})
+        extract_statcast.load_batch(None, batch, backfill_mode=True)
+        assert copied == {
+            "raw_mlb.raw_statcast_2023_backfill": [745001],
+            "raw_mlb.raw_statcast_2024_backfill": [745002],
+        }
+
+    def test_checkpoints_follow_the_move(self):
+        conn = FakeConnection(attached=False)
+
+        class Log:
+            def info(self, msg):
+                pass
+
+        extract_statcast.finish_backfill(conn, [2024], [("2024-04-01", "2024-04-07", 1000)],
+                                         "2024-04-07", Log())
+        statements = [s for s, _, _ in conn.statements]
+        first = next(i for i, s in enumerate(statements) if s.startswith("INSERT INTO raw_mlb.raw_statcast_2024"))
+        checkpoint = next(i for i, s in enumerate(statements)
+                          if s.startswith(f"INSERT INTO {extract_statcast.CHECKPOINT_TABLE}"))
+        attach = next(i for i, s in enumerate(statements) if "ATTACH PARTITION" in s)
+        assert first < checkpoint < attach
+        assert statements[-1] == "ANALYZE raw_mlb.raw_statcast"
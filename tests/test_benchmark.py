@@ -0,0 +1,106 @@
+"""
+Benchmark Harness Tests
+
+Checks the offline pieces of benchmarks/run_benchmark.py (the replay config,
+the offline transport and result summarising/comparison) and of
+benchmarks/dbt_benchmark.py (run_results parsing and reporting). Recording,
+replaying and dbt builds need PostgreSQL and are not exercised here.
+
+Usage:
+    python -m pytest tests/test_benchmark.py -v
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+import dbt_benchmark
+import run_benchmark
+from run_benchmark import bench_config, compare, summarize
+
+
+def _report(elapsed=10.0, transform=2.0, db_load=3.0):
+    return {
+        "wall_clock_seconds": elapsed + 1,
+        "steps": {
+            "teams": {"elapsed": elapsed, "rows": 30, "rows_per_second": 3.0,
+                      "phases": {"transform": transform, "db_load": db_load}},
+            "statcast": {"elapsed": 20.0, "rows": 1000, "rows_per_second": 50.0,
+                         "phases": {"fetch": 12.0, "transform": 5.0, "db_load": 3.0}},
+            "-": {"phases": {"retry_backoff": 1.0}},
+        },
+    }
+
+
+class TestBenchConfig:
+
+    def test_replay_settings(self, tmp_path):
+        cfg = {"extraction": {"season": 2023}, "statcast": {"max_workers": 4},
+               "rate_limit": {"statcast_delay": 2.0}}
+        manifest = {"extraction": {"season": 2024, "http_client": "async"},
+                    "statcast": {"max_chunk_days": 3, "max_workers": 4}}
+        bench = bench_config(cfg, str(tmp_path), manifest)
+        assert bench["extraction"]["season"] == 2024
+        assert bench["extraction"]["http_client"] == "threads"
+        assert bench["statcast"]["max_workers"] == 1
+        assert bench["statcast"]["max_chunk_days"] == 3
+        assert bench["http_cache"]["dir"] == os.path.join(str(tmp_path), "statsapi")
+        assert bench["rate_limit"]["statcast_delay"] == 0
+        assert cfg["statcast"]["max_workers"] == 4  # caller's config untouched
+
+    def test_offline_transport_refuses_network(self):
+        with pytest.raises(RuntimeError, match="No recorded fixture"):
+            run_benchmark._offline_http_get("teams", "https://statsapi.mlb.com/api/v1/teams", {})
+
+
+class TestResults:
+
+    def test_summarize_derives_stats_api_fetch(self):
+        steps = summarize(_report())["steps"]
+        assert steps["teams"]["fetch"] == 5.0
+        assert steps["statcast"]["fetch"] == 12.0
+        assert "-" not in steps
+
+    def test_compare(self):
+        base = {"label": "a", **summarize(_report(elapsed=10.0))}
+        new = {"label": "b", **summarize(_report(elapsed=5.0, transform=1.0, db_load=1.5))}
+        lines = compare(base, new)
+        assert lines[0] == "a -> b"
+        teams_elapsed = next(l for l in lines if l.startswith("teams") and "elapsed" in l)
+        assert "-50.0%" in teams_elapsed
+
+
+class TestDbtBenchmark:
+
+    @staticmethod
+    def _run_results(status="success"):
+        return {"results": [
+            {"unique_id": "model.mlb_analytics.stg_statcast", "status": "success", "execution_time": 0.1},
+            {"unique_id": "model.mlb_analytics.int_statcast_player_days", "status": status,
+             "execution_time": 12.3456, "message": "boom"},
+            {"unique_id": "model.mlb_analytics.int_statcast_metrics", "status": "success",
+             "execution_time": 0.5},
+        ]}
+
+    def test_model_timings(self):
+        assert dbt_benchmark.model_timings(self._run_results()) == {
+            "int_statcast_player_days": 12.346, "int_statcast_metrics": 0.5}
+
+    def test_failed_model_aborts(self):
+        with pytest.raises(SystemExit, match="int_statcast_player_days failed: boom"):
+            dbt_benchmark.model_timings(self._run_results(status="error"))
+
+    def test_compare_matches_season_counts(self):
+        def result(label, seconds):
+            timings = {m: seconds for m in dbt_benchmark.MODELS}
+            return {"label": label, "runs": [
+                {"seasons": n, "pitches": n * 100, "full_refresh": timings, "incremental": timings}
+                for n in (1, 5)]}
+
+        lines = dbt_benchmark.compare(result("a", 4.0), result("b", 2.0))
+        assert lines[0] == "a -> b"
+        assert len(lines) == 2 + 2 * len(dbt_benchmark.MODELS) * 2
+        assert all("-50.0%" in line for line in lines[2:])
+        assert len(dbt_benchmark.format_runs(result("a", 4.0)["runs"])) == 1 + 2 * len(dbt_benchmark.MODELS)
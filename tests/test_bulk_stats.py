@@ -0,0 +1,169 @@
+"""
+Bulk Stats Tests
+
+Checks pagination and player filtering in scripts/bulk_stats.py, that bulk
+rows keep the batting transform's shape, and that a player traded mid-season
+gets one row per team, without the team-less season total, from either
+stats mode. stats_api.get and
+resolve_people are patched, so no network access or database is needed.
+
+Usage:
+    python -m pytest tests/test_bulk_stats.py -v
+"""
+
+import os
+import sys
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+import bulk_stats
+import extract_batting_stats
+from bulk_stats import fetch_season_splits, player_season_splits
+from extract_batting_stats import transform_batting_stat
+from pipeline_context import PipelineContext
+
+
+def _cfg(page_size=3, mode="bulk"):
+    return {
+        "extraction": {"sport_id": 1, "stats_page_size": page_size, "stats_mode": mode},
+        "rate_limit": {"max_concurrency": 4},
+    }
+
+
+def _split(pid, team_id=147):
+    return {
+        "season": "2024",
+        "stat": {"gamesPlayed": 10, "atBats": 30, "hits": 9, "avg": ".300"},
+        "team": {"id": team_id},
+        "league": {"id": 103},
+        "player": {"id": pid},
+    }
+
+
+@pytest.fixture
+def stats_pages(monkeypatch):
+    """Serve 8 splits for player IDs 1..8, honouring limit/offset."""
+    calls = []
+    lock = threading.Lock()
+
+    def fake_get(endpoint, params):
+        assert endpoint == "stats"
+        assert params["playerPool"] == "ALL" and params["stats"] == "season"
+        with lock:
+            calls.append(params["offset"])
+        all_splits = [_split(pid) for pid in range(1, 9)]
+        page = all_splits[params["offset"]:params["offset"] + params["limit"]]
+        return {"stats": [{"totalSplits": len(all_splits), "splits": page}]}
+
+    monkeypatch.setattr(bulk_stats.stats_api, "get", fake_get)
+    return calls
+
+
+class TestFetchSeasonSplits:
+
+    def test_reads_every_page(self, stats_pages):
+        splits = fetch_season_splits("hitting", 2024, "R", _cfg(page_size=3))
+        assert [s["player"]["id"] for s in splits] == list(range(1, 9))
+        assert sorted(stats_pages) == [0, 3, 6]
+
+    def test_single_page(self, stats_pages):
+        splits = fetch_season_splits("hitting", 2024, "R", _cfg(page_size=100))
+        assert len(splits) == 8
+        assert stats_pages == [0]
+
+
+class TestPlayerSeasonSplits:
+
+    def test_bulk_narrowed_to_roster(self, stats_pages):
+        pairs = list(player_season_splits([2, 5, 99], "hitting", 2024, "R", _cfg()))
+        assert [pid for pid, _ in pairs] == [2, 5]
+
+    def test_bulk_rows_match_transform_shape(self, stats_pages):
+        pid, split = next(player_season_splits([4], "hitting", 2024, "R", _cfg()))
+        row = transform_batting_stat(split, pid, 2024, "R")
+        assert (row["player_id"], row["team_id"], row["game_type"]) == (4, 147, "R")
+        assert row["hits"] == 9 and row["batting_average"] == 0.3
+
+    def test_people_is_the_default_mode(self, stats_pages, monkeypatch):
+        people = {4: {"id": 4, "stats": [{"group": {"displayName": "hitting"}, "splits": [_split(4)]}]}}
+        monkeypatch.setattr(bulk_stats, "resolve_people", lambda ids, season, game_type, cfg: people)
+        cfg = {"extraction": {"sport_id": 1}, "rate_limit": {"max_concurrency": 4}}
+        assert [pid for pid, _ in player_season_splits([4], "hitting", 2024, "R", cfg)] == [4]
+        assert stats_pages == []
+
+
+# =============================================================================
+# Mid-season trade
+# =============================================================================
+
+# Player 7 was traded from team 146 to team 147. The /stats endpoint lists a
+# traded player once per team plus a season total that has numTeams and no
+# team or league; entries are ordered by rank, so a player's splits are
+# interleaved with other players' and fall on different pages.
+BULK_TRADE_SPLITS = [
+    {"season": "2024", "stat": {"gamesPlayed": 10, "atBats": 30, "hits": 9}, "numTeams": 2,
+     "player": {"id": 7}},
+    _split(8, team_id=147),
+    _split(99, team_id=110),
+    {**_split(7, team_id=147), "stat": {"gamesPlayed": 6, "atBats": 18, "hits": 6}},
+    {**_split(7, team_id=146), "stat": {"gamesPlayed": 4, "atBats": 12, "hits": 3}},
+]
+
+
+def _hydrated(split):
+    """The same split as hydrated onto a /people response: no player, no numTeams."""
+    return {k: v for k, v in split.items() if k not in ("player", "numTeams")}
+
+
+class TestMidSeasonTrade:
+
+    @pytest.fixture
+    def both_sources(self, monkeypatch):
+        def fake_get(endpoint, params):
+            page = BULK_TRADE_SPLITS[params["offset"]:params["offset"] + params["limit"]]
+            return {"stats": [{"totalSplits": len(BULK_TRADE_SPLITS), "splits": page}]}
+
+        people = {}
+        for split in BULK_TRADE_SPLITS:
+            pid = split["player"]["id"]
+            person = people.setdefault(pid, {"id": pid, "stats": [{"group": {"displayName": "hitting"},
+                                                                   "splits": []}]})
+            person["stats"][0]["splits"].append(_hydrated(split))
+        monkeypatch.setattr(bulk_stats.stats_api, "get", fake_get)
+        monkeypatch.setattr(bulk_stats, "resolve_people", lambda ids, season, game_type, cfg: people)
+
+    def test_bulk_keeps_every_split_of_rostered_players(self, both_sources):
+        pairs = list(player_season_splits([7, 8], "hitting", 2024, "R", _cfg(page_size=2)))
+        kept = [(pid, split.get("team", {}).get("id"), split.get("numTeams")) for pid, split in pairs]
+        assert kept == [(7, None, 2), (8, 147, None), (7, 147, None), (7, 146, None)]
+
+    def _rows(self, mode, monkeypatch):
+        loaded = []
+
+        @contextmanager
+        def fake_connection(cfg):
+            yield None
+
+        monkeypatch.setattr(extract_batting_stats, "connection", fake_connection)
+        monkeypatch.setattr(extract_batting_stats, "upsert_rows",
+                            lambda conn, table, rows, cols: loaded.extend(rows) or len(rows))
+        monkeypatch.setattr(extract_batting_stats.sinks, "write_rows", lambda *args: None)
+        cfg = {**_cfg(page_size=2, mode=mode), "logging": {}}
+        cfg["extraction"].update({"season": 2024, "game_types": ["R"]})
+        ctx = PipelineContext(cfg)
+        monkeypatch.setattr(ctx, "roster_players", lambda: ((7, 147), (8, 147)))
+        count = extract_batting_stats.run(cfg, ctx)
+        return count, sorted(loaded, key=lambda row: (row["player_id"], row["team_id"]))
+
+    def test_total_dropped_and_per_team_rows_loaded(self, both_sources, monkeypatch):
+        count, rows = self._rows("bulk", monkeypatch)
+        assert count == 3
+        assert [(r["player_id"], r["team_id"], r["hits"]) for r in rows] == [
+            (7, 146, 3), (7, 147, 6), (8, 147, 9)]
+
+    def test_per_team_rows_match_people_mode(self, both_sources, monkeypatch):
+        assert self._rows("bulk", monkeypatch) == self._rows("people", monkeypatch)
+
@@ -0,0 +1,145 @@
+"""
+Connection Pool Tests
+
+Checks the shared connection pool and the per-step connection() boundary
+in scripts/utils.py. psycopg2.connect is replaced with a fake, so no
+database is needed.
+
+Usage:
+    python -m pytest tests/test_connection_pool.py -v
+"""
+
+import os
+import sys
+import threading
+import time
+
+import psycopg2
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+import utils
+from utils import connection, connection_pool
+
+CFG = {"database": {"host": "h", "port": 5432, "dbname": "d", "user": "u", "password": "p"}}
+
+
+class FakeCursor:
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.statements.append((sql, params))
+
+
+class FakeConnection:
+
+    def __init__(self):
+        self.closed = 0
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = 1
+
+    class info:  # psycopg2's pool checks this when a connection is returned
+        transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    conns = []
+
+    def fake_connect(*args, **kwargs):
+        conns.append(FakeConnection())
+        return conns[-1]
+
+    monkeypatch.setattr(psycopg2, "connect", fake_connect)
+    return conns
+
+
+# =============================================================================
+# Pool
+# =============================================================================
+
+class TestPool:
+
+    def test_steps_reuse_pooled_connections(self, opened):
+        with connection_pool(CFG, 2):
+            for _ in range(7):
+                with connection(CFG) as conn:
+                    pass
+        assert len(opened) == 1
+        assert conn.commits == 7
+        assert conn.closed  # closeall when the run ends
+
+    def test_borrowers_wait_for_a_free_connection(self, opened):
+        in_use, peak = [0], [0]
+        lock = threading.Lock()
+
+        def step():
+            with connection(CFG):
+                with lock:
+                    in_use[0] += 1
+                    peak[0] = max(peak[0], in_use[0])
+                time.sleep(0.02)
+                with lock:
+                    in_use[0] -= 1
+
+        with connection_pool(CFG, 2):
+            threads = [threading.Thread(target=step) for _ in range(6)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        assert peak[0] == 2
+        assert len(opened) == 2
+
+    def test_without_pool_opens_and_closes(self, opened):
+        assert utils._pool is None
+        with connection(CFG) as conn:
+            pass
+        assert len(opened) == 1 and conn.closed
+
+
+# =============================================================================
+# Step boundary
+# =============================================================================
+
+class TestConnectionBoundary:
+
+    def test_error_rolls_back(self, opened):
+        with pytest.raises(ValueError):
+            with connection(CFG) as conn:
+                raise ValueError("load failed")
+        assert conn.rollbacks == 1 and conn.commits == 0
+
+    def test_bulk_settings_applied_and_reset(self, opened):
+        with connection_pool(CFG, 1):
+            with connection(CFG, bulk=True) as conn:
+                assert conn.statements == [
+                    ("SELECT set_config(%s, %s, false)", ("synchronous_commit", "off"))
+                ]
+            assert conn.statements[-1] == ("RESET synchronous_commit", None)
+
+    def test_bulk_settings_from_config(self, opened):
+        cfg = {"database": {**CFG["database"], "bulk_settings": {"work_mem": "256MB"}}}
+        with connection(cfg, bulk=True) as conn:
+            assert conn.statements[0][1] == ("work_mem", "256MB")
@@ -0,0 +1,332 @@
+"""
+Statcast Extraction Tests
+
+Checks the transform and chunk-download pipeline in extract_statcast
+without network or database access: pybaseball-style DataFrames are built
+in memory and fetch_statcast_chunk is patched.
+
+Usage:
+    python -m pytest tests/test_extract_statcast.py -v
+"""
+
+import io
+import os
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+import extract_statcast
+from extract_statcast import (
+    DB_COLUMNS, INT_COLUMNS, fetch_chunks, iter_batches, plan_chunks, split_chunk,
+    transform_statcast_df,
+)
+
+
+def _raw_frame():
+    return pd.DataFrame({
+        "game_pk": [745001, 745001, 745002, 745003],
+        "game_date": pd.to_datetime(["2024-04-01", "2024-04-01", "2024-04-02", None]),
+        "game_year": [2024, 2024, 2024, 2024],
+        "batter": [660271.0, np.nan, 592450.0, 605141.0],
+        "pitcher": [543037, 543037, 607074, 607074],
+        "player_name": ["Ohtani, Shohei", "Ohtani, Shohei", "Judge, Aaron", "Betts, Mookie"],
+        "events": ["home_run", None, None, "single"],
+        "release_speed": [97.3, 88.1, np.nan, 95.0],
+        "release_spin_rate": [2412.0, np.nan, 2250.7, 2300.0],
+        "launch_speed": [112.4, np.nan, np.nan, 101.2],
+        "on_1b": [np.nan, np.nan, 605141.0, np.nan],
+        "at_bat_number": [1, 2, 5, 7],
+        "pitch_number": [3, 1, 2, 1],
+    })
+
+
+class TestTransformStatcastDf:
+
+    def test_columns_match_schema(self):
+        batch = transform_statcast_df(_raw_frame())
+        assert list(batch.columns) == DB_COLUMNS
+
+    def test_drops_rows_missing_required_fields(self):
+        batch = transform_statcast_df(_raw_frame())
+        # row 2 has no batter, row 4 has no game_date
+        assert len(batch) == 2
+        assert batch["batter"].tolist() == [660271, 592450]
+
+    def test_integer_columns_are_nullable_ints(self):
+        batch = transform_statcast_df(_raw_frame())
+        for col in INT_COLUMNS:
+            assert str(batch[col].dtype) == "Int64", col
+        assert batch["release_spin_rate"].tolist() == [2412, 2250]
+        assert batch["on_1b"].isna().tolist() == [True, False]
+
+    def test_drops_rows_missing_natural_key(self):
+        raw = _raw_frame()
+        raw.loc[0, "pitch_number"] = np.nan
+        batch = transform_statcast_df(raw)
+        assert batch["batter"].tolist() == [592450]
+
+    def test_game_date_formatted(self):
+        batch = transform_statcast_df(_raw_frame())
+        assert batch["game_date"].tolist() == ["2024-04-01", "2024-04-02"]
+
+    def test_renamed_and_missing_columns(self):
+        batch = transform_statcast_df(_raw_frame())
+        assert batch["batter_name"].tolist() == ["Ohtani, Shohei", "Judge, Aaron"]
+        assert batch["pitcher_name"].isna().all()
+
+    def test_csv_serialization_for_copy(self):
+        batch = transform_statcast_df(_raw_frame())
+        buf = io.StringIO()
+        batch[["batter", "on_1b", "release_speed"]].to_csv(buf, header=False, index=False)
+        assert buf.getvalue().splitlines() == ["660271,,97.3", "592450,605141,"]
+
+
+class TestIterBatches:
+
+    def test_batches_match_whole_chunk_transform(self):
+        df = _raw_frame()
+        batches = list(iter_batches(df, batch_rows=3))
+        assert [len(b) for b in batches] == [2, 0]
+        combined = pd.concat(batches, ignore_index=True)
+        pd.testing.assert_frame_equal(combined, transform_statcast_df(df))
+
+    def test_batch_size_bounds_each_batch(self):
+        df = pd.concat([_raw_frame()] * 25, ignore_index=True)
+        assert max(len(b) for b in iter_batches(df, batch_rows=10)) <= 10
+
+
+class TestFetchChunks:
+
+    CFG = {"rate_limit": {"statcast_delay": 0}}
+
+    @pytest.fixture
+    def fake_fetch(self, monkeypatch):
+        def fetch(start_dt, end_dt):
+            if start_dt == "2024-04-06":
+                raise RuntimeError("savant timeout")
+            return pd.DataFrame({"game_date": [start_dt]})
+
+        monkeypatch.setattr(extract_statcast, "fetch_statcast_chunk", fetch)
+
+    def test_serial_yields_in_order_and_reports_errors(self, fake_fetch):
+        chunks = [("2024-04-01", "2024-04-05"), ("2024-04-06", "2024-04-10"), ("2024-04-11", "2024-04-15")]
+        results = list(fetch_chunks(chunks, self.CFG, max_workers=1))
+        assert [chunk for chunk, _, _ in results] == chunks
+        assert results[0][1]["game_date"].tolist() == ["2024-04-01"]
+        assert results[1][1] is None and isinstance(results[1][2], RuntimeError)
+        assert results[2][2] is None
+
+
+    def test_picks_up_chunks_queued_while_iterating(self, fake_fetch):
+        queue = deque([("2024-04-01", "2024-04-04")])
+        seen = []
+        for chunk, _, _ in fetch_chunks(queue, self.CFG, max_workers=1):
+            seen.append(chunk)
+            if chunk == ("2024-04-01", "2024-04-04"):
+                queue.extendleft(reversed(split_chunk(chunk)))
+        assert seen == [("2024-04-01", "2024-04-04"), ("2024-04-01", "2024-04-02"), ("2024-04-03", "2024-04-04")]
+
+    def test_pool_workers_are_not_forked(self, monkeypatch):
+        contexts = []
+
+        class RecordingPool(ThreadPoolExecutor):
+            def __init__(self, max_workers, mp_context):
+                contexts.append(mp_context.get_start_method())
+                super().__init__(max_workers)
+
+        monkeypatch.setattr(extract_statcast, "ProcessPoolExecutor", RecordingPool)
+        monkeypatch.setattr(extract_statcast, "fetch_statcast_chunk",
+                            lambda start_dt, end_dt: pd.DataFrame({"game_date": [start_dt]}))
+        chunks = [("2024-04-01", "2024-04-05"), ("2024-04-06", "2024-04-10")]
+        assert [chunk for chunk, _, _ in fetch_chunks(chunks, self.CFG, max_workers=2)] == chunks
+        assert contexts == ["forkserver"]
+
+
+def _days(start, n):
+    return [date.fromisoformat(start) + timedelta(days=i) for i in range(n)]
+
+
+class TestPlanChunks:
+
+    def test_merges_sparse_days_and_splits_dense_ones(self):
+        days = _days("2024-07-13", 6)
+        # Full slates, then the All-Star break (no games), then a full slate
+        expected = dict(zip(days, [4500, 4500, 0, 0, 300, 4500]))
+        chunks = plan_chunks(days, expected, target_rows=9000)
+        assert chunks == [("2024-07-13", "2024-07-16"), ("2024-07-17", "2024-07-18")]
+
+    def test_day_over_target_gets_own_chunk(self):
+        days = _days("2024-04-01", 3)
+        expected = dict(zip(days, [100, 30000, 100]))
+        assert plan_chunks(days, expected, target_rows=20000) == [
+            ("2024-04-01", "2024-04-01"), ("2024-04-02", "2024-04-02"), ("2024-04-03", "2024-04-03"),
+        ]
+
+    def test_gaps_and_max_days_end_chunks(self):
+        days = _days("2023-11-01", 10)
+        del days[3]  # checkpointed day
+        chunks = plan_chunks(days, {}, target_rows=20000, max_days=4)
+        assert chunks == [("2023-11-01", "2023-11-03"), ("2023-11-05", "2023-11-08"),
+                          ("2023-11-09", "2023-11-10")]
+
+    def test_split_chunk(self):
+        assert split_chunk(("2024-04-01", "2024-04-05")) == [
+            ("2024-04-01", "2024-04-03"), ("2024-04-04", "2024-04-05"),
+        ]
+        assert split_chunk(("2024-04-01", "2024-04-01")) is None
+
+
+class TestLoadBatch:
+
+    def test_routes_rows_to_season_partitions(self, monkeypatch):
+        loaded = {}
+
+        def fake_upsert_frame(conn, table, frame, conflict_columns, commit=True):
+            assert conflict_columns == extract_statcast.NATURAL_KEY
+            assert commit is False
+            loaded[table] = frame["game_pk"].tolist()
+            return len(frame)
+
+        monkeypatch.setattr(extract_statcast, "upsert_frame", fake_upsert_frame)
+        raw = _raw_frame()
+        raw.loc[2, "game_date"] = pd.Timestamp("2023-09-30")
+        extract_statcast.load_batch(None, transform_statcast_df(raw))
+        assert loaded == {
+            "raw_mlb.raw_statcast_2023": [745002],
+            "raw_mlb.raw_statcast_2024": [745001],
+        }
+
+
+class TestReplaceRange:
+
+    class FakeConnection:
+        """Records SQL; the partition holds rows outside the range unless `only_range`."""
+
+        def __init__(self, only_range):
+            self.only_range = only_range
+            self.statements = []
+
+        def cursor(self):
+            conn = self
+
+            class Cursor:
+                def __enter__(self):
+                    return self
+
+                def __exit__(self, *exc):
+                    return False
+
+                def execute(self, sql, params=None):
+                    conn.statements.append((" ".join(sql.split()), params))
+
+                def fetchone(self):
+                    return (not conn.only_range,)
+
+            return Cursor()
+
+        def sql(self, prefix):
+            return [(s, p) for s, p in self.statements if s.startswith(prefix)]
+
+    def test_partial_season_deletes_only_the_range(self):
+        conn = self.FakeConnection(only_range=False)
+        assert not extract_statcast.replace_range(conn, 2024, "2024-07-01", "2024-07-31")
+        assert conn.sql("DROP TABLE") == []
+        assert conn.sql("DELETE") == [
+            ("DELETE FROM raw_mlb.raw_statcast_2024 WHERE game_date BETWEEN %s AND %s",
+             ("2024-07-01", "2024-07-31")),
+            (f"DELETE FROM {extract_statcast.CHECKPOINT_TABLE} WHERE start_date <= %s AND end_date >= %s",
+             ("2024-07-31", "2024-07-01")),
+        ]
+
+    def test_range_clipped_to_each_season(self):
+        conn = self.FakeConnection(only_range=False)
+        extract_statcast.replace_range(conn, 2024, "2023-09-01", "2024-04-30")
+        assert conn.sql("DELETE FROM raw_mlb.raw_statcast")[0][1] == ("2024-01-01", "2024-04-30")
+
+    def test_covering_range_drops_the_partition(self):
+        conn = self.FakeConnection(only_range=True)
+        assert extract_statcast.replace_range(conn, 2024, "2024-03-20", "2024-11-02")
+        assert conn.sql("DROP TABLE") == [("DROP TABLE IF EXISTS raw_mlb.raw_statcast_2024", None)]
+        assert conn.sql("DELETE FROM raw_mlb.raw_statcast") == []
+
+
+class TestRunWatermark:
+
+    CFG = {
+        "extraction": {"season": 2024},
+        "statcast": {"start_date": "2024-04-01", "end_date": "2024-04-15", "resume": False},
+    }
+
+    @pytest.fixture
+    def pipeline(self, monkeypatch):
+        """Run run() over three chunks with the DB calls faked; returns the recorded calls."""
+        calls = {"watermarks": [], "checkpoints": []}
+
+        class FakeConn:
+            def commit(self):
+                pass
+
+        @contextmanager
+        def fake_connection(cfg, bulk=False):
+            yield FakeConn()
+
+        def fake_fetch_chunks(chunks, cfg, max_workers=1):
+            calls["fetched"] = list(chunks)
+            for chunk in list(chunks):
+                if calls["failing_day"] and chunk[0] <= calls["failing_day"] <= chunk[1]:
+                    calls["failed_chunk"] = chunk
+                    yield chunk, None, RuntimeError("savant timeout")
+                else:
+                    yield chunk, pd.DataFrame({"game_date": [chunk[1]]}), None
+
+        monkeypatch.setattr(extract_statcast, "connection", fake_connection)
+        monkeypatch.setattr(extract_statcast, "ensure_partition", lambda conn, season: None)
+        monkeypatch.setattr(extract_statcast.backfill, "is_attached", lambda conn, partition: True)
+        monkeypatch.setattr(extract_statcast, "expected_pitches_by_day",
+                            lambda conn, start, end: {d: 5000.0 for d in extract_statcast._chunk_dates(start, end)})
+        monkeypatch.setattr(extract_statcast, "fetch_chunks", fake_fetch_chunks)
+        monkeypatch.setattr(extract_statcast, "iter_batches", lambda df, batch_rows: [df])
+        monkeypatch.setattr(extract_statcast, "load_batch", lambda conn, batch, backfill_mode=False: None)
+        monkeypatch.setattr(extract_statcast, "record_checkpoint",
+                            lambda conn, start, end, rows: calls["checkpoints"].append((start, end)))
+        monkeypatch.setattr(extract_statcast, "set_watermark",
+                            lambda conn, step, watermark: calls["watermarks"].append(watermark))
+        return calls
+
+    def test_failed_chunk_holds_watermark_before_it(self, pipeline):
+        pipeline["failing_day"] = "2024-04-06"
+        extract_statcast.run(self.CFG)
+        failed_start, _ = failed = pipeline["failed_chunk"]
+        # Later chunks loaded and checkpointed, but the watermark stays before the gap
+        assert pipeline["checkpoints"][-1][1] == "2024-04-15"
+        assert failed not in pipeline["checkpoints"]
+        assert pipeline["watermarks"] == [
+            (date.fromisoformat(failed_start) - timedelta(days=1)).isoformat()]
+
+    def test_watermark_reaches_last_date_without_failures(self, pipeline):
+        pipeline["failing_day"] = None
+        extract_statcast.run(self.CFG)
+        assert pipeline["watermarks"] == ["2024-04-15"]
+
+    def test_safe_watermark(self):
+        assert extract_statcast.safe_watermark(None, []) is None
+        assert extract_statcast.safe_watermark("2024-04-15", ["2024-04-11", "2024-04-06"]) == "2024-04-05"
+        assert extract_statcast.safe_watermark("2024-04-03", ["2024-04-06"]) == "2024-04-03"
+
+    def test_incremental_lookback_ignores_checkpoints(self, pipeline, monkeypatch):
+        pipeline["failing_day"] = None
+        monkeypatch.setattr(extract_statcast, "incremental_since", lambda conn, cfg, step: date(2024, 4, 14))
+        monkeypatch.setattr(extract_statcast, "load_completed_dates",
+                            lambda conn: {date(2024, 4, 13), date(2024, 4, 14), date(2024, 4, 15)})
+        cfg = {**self.CFG, "statcast": {**self.CFG["statcast"], "resume": True}}
+        extract_statcast.run(cfg)
+        # Every lookback day is checkpointed, yet all of them are fetched again
+        assert pipeline["fetched"][0][0] == "2024-04-14"
+        assert pipeline["fetched"][-1][1] == "2024-04-15"
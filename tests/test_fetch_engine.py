@@ -0,0 +1,153 @@
+"""
+Fetch Engine Tests
+
+Exercises scripts/fetch_engine.py and the token-bucket rate limiter against a
+local stub HTTP server, so no network access or database is needed.
+
+Usage:
+    python -m pytest tests/test_fetch_engine.py -v
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+from fetch_engine import fetch_all
+from utils import TokenBucket
+
+
+# ---------------------------------------------------------------------------
+# Stub server
+# ---------------------------------------------------------------------------
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(server.latency)
+            if self.path.startswith("/missing"):
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = json.dumps({"path": self.path}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.lock = threading.Lock()
+    server.in_flight = 0
+    server.max_in_flight = 0
+    server.latency = 0.0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server, path):
+    host, port = server.server_address
+    return f"http://{host}:{port}{path}"
+
+
+def _get_json(url):
+    r = requests.get(url, timeout=5)
+    r.raise_for_status()
+    return r.json()
+
+
+def _cfg(requests_per_second=1000.0, burst=1000, max_concurrency=8):
+    return {
+        "rate_limit": {
+            "requests_per_second": requests_per_second,
+            "burst": burst,
+            "max_concurrency": max_concurrency,
+        }
+    }
+
+
+# ===========================================================================
+# fetch_all
+# ===========================================================================
+
+class TestFetchAll:
+
+    def test_results_in_input_order(self, stub_server):
+        urls = [_url(stub_server, f"/people/{i}") for i in range(20)]
+        results = fetch_all(_get_json, urls, _cfg())
+        assert [r["path"] for r in results] == [f"/people/{i}" for i in range(20)]
+
+    def test_empty_input(self):
+        assert fetch_all(_get_json, [], _cfg()) == []
+
+    def test_throughput_not_bound_by_latency(self, stub_server):
+        stub_server.latency = 0.2
+        urls = [_url(stub_server, f"/people/{i}") for i in range(10)]
+        start = time.monotonic()
+        fetch_all(_get_json, urls, _cfg(max_concurrency=10))
+        elapsed = time.monotonic() - start
+        # Sequential would take >= 2.0s
+        assert elapsed < 1.0, f"Concurrent fetch took {elapsed:.2f}s"
+
+    def test_concurrency_cap(self, stub_server):
+        stub_server.latency = 0.05
+        urls = [_url(stub_server, f"/people/{i}") for i in range(12)]
+        fetch_all(_get_json, urls, _cfg(max_concurrency=3))
+        assert stub_server.max_in_flight <= 3
+
+    def test_rate_limit_bounds_throughput(self, stub_server):
+        urls = [_url(stub_server, f"/people/{i}") for i in range(11)]
+        start = time.monotonic()
+        fetch_all(_get_json, urls, _cfg(requests_per_second=20.0, burst=1, max_concurrency=8),
+                  key="request_delay")
+        elapsed = time.monotonic() - start
+        # 1 free token + 10 more at 20/s
+        assert elapsed >= 0.45, f"Rate limit not applied ({elapsed:.2f}s)"
+
+    def test_errors_propagate(self, stub_server):
+        urls = [_url(stub_server, "/people/1"), _url(stub_server, "/missing")]
+        with pytest.raises(requests.HTTPError):
+            fetch_all(_get_json, urls, _cfg())
+
+
+# ===========================================================================
+# TokenBucket
+# ===========================================================================
+
+class TestTokenBucket:
+
+    def test_burst_is_free(self):
+        bucket = TokenBucket(rate=1.0, capacity=5)
+        waits = [bucket.acquire() for _ in range(5)]
+        assert waits == [0.0] * 5
+
+    def test_waits_when_empty(self):
+        bucket = TokenBucket(rate=50.0, capacity=1)
+        bucket.acquire()
+        assert bucket.acquire() > 0
+
+    def test_unlimited(self):
+        bucket = TokenBucket(rate=None)
+        assert all(bucket.acquire() == 0.0 for _ in range(100))
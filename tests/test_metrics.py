@@ -0,0 +1,83 @@
+"""
+Metrics Tests
+
+Checks step attribution, the run report and the Prometheus rendering in
+scripts/metrics.py. No network access or database is needed.
+
+Usage:
+    python -m pytest tests/test_metrics.py -v
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+import metrics
+from fetch_engine import fetch_all
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+RESULTS = {"teams": {"status": "success", "rows": 30, "start": 0.0, "elapsed": 2.0}}
+
+
+class TestAttribution:
+
+    def test_step_scope(self):
+        with metrics.step_scope("teams"):
+            metrics.add_time("transform", 0.5)
+        metrics.add_time("transform", 0.25)
+        report = metrics.build_report(RESULTS, 3.0)
+        assert report["steps"]["teams"]["phases"] == {"transform": 0.5}
+        assert report["steps"]["-"]["phases"] == {"transform": 0.25}
+
+    def test_fetch_all_workers_inherit_step(self):
+        def work(i):
+            metrics.record_http("people", 0.01, 100)
+            return i
+
+        with metrics.step_scope("players"):
+            fetch_all(work, range(6), {"rate_limit": {"max_concurrency": 3}})
+        http = metrics.build_report({}, 1.0)["steps"]["players"]["http"]["people"]
+        assert http["requests"] == 6
+        assert http["bytes"] == 600
+
+
+class TestReport:
+
+    def test_latency_histogram_and_rate(self):
+        with metrics.step_scope("teams"):
+            metrics.record_http("teams", 0.03, 10)
+            metrics.record_http("teams", 0.7, 20)
+            metrics.record_http("teams", 99.0, 30)
+        step = metrics.build_report(RESULTS, 3.0)["steps"]["teams"]
+        buckets = step["http"]["teams"]["latency_buckets"]
+        assert buckets["0.05"] == 1 and buckets["1.0"] == 1
+        assert sum(buckets.values()) == 2  # 99s only lands in +Inf
+        assert step["rows_per_second"] == 15.0
+
+    def test_prometheus_text(self):
+        with metrics.step_scope("teams"):
+            metrics.record_http("teams", 0.03, 10)
+            metrics.add_time("db_load", 1.5)
+        text = metrics.prometheus_text(metrics.build_report(RESULTS, 3.0))
+        assert 'mlb_extraction_phase_seconds_total{step="teams",phase="db_load"} 1.5' in text
+        assert 'mlb_extraction_http_request_duration_seconds_bucket{step="teams",endpoint="teams",le="+Inf"} 1' in text
+        assert "# TYPE mlb_extraction_http_request_duration_seconds histogram" in text
+
+    def test_write_report(self, tmp_path):
+        cfg = {"metrics": {"report_file": str(tmp_path / "run.json"),
+                           "prometheus_file": str(tmp_path / "run.prom")}}
+        paths = metrics.write_report(metrics.build_report(RESULTS, 3.0, (["teams"], 2.0)), cfg)
+        assert len(paths) == 2
+        report = json.loads((tmp_path / "run.json").read_text())
+        assert report["critical_path"] == {"steps": ["teams"], "seconds": 2.0}
+        assert (tmp_path / "run.prom").read_text().startswith("# HELP")
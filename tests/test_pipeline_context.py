@@ -0,0 +1,128 @@
+"""
+Pipeline Context Tests
+
+Checks that scripts/pipeline_context.py fetches teams, rosters and the season
+schedule once per run, even when several steps ask for them in parallel.
+stats_api.get is patched, so no network access or database is needed.
+
+Usage:
+    python -m pytest tests/test_pipeline_context.py -v
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+import extract_players
+import pipeline_context
+from pipeline_context import PipelineContext
+
+CFG = {
+    "extraction": {"season": 2024, "sport_id": 1, "game_types": ["R"]},
+    "rate_limit": {"max_concurrency": 4},
+}
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    counter = Counter()
+    lock = threading.Lock()
+
+    def fake_get(endpoint, params):
+        with lock:
+            counter[endpoint] += 1
+        time.sleep(0.01)
+        if endpoint == "teams":
+            return {"teams": [{"id": 1, "name": "A"}, {"id": 2, "name": "B"}]}
+        if endpoint == "team_roster":
+            # Player 10 was traded from team 1 to team 2
+            ids = {1: [10, 11], 2: [10, 20]}[params["teamId"]]
+            return {"roster": [{"person": {"id": pid}} for pid in ids]}
+        if endpoint == "schedule":
+            return {"dates": [{"date": "2024-04-01", "games": []}]}
+        raise AssertionError(endpoint)
+
+    monkeypatch.setattr(pipeline_context.stats_api, "get", fake_get)
+    return counter
+
+
+class TestPipelineContext:
+
+    def test_fetches_once_across_steps(self, calls):
+        ctx = PipelineContext(CFG)
+        threads = [
+            threading.Thread(target=fn)
+            for fn in (ctx.rosters, ctx.roster_players, ctx.teams, ctx.schedule, ctx.schedule)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        ctx.roster_players()
+        assert calls == Counter({"teams": 1, "team_roster": 2, "schedule": 1})
+
+    def test_roster_players_deduplicated_first_team_wins(self, calls):
+        ctx = PipelineContext(CFG)
+        assert ctx.roster_players() == ((10, 1), (11, 1), (20, 2))
+
+    def test_separate_runs_do_not_share(self, calls):
+        PipelineContext(CFG).teams()
+        PipelineContext(CFG).teams()
+        assert calls["teams"] == 2
+
+    def test_season_dates_skip_days_without_games(self, calls):
+        assert PipelineContext(CFG).season_dates() is None
+
+
+class TestSharedState:
+
+    def test_seasons_claim_each_player_once(self):
+        shared = pipeline_context.SharedState()
+        older = PipelineContext({**CFG, "extraction": {**CFG["extraction"], "season": 2023}}, shared)
+        newer = PipelineContext(CFG, shared)
+        assert newer.shared.claim_players([10, 11]) == [10, 11]
+        assert older.shared.claim_players([11, 12, 10]) == [12]
+
+    def test_released_players_can_be_claimed_again(self):
+        shared = pipeline_context.SharedState()
+        assert shared.claim_players([10, 11]) == [10, 11]
+        shared.release_players({11})
+        assert shared.claim_players([10, 11]) == [11]
+
+    def test_failed_player_fetch_releases_claims(self, calls, monkeypatch):
+        upserted = []
+
+        class FakeConnection:
+            def commit(self):
+                pass
+
+        @contextmanager
+        def fake_connection(cfg):
+            yield FakeConnection()
+
+        def fake_resolve(player_ids, season, game_type, cfg):
+            if season == 2024:
+                raise RuntimeError("people endpoint down")
+            return {pid: {"id": pid, "fullName": f"Player {pid}"} for pid in player_ids}
+
+        monkeypatch.setattr(extract_players, "connection", fake_connection)
+        monkeypatch.setattr(extract_players, "incremental_since", lambda conn, cfg, step: None)
+        monkeypatch.setattr(extract_players, "resolve_people", fake_resolve)
+        monkeypatch.setattr(extract_players, "upsert_rows",
+                            lambda conn, table, rows, cols: upserted.extend(r["player_id"] for r in rows) or len(rows))
+        monkeypatch.setattr(extract_players.sinks, "write_rows", lambda *args: None)
+        monkeypatch.setattr(extract_players, "set_watermark", lambda *args: None)
+
+        shared = pipeline_context.SharedState()
+        cfg_2023 = {**CFG, "extraction": {**CFG["extraction"], "season": 2023}}
+        with pytest.raises(RuntimeError):
+            extract_players.run(CFG, PipelineContext(CFG, shared))
+        # The 2024 claims were given back, so 2023 still loads every player
+        assert extract_players.run(cfg_2023, PipelineContext(cfg_2023, shared)) == 3
+        assert sorted(upserted) == [10, 11, 20]
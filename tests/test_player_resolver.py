@@ -0,0 +1,75 @@
+"""
+Player Resolver Tests
+
+Checks that scripts/player_resolver.py batches /people requests and reuses
+resolved players across steps. stats_api.get is patched, so no network access
+or database is needed.
+
+Usage:
+    python -m pytest tests/test_player_resolver.py -v
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+import player_resolver
+from player_resolver import resolve_people, person_stat_splits
+
+
+CFG = {
+    "extraction": {"people_batch_size": 50},
+    "rate_limit": {"requests_per_second": 1000.0, "burst": 1000, "max_concurrency": 4},
+}
+
+
+@pytest.fixture
+def fake_people_api(monkeypatch):
+    calls = []
+
+    def fake_get(endpoint, params):
+        assert endpoint == "people"
+        ids = [int(pid) for pid in params["personIds"].split(",")]
+        calls.append(ids)
+        people = [
+            {
+                "id": pid,
+                "fullName": f"Player {pid}",
+                "stats": [
+                    {"group": {"displayName": "hitting"}, "splits": [{"stat": {"hits": pid}}]},
+                ],
+            }
+            for pid in ids
+        ]
+        return {"people": people}
+
+    player_resolver.clear_cache()
+    monkeypatch.setattr(player_resolver.stats_api, "get", fake_get)
+    yield calls
+    player_resolver.clear_cache()
+
+
+class TestResolvePeople:
+
+    def test_batches_requests(self, fake_people_api):
+        ids = list(range(1, 121))
+        people = resolve_people(ids, 2024, "R", CFG)
+        assert sorted(people) == ids
+        assert [len(batch) for batch in fake_people_api] == [50, 50, 20]
+
+    def test_reuses_resolved_players(self, fake_people_api):
+        resolve_people(list(range(1, 101)), 2024, "R", CFG)
+        resolve_people(list(range(51, 111)), 2024, "R", CFG)
+        assert [len(batch) for batch in fake_people_api] == [50, 50, 10]
+
+    def test_cache_is_per_game_type(self, fake_people_api):
+        resolve_people([1, 2], 2024, "R", CFG)
+        resolve_people([1, 2], 2024, "P", CFG)
+        assert len(fake_people_api) == 2
+
+    def test_stat_splits(self, fake_people_api):
+        person = resolve_people([7], 2024, "R", CFG)[7]
+        assert person_stat_splits(person, "hitting") == [{"stat": {"hits": 7}}]
+        assert person_stat_splits(person, "pitching") is None
@@ -0,0 +1,146 @@
+"""
+Response Cache Tests
+
+Exercises scripts/response_cache.py against a local stub HTTP server that
+honours If-None-Match, plus URL building in scripts/stats_api.py. No network
+access or database is needed.
+
+Usage:
+    python -m pytest tests/test_response_cache.py -v
+"""
+
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+from response_cache import ResponseCache
+from stats_api import build_url
+
+
+# ---------------------------------------------------------------------------
+# Stub server
+# ---------------------------------------------------------------------------
+
+class _ETagHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.headers.get("If-None-Match")))
+        etag = f'"{server.version}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps({"path": self.path, "version": server.version}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ETagHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.version = 1
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server, path):
+    host, port = server.server_address
+    return f"http://{host}:{port}{path}"
+
+
+def _fetch(url, headers):
+    return requests.get(url, headers=headers, timeout=5)
+
+
+# ===========================================================================
+# ResponseCache
+# ===========================================================================
+
+class TestResponseCache:
+
+    def test_fresh_entry_served_without_request(self, stub_server, tmp_path):
+        cache = ResponseCache(str(tmp_path), max_bytes=10**6, ttls={"teams": 60})
+        url = _url(stub_server, "/teams")
+        first = cache.get("teams", url, _fetch)
+        second = cache.get("teams", url, _fetch)
+        assert first == second == {"path": "/teams", "version": 1}
+        assert len(stub_server.requests) == 1
+        assert cache.stats["teams"]["miss"] == 1
+        assert cache.stats["teams"]["hit"] == 1
+
+    def test_expired_entry_revalidated_with_etag(self, stub_server, tmp_path):
+        cache = ResponseCache(str(tmp_path), max_bytes=10**6, default_ttl=0)
+        url = _url(stub_server, "/schedule")
+        cache.get("schedule", url, _fetch)
+        body = cache.get("schedule", url, _fetch)
+        assert body["version"] == 1
+        assert stub_server.requests[1] == ("/schedule", '"1"')
+        assert cache.stats["schedule"]["revalidated"] == 1
+
+    def test_changed_resource_replaces_entry(self, stub_server, tmp_path):
+        cache = ResponseCache(str(tmp_path), max_bytes=10**6, default_ttl=0)
+        url = _url(stub_server, "/schedule")
+        cache.get("schedule", url, _fetch)
+        stub_server.version = 2
+        assert cache.get("schedule", url, _fetch)["version"] == 2
+        assert cache.stats["schedule"]["miss"] == 2
+
+    def test_persists_across_instances(self, stub_server, tmp_path):
+        url = _url(stub_server, "/teams")
+        ResponseCache(str(tmp_path), max_bytes=10**6).get("teams", url, _fetch)
+        cache = ResponseCache(str(tmp_path), max_bytes=10**6)
+        cache.get("teams", url, _fetch)
+        assert len(stub_server.requests) == 1
+
+    def test_evicts_least_recently_used(self, stub_server, tmp_path):
+        cache = ResponseCache(str(tmp_path), max_bytes=10**6)
+        urls = [_url(stub_server, f"/people/{i}") for i in range(3)]
+        for url in urls:
+            cache.get("people", url, _fetch)
+        entry_size = max(cache._lru.values())
+        cache.get("people", urls[0], _fetch)  # urls[1] is now least recent
+        cache.max_bytes = int(2.5 * entry_size)  # room for two entries
+        cache.get("people", _url(stub_server, "/people/3"), _fetch)
+
+        assert len(os.listdir(tmp_path)) == 2
+        cache.get("people", urls[0], _fetch)
+        assert cache.stats["people"]["hit"] == 2
+        cache.get("people", urls[1], _fetch)
+        assert cache.stats["people"]["miss"] == 5
+
+
+# ===========================================================================
+# build_url
+# ===========================================================================
+
+class TestBuildUrl:
+
+    def test_path_and_query_params(self):
+        url = build_url("team_roster", {"teamId": 147, "season": 2024, "bogus": 1})
+        assert url == "https://statsapi.mlb.com/api/v1/teams/147/roster?season=2024"
+
+    def test_default_version(self):
+        assert build_url("teams", {"sportId": 1}).startswith("https://statsapi.mlb.com/api/v1/teams")
+
+    def test_missing_required_params(self):
+        with pytest.raises(ValueError):
+            build_url("people", {})
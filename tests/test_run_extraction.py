@@ -0,0 +1,188 @@
+"""
+Orchestrator Tests
+
+Checks the dependency-graph scheduler in scripts/run_extraction.py with fake
+steps, so no network access or database is needed.
+
+Usage:
+    python -m pytest tests/test_run_extraction.py -v
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+from run_extraction import (
+    EXTRACTION_ORDER, critical_path, parse_seasons, run_steps, season_config, season_plan,
+)
+
+logger = logging.getLogger("test_run_extraction")
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+class _Recorder:
+    def __init__(self, durations=None, fail=()):
+        self.durations = durations or {}
+        self.fail = set(fail)
+        self.lock = threading.Lock()
+        self.events = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def __call__(self, name, module_name):
+        with self.lock:
+            self.events.append(("start", name))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.durations.get(name, 0.01))
+            if name in self.fail:
+                raise RuntimeError(f"{name} broke")
+            return 1
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+                self.events.append(("end", name))
+
+    def index(self, kind, name):
+        return self.events.index((kind, name))
+
+
+# ===========================================================================
+# run_steps
+# ===========================================================================
+
+class TestRunSteps:
+
+    def test_dependencies_finish_first(self):
+        rec = _Recorder()
+        results = run_steps(EXTRACTION_ORDER, rec, 4, logger)
+        assert all(r["status"] == "success" for r in results.values())
+        for step in ("players", "schedule", "games"):
+            assert rec.index("end", "teams") < rec.index("start", step)
+        for step in ("batting_stats", "pitching_stats"):
+            assert rec.index("end", "players") < rec.index("start", step)
+
+    def test_statcast_overlaps_stats_api_steps(self):
+        rec = _Recorder(durations={"statcast": 0.3})
+        run_steps(EXTRACTION_ORDER, rec, 4, logger)
+        assert rec.index("start", "statcast") < rec.index("end", "teams")
+        assert rec.index("end", "pitching_stats") < rec.index("end", "statcast")
+
+    def test_concurrency_cap(self):
+        rec = _Recorder(durations={name: 0.05 for name, _ in EXTRACTION_ORDER})
+        run_steps(EXTRACTION_ORDER, rec, 2, logger)
+        assert rec.max_in_flight <= 2
+        assert len(rec.events) == 2 * len(EXTRACTION_ORDER)
+
+    def test_failed_dependency_skips_dependents(self):
+        rec = _Recorder(fail={"players"})
+        results = run_steps(EXTRACTION_ORDER, rec, 4, logger)
+        assert results["players"]["status"] == "failed"
+        assert results["batting_stats"]["status"] == "skipped"
+        assert results["pitching_stats"]["status"] == "skipped"
+        assert results["games"]["status"] == "success"
+        assert ("start", "batting_stats") not in rec.events
+
+    def test_unselected_dependencies_count_as_met(self):
+        rec = _Recorder()
+        steps = [s for s in EXTRACTION_ORDER if s[0] == "batting_stats"]
+        results = run_steps(steps, rec, 4, logger)
+        assert results["batting_stats"]["status"] == "success"
+
+
+# ===========================================================================
+# critical_path
+# ===========================================================================
+
+class TestCriticalPath:
+
+    def test_longest_chain(self):
+        results = {
+            "teams": {"elapsed": 1.0},
+            "players": {"elapsed": 4.0},
+            "batting_stats": {"elapsed": 2.0},
+            "games": {"elapsed": 3.0},
+            "statcast": {"elapsed": 6.0},
+        }
+        assert critical_path(results) == (["teams", "players", "batting_stats"], 7.0)
+
+    def test_empty(self):
+        assert critical_path({}) == ([], 0.0)
+
+
+# ===========================================================================
+# Multi-season plan
+# ===========================================================================
+
+class TestSeasonPlan:
+
+    def test_parse_seasons(self):
+        assert parse_seasons("2015-2018") == [2015, 2016, 2017, 2018]
+        assert parse_seasons("2024,2019, 2021-2022") == [2019, 2021, 2022, 2024]
+        assert parse_seasons("2024") == [2024]
+
+    def test_plan_dependencies(self):
+        steps, deps = season_plan(EXTRACTION_ORDER, [2022, 2023, 2024])
+        assert len(steps) == 21
+        assert steps[0] == ("2024:teams", "extract_teams")  # newest season first
+        assert deps["2024:teams"] == []
+        assert deps["2022:teams"] == ["2024:teams"]
+        assert deps["2022:players"] == ["2022:teams", "2024:players"]
+        assert sorted(deps["2023:batting_stats"]) == [
+            "2022:players", "2023:players", "2023:teams", "2024:players",
+        ]
+        assert deps["2022:statcast"] == []
+
+    def test_seasons_overlap(self):
+        steps, deps = season_plan([("players", "m"), ("statcast", "m")], [2023, 2024])
+        rec = _Recorder(durations={"2024:statcast": 0.2, "2023:statcast": 0.2})
+        start = time.time()
+        results = run_steps(steps, rec, 4, logger, deps)
+        assert all(r["status"] == "success" for r in results.values())
+        # Both seasons' Statcast run side by side: about one season's time
+        assert time.time() - start < 0.35
+        assert rec.index("end", "2024:players") < rec.index("start", "2023:players")
+        path, _ = critical_path(results, deps)
+        assert path[-1].endswith("statcast")
+
+    def test_seasons_at_a_time(self):
+        seasons = [2022, 2023, 2024]
+        steps, deps = season_plan([("schedule", "m"), ("statcast", "m")], seasons)
+        rec = _Recorder(durations={name: 0.05 for name, _ in steps})
+        in_flight = {}
+        most_seasons = []
+        most_per_season = []
+
+        def step(name, module_name):
+            season = name.split(":")[0]
+            with rec.lock:
+                in_flight[season] = in_flight.get(season, 0) + 1
+                most_seasons.append(sum(1 for n in in_flight.values() if n))
+                most_per_season.append(in_flight[season])
+            try:
+                return rec(name, module_name)
+            finally:
+                with rec.lock:
+                    in_flight[season] -= 1
+
+        results = run_steps(steps, step, 6, logger, deps,
+                            group_of=lambda name: name.split(":")[0], max_groups=2, max_per_group=1)
+        assert all(r["status"] == "success" for r in results.values())
+        assert max(most_seasons) == 2
+        assert max(most_per_season) == 1
+
+    def test_season_config(self):
+        cfg = {"extraction": {"season": 2024}, "statcast": {"start_date": "2024-03-28",
+                                                             "end_date": "2024-09-29", "max_workers": 4}}
+        season_cfg = season_config(cfg, 2016, True, 1)
+        assert season_cfg["extraction"] == {"season": 2016, "reuse_loaded": True}
+        assert season_cfg["statcast"]["start_date"] is None
+        assert season_cfg["statcast"]["max_workers"] == 1
+        assert cfg["extraction"]["season"] == 2024
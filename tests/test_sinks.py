@@ -0,0 +1,120 @@
+"""
+Parquet Sink Tests
+
+Checks the lake layout, typing and overwrite/merge behaviour of
+scripts/sinks.py, and that load_parquet reads Statcast files back in the
+shape load_batch expects. No network access or database is needed.
+
+Usage:
+    python -m pytest tests/test_sinks.py -v
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+import extract_statcast
+import sinks
+from load_parquet import statcast_frames
+
+
+def _batch(dates):
+    raw = pd.DataFrame({
+        "game_pk": [745000 + i for i in range(len(dates))],
+        "game_date": pd.to_datetime(dates),
+        "batter": [660271] * len(dates),
+        "pitcher": [543037.0] * len(dates),
+        "player_name": ["Ohtani, Shohei"] * len(dates),
+        "release_speed": [97.3] * len(dates),
+        "zone": [np.nan] * len(dates),
+        "at_bat_number": [1] * len(dates),
+        "pitch_number": list(range(1, len(dates) + 1)),
+    })
+    return extract_statcast.transform_statcast_df(raw)
+
+
+# =============================================================================
+# Statcast daily files
+# =============================================================================
+
+class TestDailyWriter:
+
+    def _write(self, sink, *batches):
+        with extract_statcast.lake_writer(sink) as lake:
+            for batch in batches:
+                lake.write(batch)
+
+    def test_partition_layout_and_types(self, tmp_path):
+        sink = sinks.ParquetSink(str(tmp_path))
+        self._write(sink, _batch(["2024-04-30", "2024-05-01"]), _batch(["2024-05-01"]))
+
+        files = sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*.parquet"))
+        assert files == [
+            "raw_statcast/season=2024/month=04/2024-04-30.parquet",
+            "raw_statcast/season=2024/month=05/2024-05-01.parquet",
+        ]
+        table = pq.read_table(tmp_path / files[1])
+        assert table.num_rows == 2  # both batches' rows for the day
+        assert table.schema == extract_statcast.arrow_schema()
+        assert table.schema.field("game_date").type == pa.date32()
+        assert table.schema.field("pitcher").type == pa.int32()
+        assert pq.ParquetFile(tmp_path / files[1]).metadata.row_group(0).column(0).compression == "ZSTD"
+
+    def test_refetch_overwrites_day(self, tmp_path):
+        sink = sinks.ParquetSink(str(tmp_path))
+        self._write(sink, _batch(["2024-04-01"] * 3))
+        self._write(sink, _batch(["2024-04-01"] * 2))
+        assert pq.read_table(tmp_path / "raw_statcast").num_rows == 2
+
+    def test_error_leaves_no_files(self, tmp_path):
+        sink = sinks.ParquetSink(str(tmp_path))
+        with pytest.raises(RuntimeError):
+            with extract_statcast.lake_writer(sink) as lake:
+                lake.write(_batch(["2024-04-01"]))
+                raise RuntimeError("load failed")
+        assert not [p for p in tmp_path.rglob("*") if p.is_file()]
+
+    def test_disabled_sink(self):
+        assert sinks.get_sink({}) is None
+        with extract_statcast.lake_writer(None) as lake:
+            assert lake is None
+
+    def test_frames_round_trip_for_load_batch(self, tmp_path):
+        sink = sinks.ParquetSink(str(tmp_path))
+        batch = _batch(["2024-04-01", "2024-04-02", "2024-04-02"])
+        self._write(sink, batch)
+
+        season_dir = tmp_path / "raw_statcast" / "season=2024"
+        frames = list(statcast_frames(str(season_dir), batch_rows=10))
+        loaded = pd.concat(frames, ignore_index=True).sort_values("game_pk", ignore_index=True)
+        assert list(loaded.columns) == extract_statcast.DB_COLUMNS
+        assert loaded["game_date"].tolist() == ["2024-04-01", "2024-04-02", "2024-04-02"]
+        assert str(loaded["pitcher"].dtype) == "Int64"
+        assert loaded["zone"].isna().all()
+
+
+# =============================================================================
+# Season tables
+# =============================================================================
+
+class TestWriteRows:
+
+    def test_merge_on_key(self, tmp_path):
+        cfg = {"parquet": {"enabled": True, "dir": str(tmp_path)}, "extraction": {"season": 2024}}
+        key = ["game_pk"]
+        sinks.write_rows(cfg, "raw_mlb.raw_games", [{"game_pk": 1, "status": "Scheduled"},
+                                                    {"game_pk": 2, "status": "Final"}], key)
+        sinks.write_rows(cfg, "raw_mlb.raw_games", [{"game_pk": 1, "status": "Final"}], key)
+
+        rows = pq.read_table(tmp_path / "raw_games" / "season=2024" / "part-0.parquet").to_pylist()
+        assert sorted(rows, key=lambda r: r["game_pk"]) == [
+            {"game_pk": 1, "status": "Final"},
+            {"game_pk": 2, "status": "Final"},
+        ]
@@ -0,0 +1,65 @@
+"""
+Watermark Tests
+
+Checks how scripts/watermarks.py turns stored watermarks and the
+incremental config into a fetch start date. Uses a fake connection, so no
+database is needed.
+
+Usage:
+    python -m pytest tests/test_watermarks.py -v
+"""
+
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+from watermarks import incremental_since
+
+
+class _FakeCursor:
+    def __init__(self, watermarks):
+        self._watermarks = watermarks
+        self._row = None
+
+    def execute(self, sql, params):
+        step = params[0]
+        self._row = (self._watermarks[step],) if step in self._watermarks else None
+
+    def fetchone(self):
+        return self._row
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+class _FakeConn:
+    def __init__(self, watermarks):
+        self._watermarks = watermarks
+
+    def cursor(self):
+        return _FakeCursor(self._watermarks)
+
+
+CONN = _FakeConn({"statcast": date(2024, 7, 10)})
+
+
+class TestIncrementalSince:
+
+    def test_full_run_when_disabled(self):
+        assert incremental_since(CONN, {}, "statcast") is None
+
+    def test_watermark_minus_lookback(self):
+        cfg = {"incremental": {"enabled": True, "lookback_days": 2}}
+        assert incremental_since(CONN, cfg, "statcast") == date(2024, 7, 8)
+
+    def test_full_run_without_watermark(self):
+        cfg = {"incremental": {"enabled": True}}
+        assert incremental_since(CONN, cfg, "games") is None
+
+    def test_since_overrides_watermark(self):
+        cfg = {"incremental": {"enabled": True, "since": "2024-06-01"}}
+        assert incremental_since(CONN, cfg, "statcast") == date(2024, 6, 1)